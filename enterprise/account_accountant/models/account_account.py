@@ -13,3 +13,11 @@ class AccountAccount(models.Model):
         domain.append(('account_id', '=', self.id))
         action_values['domain'] = domain
         return action_values
+
+    def write(self, vals):
+        # Only the journal items of reconcilable accounts have matching tokens.
+        if 'reconcile' in vals:
+            self.env['account.move.line.matching.token']._register_refresh(
+                self.env['account.move.line'].search([('account_id', 'in', self.ids), ('parent_state', '=', 'posted')])
+            )
+        return super().write(vals)
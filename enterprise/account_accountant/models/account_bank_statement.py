@@ -1,4 +1,5 @@
 import logging
+import time
 
 from odoo import _, api, fields, models
 from odoo.addons.base.models.res_bank import sanitize_account_number
@@ -112,6 +113,7 @@ class AccountBankStatementLine(models.Model):
             return st_lines, remaining_line_id
 
         start_time = fields.Datetime.now()
+        start_perf_counter = time.perf_counter()
 
         # Check the companies having at least one reconcile model using the 'auto_reconcile' feature.
         configured_company = children_company = self.env['account.reconcile.model'].search_fetch([
@@ -133,6 +135,18 @@ class AccountBankStatementLine(models.Model):
         # concurrent update in order to avoid the whole transaction to be rollbacked.
         self.env.cr.execute("SELECT 1 FROM account_bank_statement_line WHERE id in %s FOR UPDATE", [tuple(st_lines.ids)])
 
+        # Match the tokens of all the statement lines in a single pass, rather than with one query per line and model. The
+        # widget is still used to apply the matching rules on each line and to validate it.
+        st_lines_to_match = st_lines.filtered(lambda line: not line.is_reconciled)
+        invoice_matching_models = self.env['account.reconcile.model'].search([
+            ('rule_type', '=', 'invoice_matching'),
+            ('company_id', 'in', st_lines_to_match.company_id.ids),
+        ])
+        matching_start = time.perf_counter()
+        prefetched_candidates = invoice_matching_models._get_invoice_matching_amls_candidates_batch(st_lines_to_match)
+        matching_duration = time.perf_counter() - matching_start
+        BankRecWidget = self.env['bank.rec.widget'].with_context(invoice_matching_prefetched_candidates=prefetched_candidates)
+
         nb_auto_reconciled_lines = 0
         for index, st_line in enumerate(st_lines):
             # we want the cron to run only for limit_time seconds
@@ -140,7 +154,7 @@ class AccountBankStatementLine(models.Model):
                 remaining_line_id = st_line.id
                 st_lines = st_lines[:index]
                 break
-            wizard = self.env['bank.rec.widget'].with_context(default_st_line_id=st_line.id).new({})
+            wizard = BankRecWidget.with_context(default_st_line_id=st_line.id).new({})
             wizard._action_trigger_matching_rules()
             if wizard.state == 'valid' and wizard.matching_rules_allow_auto_reconcile:
                 try:
@@ -160,6 +174,12 @@ class AccountBankStatementLine(models.Model):
 
         st_lines.write({'cron_last_check': start_time})
 
+        duration = time.perf_counter() - start_perf_counter
+        _logger.info(
+            "Auto-reconciliation processed %s statement lines in %.2fs (%.1f lines/s, %.2fs spent matching their tokens), %s of them reconciled.",
+            len(st_lines), duration, len(st_lines) / duration if duration else len(st_lines), matching_duration, nb_auto_reconciled_lines,
+        )
+
         # If the next statement line has never been auto reconciled yet, force the trigger.
         if remaining_line_id:
             remaining_st_line = self.env['account.bank.statement.line'].browse(remaining_line_id)
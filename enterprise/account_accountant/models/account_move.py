@@ -112,6 +112,7 @@ class AccountMove(models.Model):
         for move in self:
             if move._get_deferred_entries_method() == 'on_validation' and any(move.line_ids.mapped('deferred_start_date')):
                 move._generate_deferred_entries()
+        self.env['account.move.line.matching.token']._register_refresh(posted.line_ids)
         return posted
 
     def action_post(self):
@@ -131,8 +132,15 @@ class AccountMove(models.Model):
                     'date':  move._get_accounting_date(move.date, move._affect_tax_report()),
                 })
             self.deferred_move_ids |= reversed_moves
+        self.env['account.move.line.matching.token']._register_refresh(self.line_ids)
         return super().button_draft()
 
+    def write(self, vals):
+        # The number and reference of the entries are part of the tokens used to match their journal items.
+        if 'name' in vals or 'ref' in vals:
+            self.env['account.move.line.matching.token']._register_refresh(self.filtered(lambda move: move.state == 'posted').line_ids)
+        return super().write(vals)
+
     def unlink(self):
         # Prevent deferred moves under audit trail restriction from being unlinked
         deferral_moves = self.filtered(lambda move: move._is_protected_by_audit_trail() and move.deferred_original_move_ids)
@@ -497,6 +505,8 @@ class AccountMoveLine(models.Model):
                         "You cannot change the account for a deferred line in %(move_name)s if it has already been deferred.",
                         move_name=line.move_id.display_name
                     ))
+        if 'name' in vals or 'account_id' in vals:
+            self.env['account.move.line.matching.token']._register_refresh(self.filtered(lambda line: line.parent_state == 'posted'))
         return super().write(vals)
 
     # ============================= START - Deferred management ====================================
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Key of the cursor's precommit data holding the ids of the journal items whose tokens need to be refreshed
+PENDING_TOKEN_REFRESH_KEY = 'account_accountant.matching_token_move_line_ids'
+
+
+class AccountMoveLineMatchingToken(models.Model):
+    """ Tokens of the label, journal entry number and reference of the open journal items, against which the 'invoice_matching'
+    reconciliation models match the tokens of the statement lines (see account.reconcile.model._get_invoice_matching_st_line_tokens).
+
+    Extracting those tokens on the fly requires scanning and splitting the texts of every open journal item for each statement
+    line to match. Instead, they are extracted once when a journal item is posted, then kept up to date when its texts change or
+    when it gets reconciled, so that the statement lines are matched through an indexed lookup.
+
+    Only the posted journal items on a reconcilable account that are not reconciled yet have tokens. A journal item has one row
+    per occurrence of each of its tokens, so that the number of rows matching a statement line still counts the occurrences.
+    """
+    _name = 'account.move.line.matching.token'
+    _description = "Journal Item Matching Token"
+    _log_access = False
+
+    move_line_id = fields.Many2one(comodel_name='account.move.line', required=True, readonly=True, index=True, ondelete='cascade')
+    token = fields.Char(required=True, readonly=True)
+    token_type = fields.Selection(
+        selection=[
+            ('numerical', "Numerical"),
+            ('exact', "Exact"),
+        ],
+        required=True,
+        readonly=True,
+    )
+
+    def init(self):
+        super().init()
+        # The exact tokens can be arbitrarily long: a hash index doesn't limit the size of the indexed values.
+        create_index(self.env.cr, 'account_move_line_matching_token_token_idx', self._table, ['token'], method='hash')
+
+        self.env.cr.execute("SELECT 1 FROM account_move_line_matching_token LIMIT 1")
+        if not self.env.cr.rowcount:
+            self._refresh_tokens()
+
+    @api.model
+    def _register_refresh(self, move_lines):
+        """ Registers the journal items whose tokens must be refreshed. The refresh is done right before the current transaction
+        gets committed, or before matching statement lines in the meantime (see _flush_pending_refreshes), so that the
+        changes of the journal items are only processed once.
+        """
+        if not move_lines:
+            return
+
+        pending_move_line_ids = self.env.cr.precommit.data.setdefault(PENDING_TOKEN_REFRESH_KEY, set())
+        if not pending_move_line_ids:
+            self.env.cr.precommit.add(self._flush_pending_refreshes)
+        pending_move_line_ids.update(move_lines.ids)
+
+    @api.model
+    def _flush_pending_refreshes(self):
+        move_line_ids = self.env.cr.precommit.data.pop(PENDING_TOKEN_REFRESH_KEY, None)
+        if move_line_ids:
+            self._refresh_tokens(move_line_ids)
+
+    @api.model
+    def _refresh_tokens(self, move_line_ids=None):
+        """ Recomputes the tokens of the given journal items, or of all of them if move_line_ids is None. """
+        self.env['account.account'].flush_model(['reconcile'])
+        self.env['account.move'].flush_model(['name', 'ref', 'state'])
+        self.env['account.move.line'].flush_model(['name', 'move_id', 'account_id', 'parent_state', 'reconciled', 'display_type'])
+
+        domain = [
+            ('display_type', 'not in', ('line_section', 'line_note')),
+            ('parent_state', '=', 'posted'),
+            ('reconciled', '=', False),
+            ('account_id.reconcile', '=', True),
+        ]
+        if move_line_ids is None:
+            self.env.cr.execute("DELETE FROM account_move_line_matching_token")
+        else:
+            move_line_ids = tuple(move_line_ids)
+            self.env.cr.execute(SQL("DELETE FROM account_move_line_matching_token WHERE move_line_id IN %s", move_line_ids))
+            domain.append(('id', 'in', move_line_ids))
+
+        query = self.env['account.move.line']._where_calc(domain)
+        self.env.cr.execute(SQL(
+            '''
+                WITH aml_cte AS (%s)
+                INSERT INTO account_move_line_matching_token (move_line_id, token, token_type)
+                SELECT sub.id, sub.token, sub.token_type
+                FROM (%s) AS sub
+            ''',
+            self._get_aml_cte_query(query.from_clause, query.where_clause),
+            SQL(" UNION ALL ").join(self._get_aml_tokens_queries()),
+        ))
+
+    @api.model
+    def _get_aml_cte_query(self, tables, where_clause):
+        """ Returns the query selecting the values of the journal items needed to extract their tokens, to be used as the
+        aml_cte CTE of the queries returned by _get_aml_tokens_queries.
+        """
+        return SQL('''
+            SELECT
+                account_move_line.id as account_move_line_id,
+                account_move_line.name as account_move_line_name,
+                account_move_line__move_id.name as account_move_line__move_id_name,
+                account_move_line__move_id.ref as account_move_line__move_id_ref
+            FROM %s
+            JOIN account_move account_move_line__move_id ON account_move_line__move_id.id = account_move_line.move_id
+            WHERE %s
+        ''', tables, where_clause)
+
+    @api.model
+    def _get_aml_tokens_queries(self):
+        """ Returns the queries extracting the tokens of the journal items of the aml_cte CTE.
+
+        :return: A list of queries selecting the id, token and token_type ('numerical' or 'exact') of the journal items.
+        """
+        sub_queries: list[SQL] = []
+        for table_alias, field in (
+            ('account_move_line', 'name'),
+            ('account_move_line__move_id', 'name'),
+            ('account_move_line__move_id', 'ref'),
+        ):
+            sub_queries.append(SQL(r'''
+                SELECT
+                    account_move_line_id as id,
+                    UNNEST(
+                        REGEXP_SPLIT_TO_ARRAY(
+                            SUBSTRING(
+                                REGEXP_REPLACE(%(field)s, '[^0-9\s]', '', 'g'),
+                                '\S(?:.*\S)*'
+                            ),
+                            '\s+'
+                        )
+                    ) AS token,
+                    'numerical' AS token_type
+                FROM aml_cte
+                WHERE %(field)s IS NOT NULL
+            ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
+        for table_alias, field in (
+            ('account_move_line', 'name'),
+            ('account_move_line__move_id', 'name'),
+            ('account_move_line__move_id', 'ref'),
+        ):
+            sub_queries.append(SQL('''
+                SELECT
+                    account_move_line_id as id,
+                    %(field)s AS token,
+                    'exact' AS token_type
+                FROM aml_cte
+                WHERE %(field)s != ''
+            ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
+        return sub_queries
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = 'account.partial.reconcile'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        # Fully reconciled journal items no longer need their matching tokens.
+        self.env['account.move.line.matching.token']._register_refresh(partials.debit_move_id + partials.credit_move_id)
+        return partials
+
+    def unlink(self):
+        self.env['account.move.line.matching.token']._register_refresh(self.debit_move_id + self.credit_move_id)
+        return super().unlink()
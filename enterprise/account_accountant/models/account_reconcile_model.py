@@ -225,87 +225,44 @@ class AccountReconcileModel(models.Model):
         assert self.rule_type == 'invoice_matching'
         self.env['account.move'].flush_model()
         self.env['account.move.line'].flush_model()
+        self.env['account.move.line.matching.token']._flush_pending_refreshes()
 
         aml_domain = self._get_invoice_matching_amls_domain(st_line, partner)
         query = self.env['account.move.line']._where_calc(aml_domain)
         tables = query.from_clause
         where_clause = query.where_clause or SQL("TRUE")
 
-        aml_cte = SQL()
-        sub_queries: list[SQL] = []
+        candidate_ids = None
         numerical_tokens, exact_tokens, _text_tokens = self._get_invoice_matching_st_line_tokens(st_line)
-        if numerical_tokens or exact_tokens:
-            aml_cte = SQL('''
-                WITH aml_cte AS (
-                    SELECT
-                        account_move_line.id as account_move_line_id,
-                        account_move_line.date as account_move_line_date,
-                        account_move_line.date_maturity as account_move_line_date_maturity,
-                        account_move_line.name as account_move_line_name,
-                        account_move_line__move_id.name as account_move_line__move_id_name,
-                        account_move_line__move_id.ref as account_move_line__move_id_ref
-                    FROM %s
-                    JOIN account_move account_move_line__move_id ON account_move_line__move_id.id = account_move_line.move_id
-                    WHERE %s
-                )
-            ''', tables, where_clause)
-        if numerical_tokens:
-            for table_alias, field in (
-                ('account_move_line', 'name'),
-                ('account_move_line__move_id', 'name'),
-                ('account_move_line__move_id', 'ref'),
-            ):
-                sub_queries.append(SQL(r'''
-                    SELECT
-                        account_move_line_id as id,
-                        account_move_line_date as date,
-                        account_move_line_date_maturity as date_maturity,
-                        UNNEST(
-                            REGEXP_SPLIT_TO_ARRAY(
-                                SUBSTRING(
-                                    REGEXP_REPLACE(%(field)s, '[^0-9\s]', '', 'g'),
-                                    '\S(?:.*\S)*'
-                                ),
-                                '\s+'
-                            )
-                        ) AS token
-                    FROM aml_cte
-                    WHERE %(field)s IS NOT NULL
-                ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
-        if exact_tokens:
-            for table_alias, field in (
-                ('account_move_line', 'name'),
-                ('account_move_line__move_id', 'name'),
-                ('account_move_line__move_id', 'ref'),
-            ):
-                sub_queries.append(SQL('''
-                    SELECT
-                        account_move_line_id as id,
-                        account_move_line_date as date,
-                        account_move_line_date_maturity as date_maturity,
-                        %(field)s AS token
-                    FROM aml_cte
-                    WHERE %(field)s != ''
-                ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
-        if sub_queries:
-            order_by = get_order_by_clause(prefix=SQL('sub.'))
+        prefetched_candidate_ids = self._context.get('invoice_matching_prefetched_candidates', {}).get((self.id, st_line.id))
+        if prefetched_candidate_ids is not None:
+            # The candidates matching the tokens have been fetched for a whole batch of statement lines beforehand
+            # (see _get_invoice_matching_amls_candidates_batch). They still need to match the domain of this line.
+            valid_candidate_ids = set(self.env['account.move.line'].search([*aml_domain, ('id', 'in', prefetched_candidate_ids)]).ids)
+            candidate_ids = [aml_id for aml_id in prefetched_candidate_ids if aml_id in valid_candidate_ids]
+        elif numerical_tokens or exact_tokens:
+            order_by = get_order_by_clause(prefix=SQL('account_move_line.'))
+            token_types = [token_type for token_type, tokens in (('numerical', numerical_tokens), ('exact', exact_tokens)) if tokens]
             candidate_ids = [r[0] for r in self.env.execute_query(SQL(
                 '''
-                    %s
                     SELECT
-                        sub.id,
+                        account_move_line.id,
                         COUNT(*) AS nb_match
-                    FROM (%s) AS sub
-                    WHERE sub.token IN %s
-                    GROUP BY sub.date_maturity, sub.date, sub.id
-                    HAVING COUNT(*) > 0
+                    FROM %s
+                    JOIN account_move_line_matching_token matching_token ON matching_token.move_line_id = account_move_line.id
+                    WHERE %s
+                        AND matching_token.token IN %s
+                        AND matching_token.token_type IN %s
+                    GROUP BY account_move_line.date_maturity, account_move_line.date, account_move_line.id
                     ORDER BY nb_match DESC, %s
                 ''',
-                aml_cte,
-                SQL(" UNION ALL ").join(sub_queries),
+                tables,
+                where_clause,
                 tuple(numerical_tokens + exact_tokens),
+                tuple(token_types),
                 order_by,
             ))]
+        if candidate_ids is not None:
             if candidate_ids:
                 return {
                     'allow_auto_reconcile': True,
@@ -353,6 +310,90 @@ class AccountReconcileModel(models.Model):
                 'amls': amls,
             }
 
+    def _get_invoice_matching_amls_candidates_batch(self, st_lines):
+        """ Fetches at once the candidates matching the tokens of each statement line, for each of the 'invoice_matching'
+        models in self, instead of one query per model and statement line in _get_invoice_matching_amls_candidates.
+
+        The tokens of the journal items are looked up once for the whole batch, restricted to a domain including the one of every
+        statement line. _get_invoice_matching_amls_candidates then only needs to check the candidates against the actual domain
+        of the statement line it processes.
+
+        :param st_lines:    The statement lines to match.
+        :return:            A dict mapping each (model id, statement line id) to the ordered list of the candidate ids,
+                            to be passed in the context as 'invoice_matching_prefetched_candidates'. The pairs for which
+                            the statement line has no token are left out.
+        """
+        token_rows = []
+        for rec_model in self.filtered(lambda m: m.rule_type == 'invoice_matching'):
+            for st_line in st_lines.filtered(lambda line: line.company_id == rec_model.company_id):
+                numerical_tokens, exact_tokens, _text_tokens = rec_model._get_invoice_matching_st_line_tokens(st_line)
+                for token in set(numerical_tokens + exact_tokens):
+                    token_rows.append((rec_model.id, st_line.id, token, bool(numerical_tokens), bool(exact_tokens)))
+        if not token_rows:
+            return {}
+
+        self.env['account.move'].flush_model()
+        self.env['account.move.line'].flush_model()
+        self.env['account.move.line.matching.token']._flush_pending_refreshes()
+
+        # Superset of the domain of every statement line (see _get_default_amls_matching_domain).
+        query = self.env['account.move.line']._where_calc([
+            ('display_type', 'not in', ('line_section', 'line_note')),
+            ('parent_state', '=', 'posted'),
+            ('reconciled', '=', False),
+            ('account_id.reconcile', '=', True),
+            ('company_id', 'child_of', st_lines.company_id.root_id.ids),
+        ])
+        model_ids, st_line_ids, tokens, has_numerical_tokens, has_exact_tokens = zip(*token_rows)
+        rows = self.env.execute_query(SQL(
+            '''
+                WITH st_line_token AS (
+                    SELECT *
+                    FROM UNNEST(%(model_ids)s::int[], %(st_line_ids)s::int[], %(tokens)s::text[], %(has_numerical_tokens)s::bool[], %(has_exact_tokens)s::bool[])
+                        AS st_line_token(model_id, st_line_id, token, has_numerical_tokens, has_exact_tokens)
+                )
+                SELECT
+                    st_line_token.model_id,
+                    st_line_token.st_line_id,
+                    account_move_line.id,
+                    account_move_line.date_maturity,
+                    account_move_line.date,
+                    COUNT(*) AS nb_match
+                FROM %(tables)s
+                JOIN account_move_line_matching_token matching_token ON matching_token.move_line_id = account_move_line.id
+                JOIN st_line_token ON
+                    st_line_token.token = matching_token.token
+                    AND (
+                        (matching_token.token_type = 'numerical' AND st_line_token.has_numerical_tokens)
+                        OR (matching_token.token_type = 'exact' AND st_line_token.has_exact_tokens)
+                    )
+                WHERE %(where_clause)s
+                GROUP BY st_line_token.model_id, st_line_token.st_line_id, account_move_line.id, account_move_line.date_maturity, account_move_line.date
+            ''',
+            tables=query.from_clause,
+            where_clause=query.where_clause or SQL("TRUE"),
+            model_ids=list(model_ids),
+            st_line_ids=list(st_line_ids),
+            tokens=list(tokens),
+            has_numerical_tokens=list(has_numerical_tokens),
+            has_exact_tokens=list(has_exact_tokens),
+        ))
+
+        candidates_map = {(model_id, st_line_id): [] for model_id, st_line_id, *_dummy in token_rows}
+        for model_id, st_line_id, aml_id, date_maturity, date, nb_match in rows:
+            candidates_map[model_id, st_line_id].append((nb_match, date_maturity is None, date_maturity or date, date, aml_id))
+
+        # Same order as the one of _get_invoice_matching_amls_candidates: most matching tokens first, then following the
+        # matching order of the model on (date_maturity, date, id), with PostgreSQL's placement of the NULL values.
+        new_first_model_ids = set(self.filtered(lambda m: m.matching_order == 'new_first').ids)
+        for (model_id, _st_line_id), candidates in candidates_map.items():
+            if model_id in new_first_model_ids:
+                candidates.sort(reverse=True)
+            else:
+                candidates.sort(key=lambda candidate: (-candidate[0], *candidate[1:]))
+            candidates[:] = [candidate[-1] for candidate in candidates]
+        return candidates_map
+
     def _get_invoice_matching_rules_map(self):
         """ Get a mapping <priority_order, rule> that could be overridden in others modules.
 
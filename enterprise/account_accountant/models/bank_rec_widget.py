@@ -3,13 +3,17 @@
 from collections import defaultdict
 from contextlib import contextmanager
 import json
+import logging
 import markupsafe
+import time
 
 from odoo import _, api, fields, models, Command
 from odoo.addons.web.controllers.utils import clean_action
 from odoo.exceptions import UserError, RedirectWarning
 from odoo.tools.misc import formatLang
 
+_logger = logging.getLogger(__name__)
+
 
 class BankRecWidget(models.Model):
     _name = "bank.rec.widget"
@@ -1192,7 +1196,9 @@ class BankRecWidget(models.Model):
             ('match_journal_ids', '=', False),
             ('match_journal_ids', '=', self.st_line_id.journal_id.id),
         ])
+        start = time.perf_counter()
         matching = reconcile_models._apply_rules(self.st_line_id, self.partner_id)
+        _logger.debug("Matching rules applied to statement line %s in %.1fms.", self.st_line_id.id, (time.perf_counter() - start) * 1000)
 
         if matching.get('amls'):
             reco_model = matching['model']
@@ -1298,3 +1298,51 @@ class TestReconciliationMatchingRules(AccountTestInvoicingCommon):
                     'model': self.rule_1,
                 },
             })
+
+    @freeze_time('2020-01-01')
+    def test_invoice_matching_amls_candidates_batch(self):
+        """ The candidates fetched for a batch of statement lines must lead to the same matching as the ones fetched line by line. """
+        st_line_1 = self._create_st_line(amount=1000, payment_ref="INV 7001 turlututu", partner_id=False)
+        st_line_2 = self._create_st_line(amount=1000, payment_ref="PAY-7002", partner_id=False)
+        st_line_3 = self._create_st_line(amount=2000, payment_ref="7001 7002", partner_id=False)
+        inv_line_1 = self._create_invoice_line(1000, self.partner_a, 'out_invoice', ref="7001")
+        inv_line_2 = self._create_invoice_line(1000, self.partner_b, 'out_invoice', ref="PAY-7002")
+
+        rule = self._create_reconcile_model(match_partner=False, allow_payment_tolerance=False)
+        st_lines = st_line_1 + st_line_2 + st_line_3
+        prefetched_candidates = rule._get_invoice_matching_amls_candidates_batch(st_lines)
+        self.assertEqual(set(prefetched_candidates), {(rule.id, st_line.id) for st_line in st_lines})
+
+        batch_rule = rule.with_context(invoice_matching_prefetched_candidates=prefetched_candidates)
+        for st_line, expected_amls in ((st_line_1, inv_line_1), (st_line_2, inv_line_2), (st_line_3, inv_line_1 + inv_line_2)):
+            expected_values = {'amls': expected_amls, 'model': rule}
+            self.assertDictEqual(rule._apply_rules(st_line, st_line._retrieve_partner()), expected_values)
+            self.assertDictEqual(batch_rule._apply_rules(st_line, st_line._retrieve_partner()), expected_values)
+
+    def test_invoice_matching_tokens_maintenance(self):
+        """ The matching tokens are kept for the open journal items only. """
+        MatchingToken = self.env['account.move.line.matching.token']
+
+        def get_tokens(move_line):
+            MatchingToken._flush_pending_refreshes()
+            return set(MatchingToken.search([('move_line_id', '=', move_line.id)]).mapped(lambda t: (t.token_type, t.token)))
+
+        inv_line = self._create_invoice_line(1000, self.partner_a, 'out_invoice', ref="REF 8001")
+        self.assertTrue({('numerical', '8001'), ('exact', 'REF 8001')} <= get_tokens(inv_line))
+
+        inv_line.move_id.ref = "REF 8002"
+        self.assertFalse(('numerical', '8001') in get_tokens(inv_line))
+        self.assertTrue(('numerical', '8002') in get_tokens(inv_line))
+
+        st_line = self._create_st_line(amount=1000, payment_ref="8002", partner_id=False)
+        rule = self._create_reconcile_model(match_partner=False, allow_payment_tolerance=False)
+        self.assertDictEqual(rule._apply_rules(st_line, None), {'amls': inv_line, 'model': rule})
+
+        payment_line = self._create_invoice_line(1000, self.partner_a, 'out_refund')
+        (inv_line + payment_line).reconcile()
+        self.assertFalse(get_tokens(inv_line))
+
+        # Resetting the invoice to draft unreconciles the refund, which is open again.
+        inv_line.move_id.button_draft()
+        self.assertFalse(get_tokens(inv_line))
+        self.assertTrue(get_tokens(payment_line))
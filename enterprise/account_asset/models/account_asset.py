@@ -573,7 +573,7 @@ class AccountAsset(models.Model):
             The degressive amount corresponds to the difference between what should have been depreciated at the end of
             the period and the residual_amount (to deal with rounding issues at the end of each month)
             """
-            fiscalyear_dates = self.company_id.compute_fiscalyear_dates(period_end_date)
+            fiscalyear_dates = self._get_fiscalyear_dates(period_end_date)
             days_in_fiscalyear = self._get_delta_days(fiscalyear_dates['date_from'], fiscalyear_dates['date_to'])
 
             degressive_total_value = residual_declining * (1 - self.method_progress_factor * self._get_delta_days(effective_start_date, period_end_date) / days_in_fiscalyear)
@@ -638,7 +638,10 @@ class AccountAsset(models.Model):
         self.depreciation_move_ids.filtered(lambda mv: mv.state == 'draft' and (mv.date >= date if date else True)).unlink()
 
         new_depreciation_moves_data = []
-        for asset in self:
+        assets = self
+        if 'asset_fiscal_calendar' not in self.env.context:
+            assets = self.with_context(asset_fiscal_calendar={})
+        for asset in assets:
             new_depreciation_moves_data.extend(asset._recompute_board(date))
 
         new_depreciation_moves = self.env['account.move'].create(new_depreciation_moves_data)
@@ -669,7 +672,7 @@ class AccountAsset(models.Model):
         if not float_is_zero(self.value_residual, precision_rounding=self.currency_id.rounding):
             while not self.currency_id.is_zero(residual_amount) and start_depreciation_date < final_depreciation_date:
                 period_end_depreciation_date = self._get_end_period_date(start_depreciation_date)
-                period_end_fiscalyear_date = self.company_id.compute_fiscalyear_dates(period_end_depreciation_date).get('date_to')
+                period_end_fiscalyear_date = self._get_fiscalyear_dates(period_end_depreciation_date).get('date_to')
                 lifetime_left = self._get_delta_days(start_depreciation_date, last_day_asset)
 
                 days, amount = self._compute_board_amount(residual_amount, start_depreciation_date, period_end_depreciation_date, False, lifetime_left, residual_declining, start_yearly_period, total_lifetime_left, residual_at_compute, start_recompute_date)
@@ -700,20 +703,40 @@ class AccountAsset(models.Model):
                     }))
 
                 if period_end_depreciation_date == period_end_fiscalyear_date:
-                    start_yearly_period = self.company_id.compute_fiscalyear_dates(period_end_depreciation_date).get('date_from') + relativedelta(years=1)
+                    start_yearly_period = self._get_fiscalyear_dates(period_end_depreciation_date).get('date_from') + relativedelta(years=1)
                     residual_declining = residual_amount
 
                 start_depreciation_date = period_end_depreciation_date + relativedelta(days=1)
 
         return depreciation_move_values
 
+    def _get_fiscalyear_dates(self, date):
+        """ Return the fiscal year of the company of the asset containing date, like res.company.compute_fiscalyear_dates.
+
+        When computing the depreciation boards (see compute_depreciation_board), the fiscal years are looked up once per
+        company and kept in the 'asset_fiscal_calendar' context key, as all the periods of all the assets fall in a handful
+        of fiscal years.
+        """
+        self.ensure_one()
+        fiscal_calendar = self.env.context.get('asset_fiscal_calendar')
+        if fiscal_calendar is None:
+            return self.company_id.compute_fiscalyear_dates(date)
+
+        company_fiscalyears = fiscal_calendar.setdefault(self.company_id.id, [])
+        for fiscalyear_dates in company_fiscalyears:
+            if fiscalyear_dates['date_from'] <= date <= fiscalyear_dates['date_to']:
+                return fiscalyear_dates
+        fiscalyear_dates = self.company_id.compute_fiscalyear_dates(date)
+        company_fiscalyears.append(fiscalyear_dates)
+        return fiscalyear_dates
+
     def _get_end_period_date(self, start_depreciation_date):
         """Get the end of the period in which the depreciation is posted.
 
         Can be the end of the month if the asset is depreciated monthly, or the end of the fiscal year is it is depreciated yearly.
         """
         self.ensure_one()
-        fiscalyear_date = self.company_id.compute_fiscalyear_dates(start_depreciation_date).get('date_to')
+        fiscalyear_date = self._get_fiscalyear_dates(start_depreciation_date).get('date_to')
         period_end_depreciation_date = fiscalyear_date if start_depreciation_date <= fiscalyear_date else fiscalyear_date + relativedelta(years=1)
 
         if self.method_period == '1':  # If method period is set to monthly computation
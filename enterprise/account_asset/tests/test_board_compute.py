@@ -1,7 +1,13 @@
+import logging
+import time
+from unittest.mock import patch
+
 from odoo.tests.common import tagged, freeze_time
 from odoo.addons.account_asset.tests.common import TestAccountAssetCommon
 from odoo import fields
 
+_logger = logging.getLogger(__name__)
+
 
 @freeze_time('2022-07-01')
 @tagged('post_install', '-at_install')
@@ -1319,3 +1325,50 @@ class TestAccountAssetComputation(TestAccountAssetCommon):
                 ])
                 asset.validate()
                 self.assertEqual(asset.state, 'open')
+
+    def test_bulk_boards_fiscal_calendar(self):
+        """ The depreciation boards computed in bulk, looking the fiscal years up once per company, must be the same as the
+        ones computed asset by asset.
+        """
+        company = self.env.company
+        company.fiscalyear_last_day = 30
+        company.fiscalyear_last_month = '6'
+        assets = self.env['account.asset']
+        for method in ('linear', 'degressive', 'degressive_then_linear'):
+            for prorata_computation_type in ('constant_periods', 'daily_computation'):
+                assets |= self.create_asset(
+                    value=12000,
+                    periodicity='monthly',
+                    periods=60,
+                    method=method,
+                    degressive_factor=0.3,
+                    prorata_computation_type=prorata_computation_type,
+                    prorata_date='2020-02-15',
+                )
+
+        compute_fiscalyear_dates = type(company).compute_fiscalyear_dates
+        nb_calls = 0
+
+        def counted_compute_fiscalyear_dates(self, current_date):
+            nonlocal nb_calls
+            nb_calls += 1
+            return compute_fiscalyear_dates(self, current_date)
+
+        with patch.object(type(company), 'compute_fiscalyear_dates', counted_compute_fiscalyear_dates):
+            start = time.perf_counter()
+            per_asset_boards = [asset._recompute_board() for asset in assets]
+            per_asset_duration = time.perf_counter() - start
+            per_asset_nb_calls, nb_calls = nb_calls, 0
+
+            start = time.perf_counter()
+            bulk_assets = assets.with_context(asset_fiscal_calendar={})
+            bulk_boards = [asset._recompute_board() for asset in bulk_assets]
+            bulk_duration = time.perf_counter() - start
+
+        _logger.info(
+            "Depreciation boards of %s assets: %.3fs and %s fiscal year lookups asset by asset, %.3fs and %s in bulk.",
+            len(assets), per_asset_duration, per_asset_nb_calls, bulk_duration, nb_calls,
+        )
+        self.assertEqual(bulk_boards, per_asset_boards)
+        # 2020-2026 spans 7 fiscal years ending on June 30th.
+        self.assertLessEqual(nb_calls, 7)
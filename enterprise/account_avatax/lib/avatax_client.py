@@ -23,27 +23,55 @@ AvaTax Software Development Kit for Python.
 # This is a stripped down version of the upstream Avatax library for Odoo. Changes were made to
 # prevent arbitrary requests in case function references get leaked.
 
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from datetime import datetime
 from pprint import pformat
 import requests
 import logging
+import threading
 
 str_type = (str, type(None))
 _logger = logging.getLogger(__name__)
 
+# Maximum number of connections kept alive per AvaTax environment, i.e. of requests sent concurrently.
+POOL_MAXSIZE = 16
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(base_url):
+    """Get the session shared by all the clients of an environment, to reuse its connections.
+
+    The credentials are given on each request, and no cookie is kept, so that nothing leaks between
+    the clients of different companies.
+    """
+    with _sessions_lock:
+        if base_url not in _sessions:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            session.mount(base_url, HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
+            _sessions[base_url] = session
+        return _sessions[base_url]
+
 
 class AvataxClient:
+    _sandbox_url = 'https://sandbox-rest.avatax.com'
+    _production_url = 'https://rest.avatax.com'
+
     def __init__(self, app_name=None, app_version=None, machine_name=None,
                  environment=None, timeout_limit=None):
         if not all(isinstance(i, str_type) for i in [app_name,
                                                      machine_name,
                                                      environment]):
             raise ValueError('Input(s) must be string or none type object')
-        self.base_url = 'https://sandbox-rest.avatax.com'
+        self.base_url = self._sandbox_url
         self.is_production = environment and environment.lower() == 'production'
         if self.is_production:
-            self.base_url = 'https://rest.avatax.com'
+            self.base_url = self._production_url
+        self.session = _get_session(self.base_url)
         self.auth = None
         self.app_name = app_name
         self.app_version = app_version
@@ -67,7 +95,7 @@ class AvataxClient:
         """Allow to enable a trace of requests in the logger."""
         start = str(datetime.utcnow())
         url = '{}/api/v2/{}'.format(self.base_url, endpoint)
-        response = requests.request(
+        response = self.session.request(
             method, url,
             auth=self.auth,
             headers=self.client_header,
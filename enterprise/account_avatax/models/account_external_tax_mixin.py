@@ -1,16 +1,24 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
+import hashlib
+import json
 import logging
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
 
 from odoo import models, api, fields, _
-from odoo.addons.account_avatax.lib.avatax_client import AvataxClient
+from odoo.addons.account_avatax.lib.avatax_client import AvataxClient, POOL_MAXSIZE
 from odoo.exceptions import UserError, ValidationError, RedirectWarning
 from odoo.release import version
 from odoo.tools import float_round, format_list
+from odoo.tools.lru import LRU
 
 _logger = logging.getLogger(__name__)
 
+# Responses of the uncommitted transactions (tax quotes), by transaction: (digest of the transaction, response, time).
+AVATAX_QUOTE_CACHE = LRU(4096)
+
 
 class AccountExternalTaxMixin(models.AbstractModel):
     _inherit = 'account.external.tax.mixin'
@@ -315,23 +323,95 @@ class AccountExternalTaxMixin(models.AbstractModel):
     def _query_avatax_taxes(self, commit=False):
         """Query Avatax with all the transactions linked to `self`.
 
+        The requests are sent concurrently, and the uncommitted transactions that didn't change since they were last
+        sent are not sent again: their previous response is reused for `account_avatax.quote_cache_timeout` seconds
+        (15 minutes by default, 0 to disable it).
+
         :return (dict<Model, dict>): a mapping between document records and the response from Avatax
         """
         if not self:
             return {}
-        client = self._get_client(self.company_id)
-        transactions = {record: record._get_avatax_taxes(commit) for record in self}
-        # TODO batch the `create_transaction`
-        return {
-            record: client.create_transaction(transaction, include='Lines')
-            for record, transaction in transactions.items()
-        }
+        cache_timeout = int(self.env['ir.config_parameter'].sudo().get_param('account_avatax.quote_cache_timeout', 900))
+        query_results = {}
+        for company, records in self.grouped('company_id').items():
+            client = self._get_client(company)
+            transactions, digests = {}, {}
+            for record in records:
+                transaction = record._get_avatax_taxes(commit)
+                cache_key = record._get_avatax_quote_cache_key(client)
+                if commit or not cache_timeout:
+                    self._invalidate_avatax_quote(cache_key)
+                else:
+                    digest = hashlib.sha256(json.dumps(transaction, sort_keys=True, default=str).encode()).hexdigest()
+                    try:
+                        cached_digest, cached_response, cached_time = AVATAX_QUOTE_CACHE[cache_key]
+                    except KeyError:
+                        cached_digest = None
+                    if cached_digest == digest and time.monotonic() - cached_time < cache_timeout:
+                        query_results[record] = cached_response
+                        continue
+                    digests[record] = (cache_key, digest)
+                transactions[record] = transaction
+
+            for record, response in self._create_avatax_transactions(client, transactions).items():
+                if record in digests and not response.get('errors') and not response.get('error'):
+                    cache_key, digest = digests[record]
+                    AVATAX_QUOTE_CACHE[cache_key] = (digest, response, time.monotonic())
+                query_results[record] = response
+        return {record: query_results[record] for record in self}
+
+    def _create_avatax_transactions(self, client, transactions):
+        """Send the transactions to Avatax, `account_avatax.request_parallelism` requests at a time.
+
+        :param transactions (dict<Model, dict>): the `CreateTransactionModel` to send, by document record
+        :return (dict<Model, dict>): the response from Avatax, by document record
+        """
+        parallelism = min(
+            int(self.env['ir.config_parameter'].sudo().get_param('account_avatax.request_parallelism', 4)),
+            POOL_MAXSIZE,
+            len(transactions),
+        )
+        if parallelism <= 1:
+            return {
+                record: client.create_transaction(transaction, include='Lines')
+                for record, transaction in transactions.items()
+            }
+
+        # The requests are logged with the ORM, which can't be used outside of this thread: the log messages are
+        # collected and logged once all the requests are done.
+        logger = getattr(client, 'logger', None)
+        messages = []
+        client.logger = messages.append
+        try:
+            with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='avatax') as executor:
+                responses = executor.map(
+                    lambda transaction: client.create_transaction(transaction, include='Lines'),
+                    transactions.values(),
+                )
+                return dict(zip(transactions, responses))
+        finally:
+            if logger:
+                client.logger = logger
+                for message in messages:
+                    logger(message)
+
+    def _get_avatax_quote_cache_key(self, client):
+        self.ensure_one()
+        return (self.env.cr.dbname, client.base_url, self.company_id.id, self.avatax_unique_code)
+
+    @api.model
+    def _invalidate_avatax_quote(self, cache_key):
+        try:
+            del AVATAX_QUOTE_CACHE[cache_key]
+        except KeyError:
+            pass
 
     def _uncommit_external_taxes(self):
         for record in self.filtered('is_avatax'):
             if not record.company_id.avalara_commit:
                 continue
             client = self._get_client(record.company_id)
+            self._invalidate_avatax_quote(record._get_avatax_quote_cache_key(client))
             query_result = client.uncommit_transaction(
                 companyCode=record.company_id.partner_id.avalara_partner_code,
                 transactionCode=record.avatax_unique_code,
@@ -352,6 +432,7 @@ class AccountExternalTaxMixin(models.AbstractModel):
             if not record.company_id.avalara_commit:
                 continue
             client = self._get_client(record.company_id)
+            self._invalidate_avatax_quote(record._get_avatax_quote_cache_key(client))
             query_result = client.void_transaction(
                 companyCode=record.company_id.partner_id.avalara_partner_code,
                 transactionCode=record.avatax_unique_code,
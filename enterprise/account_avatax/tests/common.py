@@ -1,5 +1,9 @@
+import json
 import os
+import threading
+import time
 from contextlib import contextmanager, ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import SkipTest
 from unittest.mock import patch
 
@@ -22,6 +26,8 @@ class TestAvataxCommon(TransactionCase):
         cls.env.company.avalara_api_key = os.getenv("AVALARA_API_KEY") or "AVALARA_API_KEY"
         cls.env.company.avalara_environment = 'sandbox'
         cls.env.company.avalara_commit = True
+        # The responses are mocked: don't reuse the responses of the other tests.
+        cls.env['ir.config_parameter'].set_param('account_avatax.quote_cache_timeout', 0)
 
         # Update address of company
         company = cls.env.user.company_id
@@ -103,6 +109,65 @@ class TestAvataxCommon(TransactionCase):
         with patch(f'{AvataxClient.__module__}.AvataxClient.request', capture.capture_request):
             yield capture
 
+    @classmethod
+    @contextmanager
+    def _mock_avatax_server(cls, rate=0.06, delay=0.1):
+        """Serve the `createoradjust` endpoint on a local server, used by the clients of the sandbox environment.
+
+        Every line is taxed at `rate` by a single tax, after a `delay` in seconds.
+        """
+        class Stats:
+            requests = 0
+            connections = set()
+            in_flight = 0
+            max_in_flight = 0
+            lock = threading.Lock()
+
+        class AvataxRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                with Stats.lock:
+                    Stats.requests += 1
+                    Stats.connections.add(self.client_address)
+                    Stats.in_flight += 1
+                    Stats.max_in_flight = max(Stats.max_in_flight, Stats.in_flight)
+                transaction = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['createTransactionModel']
+                time.sleep(delay)
+                detail = {'taxName': 'CA STATE TAX', 'rate': rate, 'unitOfBasis': 'PerCurrencyUnit'}
+                lines = [{
+                    'lineNumber': line['number'],
+                    'lineAmount': line['amount'],
+                    'tax': round(line['amount'] * rate, 2),
+                    'details': [{**detail, 'tax': round(line['amount'] * rate, 2)}],
+                } for line in transaction['lines']]
+                body = json.dumps({
+                    'lines': lines,
+                    'summary': [{**detail, 'tax': sum(line['tax'] for line in lines)}],
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with Stats.lock:
+                    Stats.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), AvataxRequestHandler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with patch.object(AvataxClient, '_sandbox_url', f'http://127.0.0.1:{server.server_port}'):
+                yield Stats
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
     @classmethod
     @contextmanager
     def _skip_no_credentials(cls):
@@ -518,6 +518,31 @@ class TestAccountAvalaraInternal(TestAccountAvalaraInternalCommon):
             ]
         )
 
+    def test_batched_requests(self):
+        """The taxes of several invoices are requested concurrently on kept alive connections, and the unchanged
+        invoices are not requested again."""
+        self.env['ir.config_parameter'].set_param('account_avatax.request_parallelism', 4)
+        self.env['ir.config_parameter'].set_param('account_avatax.quote_cache_timeout', 900)
+        invoices = self.env['account.move'].concat(*(self._create_invoice(post=False) for _ in range(12)))
+
+        with self._mock_avatax_server() as server:
+            invoices.button_external_tax_calculation()
+            self.assertEqual(server.requests, 12)
+            self.assertLessEqual(len(server.connections), 4, "The connections should be reused.")
+            self.assertGreater(server.max_in_flight, 1, "The requests should be sent concurrently.")
+            self.assertRecordValues(invoices, [{'amount_untaxed': 100.0, 'amount_tax': 6.0}] * 12)
+
+            invoices.button_external_tax_calculation()
+            self.assertEqual(server.requests, 12, "The unchanged invoices should not be requested again.")
+
+            invoices[0].invoice_line_ids.price_unit = 200
+            invoices.button_external_tax_calculation()
+            self.assertEqual(server.requests, 13)
+            self.assertEqual(invoices[0].amount_tax, 12.0)
+
+            invoices[1].action_post()
+            self.assertEqual(server.requests, 14, "The committed transactions should always be requested.")
+
 
 @tagged("external_l10n", "external", "-at_install", "post_install", "-standard")
 class TestAccountAvalaraInternalIntegration(TestAccountAvalaraInternalCommon):
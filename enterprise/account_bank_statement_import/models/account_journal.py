@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
+
 from odoo import models, tools, _
 from odoo.addons.base.models.res_bank import sanitize_account_number
 from odoo.exceptions import UserError, RedirectWarning
+from odoo.tools import split_every
+
+# Number of statement lines created at once, to bound the size of the cache when importing large files
+STATEMENT_LINES_BATCH_SIZE = 1000
 
 
 class AccountJournal(models.Model):
@@ -215,6 +221,19 @@ class AccountJournal(models.Model):
         return journal
 
     def _complete_bank_statement_vals(self, stmts_vals, journal, account_number, attachment):
+        sanitized_account_number = sanitize_account_number(account_number)
+        # Find the bank accounts of all the transactions at once
+        partner_banks_per_number = defaultdict(lambda: self.env['res.partner.bank'])
+        identifying_strings = {
+            line_vals['account_number']
+            for st_vals in stmts_vals
+            for line_vals in st_vals['transactions']
+            if not line_vals.get('partner_bank_id') and line_vals.get('account_number')
+        }
+        if identifying_strings:
+            for partner_bank in self.env['res.partner.bank'].search([('acc_number', 'in', list(identifying_strings))]):
+                partner_banks_per_number[partner_bank.acc_number] |= partner_bank
+
         for st_vals in stmts_vals:
             if not st_vals.get('reference'):
                 st_vals['reference'] = attachment.name
@@ -222,7 +241,6 @@ class AccountJournal(models.Model):
                 line_vals['journal_id'] = journal.id
                 unique_import_id = line_vals.get('unique_import_id')
                 if unique_import_id:
-                    sanitized_account_number = sanitize_account_number(account_number)
                     line_vals['unique_import_id'] = (sanitized_account_number and sanitized_account_number + '-' or '') + str(journal.id) + '-' + unique_import_id
 
                 if not line_vals.get('partner_bank_id'):
@@ -230,16 +248,11 @@ class AccountJournal(models.Model):
                     # reconciliation process will be linked to the bank when the statement is closed.
                     identifying_string = line_vals.get('account_number')
                     if identifying_string:
+                        partner_banks = partner_banks_per_number[identifying_string]
                         if line_vals.get('partner_id'):
-                            partner_bank = self.env['res.partner.bank'].search([
-                                ('acc_number', '=', identifying_string),
-                                ('partner_id', '=', line_vals['partner_id'])
-                            ])
+                            partner_bank = partner_banks.filtered(lambda bank: bank.partner_id.id == line_vals['partner_id'])
                         else:
-                            partner_bank = self.env['res.partner.bank'].search([
-                                ('acc_number', '=', identifying_string),
-                                ('company_id', 'in', (False, journal.company_id.id))
-                            ])
+                            partner_bank = partner_banks.filtered(lambda bank: bank.company_id.id in (False, journal.company_id.id))
                         # If multiple partners share the same account number, do not try to guess and just avoid setting it
                         if partner_bank and len(partner_bank) == 1:
                             line_vals['partner_bank_id'] = partner_bank.id
@@ -251,6 +264,20 @@ class AccountJournal(models.Model):
         BankStatement = self.env['account.bank.statement']
         BankStatementLine = self.env['account.bank.statement.line']
 
+        # Find the transactions already imported at once
+        unique_import_ids = [
+            line_vals['unique_import_id']
+            for st_vals in stmts_vals
+            for line_vals in st_vals['transactions']
+            if line_vals.get('unique_import_id')
+        ]
+        imported_unique_import_ids = set()
+        for unique_import_ids_batch in split_every(10000, unique_import_ids, list):
+            imported_unique_import_ids.update(BankStatementLine.sudo().search_fetch(
+                [('unique_import_id', 'in', unique_import_ids_batch)],
+                ['unique_import_id'],
+            ).mapped('unique_import_id'))
+
         # Filter out already imported transactions and create statements
         statement_ids = []
         statement_line_ids = []
@@ -258,11 +285,11 @@ class AccountJournal(models.Model):
         for st_vals in stmts_vals:
             filtered_st_lines = []
             for line_vals in st_vals['transactions']:
-                if (line_vals['amount'] != 0
-                   and ('unique_import_id' not in line_vals
-                   or not line_vals['unique_import_id']
-                   or not bool(BankStatementLine.sudo().search([('unique_import_id', '=', line_vals['unique_import_id'])], limit=1)))):
+                if line_vals['amount'] != 0 and line_vals.get('unique_import_id') not in imported_unique_import_ids:
                     filtered_st_lines.append(line_vals)
+                    # A transaction repeated further in the file is ignored as well
+                    if line_vals.get('unique_import_id'):
+                        imported_unique_import_ids.add(line_vals['unique_import_id'])
                 else:
                     ignored_statement_lines_import_ids.append(line_vals)
                     if st_vals.get('balance_start') is not None:
@@ -271,9 +298,16 @@ class AccountJournal(models.Model):
             if len(filtered_st_lines) > 0:
                 # Remove values that won't be used to create records
                 st_vals.pop('transactions', None)
-                # Create the statement
-                st_vals['line_ids'] = [[0, False, line] for line in filtered_st_lines]
+                # Create the statement, then its lines by batches
+                lines_batches = split_every(STATEMENT_LINES_BATCH_SIZE, filtered_st_lines, list)
+                st_vals['line_ids'] = [[0, False, line] for line in next(lines_batches)]
                 statement = BankStatement.with_context(default_journal_id=self.id).create(st_vals)
+                for lines_batch in lines_batches:
+                    self.env.invalidate_all()
+                    BankStatementLine.with_context(default_journal_id=self.id).create([
+                        {**line, 'statement_id': statement.id}
+                        for line in lines_batch
+                    ])
                 if not statement.name:
                     statement.name = st_vals['reference']
                 statement_ids.append(statement.id)
@@ -23,23 +23,26 @@ class AccountJournal(models.Model):
         return rslt
 
     def _check_camt(self, attachment):
+        """ Checks the root tag of the file, without parsing the whole file. """
         try:
-            root = etree.parse(io.BytesIO(attachment.raw)).getroot()
+            _event, root = next(etree.iterparse(io.BytesIO(attachment.raw), events=('start',)))
         except Exception:
-            return None
-        if root.tag.find('camt.053') != -1:
-            return root
-        return None
+            return False
+        return root.tag.find('camt.053') != -1
 
     def _parse_bank_statement_file(self, attachment):
-        root = self._check_camt(attachment)
-        if root is not None:
-            return self._parse_bank_statement_file_camt(root)
+        if self._check_camt(attachment):
+            try:
+                return self._parse_bank_statement_file_camt(io.BytesIO(attachment.raw))
+            except etree.XMLSyntaxError as e:
+                raise UserError(_("The CAMT file could not be read: %s", e))
         return super()._parse_bank_statement_file(attachment)
 
-    def _parse_bank_statement_file_camt(self, root):
-        ns = {'ns': root.xpath('namespace-uri(.)')}
-
+    def _parse_bank_statement_file_camt(self, camt_file):
+        """ Parses the CAMT file incrementally: each entry (Ntry) is processed as soon as it is parsed, then dropped, so
+        that the file is never loaded in memory as a whole. The header of the statement (Id, Acct, Bal, ...) always
+        precedes its entries.
+        """
         curr_cache = {c['name']: c['id'] for c in self.env['res.currency'].search_read([], ['id', 'name'])}
         statements_per_iban = {}
         currency_per_iban = {}
@@ -47,27 +50,37 @@ class AccountJournal(models.Model):
         currency = account_no = False
         has_multi_currency = self.env.user.has_group('base.group_multi_currency')
         journal_currency = self.currency_id or self.company_id.currency_id
-        for statement in root[0].findall('ns:Stmt', ns):
-            statement_vals = {}
-            statement_vals['name'] = (statement.xpath('ns:LglSeqNb/text()', namespaces=ns) or statement.xpath('ns:Id/text()', namespaces=ns))[0]
-            statement_date = CAMT._get_statement_date(statement, namespaces=ns)
-
-            # Transaction Entries 0..n
-            transactions = []
-            sequence = 0
-
-            # Account Number    1..1
-            # if not IBAN value then... <Othr><Id> would have.
-            account_no = sanitize_account_number(statement.xpath('ns:Acct/ns:Id/ns:IBAN/text() | ns:Acct/ns:Id/ns:Othr/ns:Id/text()',
-                namespaces=ns)[0])
-
-            # Currency 0..1
-            currency = statement.xpath('ns:Acct/ns:Ccy/text() | ns:Bal/ns:Amt/@Ccy', namespaces=ns)[0]
-
-            if currency and journal_currency and currency != journal_currency.name:
+        statement_vals = None
+        for _event, element in etree.iterparse(camt_file, events=('end',), tag=('{*}Stmt', '{*}Ntry')):
+            ns = {'ns': etree.QName(element).namespace}
+            is_entry = etree.QName(element).localname == 'Ntry'
+            statement = element.getparent() if is_entry else element
+
+            if statement_vals is None:
+                statement_vals = {}
+                statement_vals['name'] = (statement.xpath('ns:LglSeqNb/text()', namespaces=ns) or statement.xpath('ns:Id/text()', namespaces=ns))[0]
+                statement_date = CAMT._get_statement_date(statement, namespaces=ns)
+
+                # Transaction Entries 0..n
+                transactions = []
+                sequence = 0
+
+                # Account Number    1..1
+                # if not IBAN value then... <Othr><Id> would have.
+                account_no = sanitize_account_number(statement.xpath('ns:Acct/ns:Id/ns:IBAN/text() | ns:Acct/ns:Id/ns:Othr/ns:Id/text()',
+                    namespaces=ns)[0])
+
+                # Currency 0..1
+                currency = statement.xpath('ns:Acct/ns:Ccy/text() | ns:Bal/ns:Amt/@Ccy', namespaces=ns)[0]
+                skip_statement = currency and journal_currency and currency != journal_currency.name
+
+            if is_entry and skip_statement:
+                element.clear()
+                statement.remove(element)
                 continue
 
-            for entry in statement.findall('ns:Ntry', ns):
+            if is_entry:
+                entry = element
                 # Date 0..1
                 date = CAMT._get_transaction_date(entry, namespaces=ns) or statement_date
 
@@ -142,20 +155,29 @@ class AccountJournal(models.Model):
                     entry_details_sum += entry_vals['amount']
                     if abs(entry_vals['amount']) >= abs(largest_entry_vals['amount']):
                         largest_entry_vals = entry_vals
-                
+
                 # In a multi-currency entry (Ntry) with multiple entry details, we might have some rounding differences when applying the currency rate.
                 # We add this difference back on the largest amount.
                 transaction_amount = float(entry.find('ns:Amt', namespaces=ns).text)
                 transaction_amount = -transaction_amount if entry.find('ns:CdtDbtInd', namespaces=ns).text == 'DBIT' else transaction_amount
                 largest_entry_vals['amount'] += transaction_amount - entry_details_sum
 
-            statement_vals['transactions'] = transactions
-            statement_vals['balance_start'] = CAMT._get_signed_balance(node=statement, namespaces=ns, getters=CAMT._start_balance_getters)
-            statement_vals['balance_end_real'] = CAMT._get_signed_balance(node=statement, namespaces=ns, getters=CAMT._end_balance_getters)
+                # The entry is processed: drop it
+                element.clear()
+                statement.remove(element)
+                continue
 
-            # Save statements and currency
-            statements_per_iban.setdefault(account_no, []).append(statement_vals)
-            currency_per_iban[account_no] = currency
+            if not skip_statement:
+                statement_vals['transactions'] = transactions
+                statement_vals['balance_start'] = CAMT._get_signed_balance(node=statement, namespaces=ns, getters=CAMT._start_balance_getters)
+                statement_vals['balance_end_real'] = CAMT._get_signed_balance(node=statement, namespaces=ns, getters=CAMT._end_balance_getters)
+
+                # Save statements and currency
+                statements_per_iban.setdefault(account_no, []).append(statement_vals)
+                currency_per_iban[account_no] = currency
+            statement_vals = None
+            element.clear()
+            statement.getparent().remove(statement)
 
         # If statements target multiple journals, returns thoses targeting the current journal
         if len(statements_per_iban) > 1:
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
+import logging
+import time
+from unittest.mock import patch
+
 from odoo.addons.account.tests.common import AccountTestInvoicingCommon
 from odoo.tests import tagged
 from odoo.tools import file_open
@@ -9,6 +13,57 @@ from odoo.addons.account_bank_statement_import_camt.models.account_journal impor
 NORMAL_AMOUNTS = [100, 150, 250]
 LARGE_AMOUNTS = [10000, 15000, 25000]
 
+_logger = logging.getLogger(__name__)
+
+
+def generate_camt_file(entries_count, account_number='112233', currency='USD'):
+    """ Generates a synthetic CAMT.053 file with a single statement of `entries_count` entries.
+
+    :returns: the content of the file, and the amounts of its entries
+    """
+    amounts = [(index % 100 + 1) * (-1 if index % 3 == 0 else 1) for index in range(entries_count)]
+    entries = ''.join(
+        f'''
+      <Ntry>
+        <Amt Ccy="{currency}">{abs(amount):.2f}</Amt>
+        <CdtDbtInd>{'DBIT' if amount < 0 else 'CRDT'}</CdtDbtInd>
+        <Sts>BOOK</Sts>
+        <BookgDt><Dt>2019-02-13</Dt></BookgDt>
+        <AcctSvcrRef>SYNTHETIC-{index}</AcctSvcrRef>
+        <BkTxCd><Prtry><Cd>ABCD</Cd></Prtry></BkTxCd>
+        <AddtlNtryInf>Transaction {index}</AddtlNtryInf>
+      </Ntry>'''
+        for index, amount in enumerate(amounts)
+    )
+    balance = sum(amounts)
+    content = f'''<?xml version='1.0' encoding='UTF-8'?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.04">
+  <BkToCstmrStmt>
+    <GrpHdr>
+      <MsgId>SYNTHETIC.2019-02-13</MsgId>
+      <CreDtTm>2019-02-13T15:27:15.66+02:00</CreDtTm>
+    </GrpHdr>
+    <Stmt>
+      <Id>SYNTHETIC.2019-02-13</Id>
+      <CreDtTm>2019-02-13T15:27:15.66+02:00</CreDtTm>
+      <Acct><Id><Othr><Id>{account_number}</Id></Othr></Id></Acct>
+      <Bal>
+        <Tp><CdOrPrtry><Cd>OPBD</Cd></CdOrPrtry></Tp>
+        <Amt Ccy="{currency}">0.00</Amt>
+        <CdtDbtInd>CRDT</CdtDbtInd>
+        <Dt><Dt>2019-02-12</Dt></Dt>
+      </Bal>
+      <Bal>
+        <Tp><CdOrPrtry><Cd>CLBD</Cd></CdOrPrtry></Tp>
+        <Amt Ccy="{currency}">{abs(balance):.2f}</Amt>
+        <CdtDbtInd>{'DBIT' if balance < 0 else 'CRDT'}</CdtDbtInd>
+        <Dt><Dt>2019-02-13</Dt></Dt>
+      </Bal>{entries}
+    </Stmt>
+  </BkToCstmrStmt>
+</Document>'''
+    return content.encode(), amounts
+
 @tagged('post_install', '-at_install')
 class TestAccountBankStatementImportCamt(AccountTestInvoicingCommon):
 
@@ -180,22 +235,23 @@ class TestAccountBankStatementImportCamt(AccountTestInvoicingCommon):
         self.env.ref('base.EUR').active = True
         self._test_minimal_camt_file_import('camt_053_minimal_EUR.xml', self.env.ref('base.EUR'))
 
-    def _import_camt_file(self, camt_file_name, currency):
+    def _create_camt_journal(self, currency):
         # Create a bank account and journal corresponding to the CAMT
         # file (same currency and account number)
         BankAccount = self.env['res.partner.bank']
         partner = self.env.user.company_id.partner_id
         bank_account = BankAccount.search([('acc_number', '=', '112233'), ('partner_id', '=', partner.id)]) \
                        or BankAccount.create({'acc_number': '112233', 'partner_id': partner.id})
-        bank_journal = self.env['account.journal'].create(
-            {
-                'name': "Bank 112233 %s" % currency.name,
-                'code': "B-%s" % currency.name,
-                'type': 'bank',
-                'bank_account_id': bank_account.id,
-                'currency_id': currency.id,
-            }
-        )
+        return self.env['account.journal'].create({
+            'name': "Bank 112233 %s" % currency.name,
+            'code': "B-%s" % currency.name,
+            'type': 'bank',
+            'bank_account_id': bank_account.id,
+            'currency_id': currency.id,
+        })
+
+    def _import_camt_file(self, camt_file_name, currency):
+        bank_journal = self._create_camt_journal(currency)
 
         # Use an import wizard to process the file
         camt_file_path = f'account_bank_statement_import_camt/test_camt_file/{camt_file_name}'
@@ -471,3 +527,72 @@ class TestAccountBankStatementImportCamt(AccountTestInvoicingCommon):
         ).filtered(lambda bk_stmt: bk_stmt.currency_id == usd_currency).ensure_one()
         line = bank_st_record.line_ids.ensure_one()
         self.assertEqual(line.transaction_type, "custom_code: custom_family (custom_subfamily)")
+
+    def test_camt_file_import_by_batches(self):
+        """
+        Ensures that the entries of a CAMT file are created by batches, and that importing the file again doesn't
+        import any of them twice.
+        """
+        usd_currency = self.env.ref('base.USD')
+        bank_journal = self._create_camt_journal(usd_currency)
+        camt_file, amounts = generate_camt_file(25)
+        attachment = self.env['ir.attachment'].create({'name': 'synthetic_camt.xml', 'raw': camt_file})
+
+        with patch('odoo.addons.account_bank_statement_import.models.account_journal.STATEMENT_LINES_BATCH_SIZE', 10):
+            bank_journal.create_document_from_attachment(attachment.ids)
+        statement = self.env['account.bank.statement'].search([('journal_id', '=', bank_journal.id)])
+        self.assertRecordValues(statement, [{'balance_start': 0.0, 'balance_end_real': sum(amounts), 'is_complete': True}])
+        self.assertEqual(statement.line_ids.sorted('id').mapped('amount'), amounts)
+        self.assertEqual(len(set(statement.line_ids.mapped('unique_import_id'))), 25)
+
+        with self.assertRaisesRegex(UserError, 'You already have imported that file.'):
+            bank_journal.create_document_from_attachment(attachment.ids)
+
+    def test_import_transaction_repeated_across_statements(self):
+        """ A transaction repeated in several statements of the same file is only imported once. """
+        bank_journal = self._create_camt_journal(self.env.ref('base.USD'))
+        stmts_vals = [{
+            'name': name,
+            'reference': name,
+            'balance_start': balance_start,
+            'balance_end_real': balance_start + 300.0,
+            'transactions': [
+                {'payment_ref': 'Shared', 'amount': 100.0, 'date': '2019-02-13', 'unique_import_id': 'SHARED-1'},
+                {'payment_ref': name, 'amount': 200.0, 'date': '2019-02-13', 'unique_import_id': f'{name}-2'},
+            ],
+        } for name, balance_start in (('Statement 1', 0.0), ('Statement 2', 300.0))]
+
+        statement_ids, statement_line_ids, notifications = bank_journal._create_bank_statements(stmts_vals)
+
+        statements = self.env['account.bank.statement'].browse(statement_ids)
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(len(statement_line_ids), 3)
+        self.assertEqual(
+            sorted(statements.line_ids.mapped('unique_import_id')),
+            ['SHARED-1', 'Statement 1-2', 'Statement 2-2'],
+        )
+        self.assertEqual(len(notifications), 1)
+
+
+@tagged('post_install', '-at_install', '-standard', 'camt_benchmark')
+class TestAccountBankStatementImportCamtBenchmark(AccountTestInvoicingCommon):
+
+    def test_camt_file_import_benchmark(self):
+        """ Imports a synthetic CAMT file of 100k entries, and logs the throughput of the import. """
+        bank_journal = self.env['account.journal'].create({
+            'name': 'Bank 112233',
+            'code': 'BNK67',
+            'type': 'bank',
+            'bank_acc_number': '112233',
+            'currency_id': self.env.ref('base.USD').id,
+        })
+        camt_file, amounts = generate_camt_file(100000)
+        attachment = self.env['ir.attachment'].create({'name': 'synthetic_camt.xml', 'raw': camt_file})
+
+        start = time.perf_counter()
+        bank_journal.create_document_from_attachment(attachment.ids)
+        duration = time.perf_counter() - start
+        _logger.info("Imported %s CAMT entries in %.1fs (%.0f entries/s)", len(amounts), duration, len(amounts) / duration)
+
+        statement = self.env['account.bank.statement'].search([('journal_id', '=', bank_journal.id)])
+        self.assertEqual(len(statement.line_ids), len(amounts))
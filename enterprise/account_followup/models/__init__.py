@@ -2,6 +2,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 from . import account_followup
+from . import account_followup_job
 from . import account_followup_report
 from . import ir_actions_report
 from . import res_partner
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import time
+
+from odoo import api, fields, models, modules, tools
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+
+class AccountFollowupJob(models.Model):
+    """ Automatic follow-up of a partner queued by the follow-up cron.
+
+    The cron queues one job per partner in need of an automatic follow-up and per company (see
+    res.partner._cron_execute_followup_company), then processes the pending jobs by batches, committing after each of them,
+    until it runs out of time. A separate cron, only processing the jobs, is then triggered for the remaining ones: the queue
+    is drained across as many runs as needed, and resumes where it stopped if a run is interrupted, without queuing the
+    partners again. The partners of a company are only queued again by the next daily run of the follow-up cron, once all
+    the jobs of that company have been processed.
+
+    The jobs of the last run of each company are kept, to follow the progress of the run per company and follow-up level.
+    """
+    _name = 'account_followup.followup.job'
+    _description = "Follow-up Job"
+    _order = 'id'
+
+    company_id = fields.Many2one(comodel_name='res.company', required=True, readonly=True, index=True, ondelete='cascade')
+    partner_id = fields.Many2one(comodel_name='res.partner', required=True, readonly=True, ondelete='cascade')
+    followup_line_id = fields.Many2one(
+        comodel_name='account_followup.followup.line',
+        string="Follow-up Level",
+        readonly=True,
+        ondelete='set null',
+        help="Follow-up level of the partner when the job was queued.",
+    )
+    state = fields.Selection(
+        selection=[
+            ('to_process', "Pending"),
+            ('done', "Processed"),
+            ('failed', "Failed"),
+        ],
+        required=True,
+        readonly=True,
+        index=True,
+        default='to_process',
+    )
+    error_message = fields.Text(readonly=True)
+
+    @api.model
+    def _process_jobs(self, batch_size=50, time_budget=None):
+        """ Process the pending jobs by batches, committing after each batch.
+
+        The follow-up emails are only queued while processing a batch, and sent all at once by the mail queue afterwards.
+
+        :param batch_size: number of jobs processed between two commits.
+        :param time_budget: number of seconds after which no new batch is started; the processing cron is then triggered if
+            some jobs are still pending. Defaults to the time limit of the crons.
+        """
+        auto_commit = not modules.module.current_test
+        if time_budget is None:
+            # 'limit_time_real_cron' defaults to -1.
+            cron_limit_time = tools.config['limit_time_real_cron'] or -1
+            time_budget = (cron_limit_time if cron_limit_time > 0 else 180) * 0.8
+        start_time = time.monotonic()
+
+        while jobs := self.search([('state', '=', 'to_process')], order='company_id, id', limit=batch_size):
+            for company in jobs.company_id:
+                jobs.filtered(lambda job: job.company_id == company)._process_company_jobs(company)
+            self.env.ref('mail.ir_cron_mail_scheduler_action')._trigger()
+            if auto_commit:
+                self.env.cr.commit()
+
+            if time.monotonic() - start_time > time_budget:
+                if self.search_count([('state', '=', 'to_process')], limit=1):
+                    self.env.ref('account_followup.ir_cron_process_followup_jobs')._trigger()
+                return
+
+    def _process_company_jobs(self, company):
+        # The follow-up data of all the partners is cached by database and not by company, and is outdated by the previous jobs.
+        self.env.cr.cache.pop('res_partner_all_followup', None)
+        for job in self:
+            partner = job.partner_id.with_context(allowed_company_ids=company.ids, mail_notify_force_send=False)
+            try:
+                with self.env.cr.savepoint():
+                    partner._execute_followup_partner()
+            except UserError as e:
+                # followup may raise exception due to configuration issues
+                # i.e. partner missing email
+                partner._message_log(body=e)
+                _logger.warning(e, exc_info=True)
+                job.write({'state': 'failed', 'error_message': str(e)})
+            except Exception as e:  # noqa: BLE001
+                _logger.exception("Automatic follow-up of partner %s failed.", partner.id)
+                job.write({'state': 'failed', 'error_message': str(e)})
+            else:
+                job.state = 'done'
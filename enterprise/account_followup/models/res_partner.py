@@ -5,7 +5,6 @@ from collections import defaultdict
 from datetime import datetime
 
 from odoo import _, api, fields, models
-from odoo.exceptions import UserError
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT, SQL
 from odoo.tools.misc import format_date, get_lang
 
@@ -598,17 +597,27 @@ class ResPartner(models.Model):
             return partners_with_missing_info._create_followup_missing_information_wizard()
 
     def _cron_execute_followup_company(self):
+        """ Queue the automatic follow-ups of the partners of the current company in need of action, unless the follow-ups
+        queued by a previous run are still being processed (see account_followup.followup.job).
+        """
+        Job = self.env['account_followup.followup.job']
+        company = self.env.company
+        if Job.search_count([('company_id', '=', company.id), ('state', '=', 'to_process')], limit=1):
+            return
+        # Only the jobs of the last run are kept.
+        Job.search([('company_id', '=', company.id)]).unlink()
+
         followup_data = self._query_followup_data(all_partners=True)
         in_need_of_action = self.env['res.partner'].browse([d['partner_id'] for d in followup_data.values() if d['followup_status'] == 'in_need_of_action'])
         in_need_of_action_auto = in_need_of_action.filtered(lambda p: p.followup_line_id.auto_execute and p.followup_reminder_type == 'automatic')
-        for partner in in_need_of_action_auto[:1000]:
-            try:
-                partner._execute_followup_partner()
-            except UserError as e:
-                # followup may raise exception due to configuration issues
-                # i.e. partner missing email
-                partner._message_log(body=e)
-                _logger.warning(e, exc_info=True)
+        Job.create([
+            {
+                'company_id': company.id,
+                'partner_id': partner.id,
+                'followup_line_id': partner.followup_line_id.id,
+            }
+            for partner in in_need_of_action_auto
+        ])
 
     def _cron_execute_followup(self):
         for company in self.env["res.company"].search([]):
@@ -616,6 +625,7 @@ class ResPartner(models.Model):
             # where the context is changing in the same transaction
             self.env.cr.cache.pop('res_partner_all_followup', None)
             self.with_context(allowed_company_ids=company.ids)._cron_execute_followup_company()
+        self.env['account_followup.followup.job']._process_jobs()
 
     def _show_pay_now_button(self):
         invoice_online_payment = bool(self.env['ir.config_parameter'].sudo().get_param('account_payment.enable_portal_payment'))
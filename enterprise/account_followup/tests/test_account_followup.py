@@ -326,6 +326,42 @@ class TestAccountFollowupReports(TestAccountFollowupCommon, MailCommon):
             patched.assert_called_once()
             self.assertPartnerFollowup(self.partner_a, 'with_overdue_invoices', followup_10)
 
+    def test_followup_cron_jobs(self):
+        """ The automatic follow-ups are queued as jobs, whose failures don't prevent the other follow-ups from being
+        processed, and which are queued again by the next run while the partner still needs an action.
+        """
+        Job = self.env['account_followup.followup.job']
+        followup_10 = self.create_followup(delay=10)
+        followup_10.write({'auto_execute': True, 'send_email': True})
+        self.partner_a.email = 'partner_a@example.com'
+        self.partner_b.email = False
+        self.create_invoice('2022-01-01')
+        self.create_invoice('2022-01-01', partner=self.partner_b)
+
+        with freeze_time('2022-01-11'):
+            self.env['res.partner']._cron_execute_followup()
+            jobs = Job.search([('company_id', '=', self.env.company.id)])
+            self.assertRecordValues(jobs.sorted(lambda job: job.partner_id == self.partner_b), [
+                {'partner_id': self.partner_a.id, 'followup_line_id': followup_10.id, 'state': 'done'},
+                {'partner_id': self.partner_b.id, 'followup_line_id': followup_10.id, 'state': 'failed'},
+            ])
+            self.assertIn(self.partner_b.name, jobs.filtered(lambda job: job.state == 'failed').error_message)
+            self.assertPartnerFollowup(self.partner_a, 'with_overdue_invoices', followup_10)
+            self.assertPartnerFollowup(self.partner_b, 'in_need_of_action', followup_10)
+
+            # Processing the remaining jobs, as the cron triggered when the time budget is exceeded, doesn't queue them again
+            Job._process_jobs()
+            self.assertEqual(Job.search([('company_id', '=', self.env.company.id)]), jobs)
+            self.assertRecordValues(jobs.sorted(lambda job: job.partner_id == self.partner_b), [
+                {'partner_id': self.partner_a.id, 'state': 'done'},
+                {'partner_id': self.partner_b.id, 'state': 'failed'},
+            ])
+
+            self.env['res.partner']._cron_execute_followup()
+            self.assertRecordValues(Job.search([('company_id', '=', self.env.company.id)]), [
+                {'partner_id': self.partner_b.id, 'state': 'failed'},
+            ])
+
     def test_onchange_residual_amount(self):
         '''
         Test residual onchange on account move lines: the residual amount is
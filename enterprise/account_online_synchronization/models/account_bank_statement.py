@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
+import logging
 import threading
 import time
 import json
+from collections import defaultdict
 
 from odoo import api, fields, models, SUPERUSER_ID, tools, _
-from odoo.tools import date_utils
+from odoo.tools import date_utils, SQL
+from odoo.tools.sql import create_index
 from odoo.exceptions import UserError, ValidationError
 
+_logger = logging.getLogger(__name__)
+
 STATEMENT_LINE_CREATION_BATCH_SIZE = 500  # When importing transactions, batch the process to commit after importing batch_size
 
 
@@ -23,6 +28,17 @@ class AccountBankStatementLine(models.Model):
         readonly=True,
     )
 
+    def init(self):
+        super().init()
+        # Used to filter out the transactions already imported in a journal (see account.online.account._get_filtered_transactions).
+        create_index(
+            self.env.cr,
+            'account_bank_statement_line_journal_id_online_transaction_identifier_idx',
+            self._table,
+            ['journal_id', 'online_transaction_identifier'],
+            where='online_transaction_identifier IS NOT NULL',
+        )
+
     @api.model_create_multi
     def create(self, vals_list):
         """
@@ -89,11 +105,18 @@ class AccountBankStatementLine(models.Model):
                 if filtered_transactions:
                     # split transactions import in batch and commit after each batch except in testing mode
                     for index in range(0, len(filtered_transactions), STATEMENT_LINE_CREATION_BATCH_SIZE):
-                        lines_to_reconcile += self.with_user(SUPERUSER_ID).with_company(journal.company_id).with_context(skip_statement_line_cron_trigger=True).create(filtered_transactions[index:index + STATEMENT_LINE_CREATION_BATCH_SIZE])
+                        st_lines = self.with_user(SUPERUSER_ID).with_company(journal.company_id).with_context(skip_statement_line_cron_trigger=True).create(filtered_transactions[index:index + STATEMENT_LINE_CREATION_BATCH_SIZE])
+                        st_lines._online_sync_assign_partners()
+                        lines_to_reconcile += st_lines
                         if do_commit:
                             self.env.cr.commit()
                     # Set last sync date as the last transaction date
                     journal.account_online_account_id.sudo().write({'last_sync': filtered_transactions[-1]['date']})
+                    duration = time.time() - start_time
+                    _logger.info(
+                        "Online synchronization of journal %s: %s transactions received, %s imported in %.2fs (%.1f lines/s).",
+                        journal.id, len(transactions), len(filtered_transactions), duration, len(filtered_transactions) / duration if duration else len(filtered_transactions),
+                    )
 
                 if lines_to_reconcile:
                     # 'limit_time_real_cron' defaults to -1.
@@ -110,3 +133,37 @@ class AccountBankStatementLine(models.Model):
             self.env.cr.commit()
             raise
         return lines_to_reconcile
+
+    def _online_sync_assign_partners(self):
+        """ Set the partner of the imported statement lines having none from their online partner information, for all of them
+        at once: a line gets the partner having the same online partner information, learnt when reconciling the previous
+        transactions of that merchant or account (see bank.rec.widget._action_validate), if there is exactly one.
+        The other lines are left to the usual partner retrieval when they get matched.
+        """
+        st_lines = self.filtered(lambda st_line: not st_line.partner_id and st_line.online_partner_information)
+        if not st_lines:
+            return
+
+        st_lines.flush_recordset(['move_id', 'online_partner_information'])
+        self.env['res.partner'].flush_model(['online_partner_information', 'company_id', 'active'])
+        st_line_ids_by_partner_id = defaultdict(list)
+        for st_line_id, partner_id in self.env.execute_query(SQL(
+            """
+                SELECT st_line.id, MIN(partner.id)
+                  FROM account_bank_statement_line st_line
+                  JOIN account_move move ON move.id = st_line.move_id
+                  JOIN res_company company ON company.id = move.company_id
+                  JOIN res_partner partner ON partner.online_partner_information = st_line.online_partner_information
+             LEFT JOIN res_company partner_company ON partner_company.id = partner.company_id
+                 WHERE st_line.id IN %s
+                   AND partner.active
+                   AND (partner.company_id IS NULL OR company.parent_path LIKE partner_company.parent_path || '%%')
+              GROUP BY st_line.id
+                HAVING COUNT(partner.id) = 1
+            """,
+            tuple(st_lines.ids),
+        )):
+            st_line_ids_by_partner_id[partner_id].append(st_line_id)
+
+        for partner_id, st_line_ids in st_line_ids_by_partner_id.items():
+            self.browse(st_line_ids).partner_id = partner_id
@@ -18,7 +18,7 @@ from odoo.exceptions import UserError, CacheMiss, MissingError, ValidationError,
 from odoo.http import request
 from odoo.addons.account_online_synchronization.models.odoofin_auth import OdooFinAuth
 from odoo.tools.misc import format_amount, format_date, get_lang
-from odoo.tools import _, LazyTranslate
+from odoo.tools import _, LazyTranslate, SQL
 
 _lt = LazyTranslate(__name__)
 _logger = logging.getLogger(__name__)
@@ -284,30 +284,44 @@ class AccountOnlineAccount(models.Model):
         """ This function will filter transaction to avoid duplicate transactions.
             To do that, we're comparing the received online_transaction_identifier with
             those in the database. If there is a match, the new transaction is ignored.
+            The received identifiers are anti-joined with the statement lines of the journal at once,
+            using the index on (journal_id, online_transaction_identifier).
         """
         self.ensure_one()
 
         journal_id = self.journal_ids[0]
-        existing_bank_statement_lines = self.env['account.bank.statement.line'].search_fetch(
-            [
-                ('journal_id', '=', journal_id.id),
-                ('online_transaction_identifier', 'in', [
-                    transaction['online_transaction_identifier']
-                    for transaction in new_transactions
-                    if transaction.get('online_transaction_identifier')
-                ]),
-            ],
-            ['online_transaction_identifier']
-        )
-        existing_online_transaction_identifier = set(existing_bank_statement_lines.mapped('online_transaction_identifier'))
+        transaction_identifiers = list({
+            str(transaction['online_transaction_identifier'])
+            for transaction in new_transactions
+            if transaction.get('online_transaction_identifier')
+        })
+        new_transaction_identifiers = set()
+        if transaction_identifiers:
+            self.env['account.bank.statement.line'].flush_model(['journal_id', 'online_transaction_identifier'])
+            new_transaction_identifiers = {row[0] for row in self.env.execute_query(SQL(
+                """
+                    SELECT transaction.identifier
+                      FROM UNNEST(%s::varchar[]) AS transaction(identifier)
+                     WHERE NOT EXISTS (
+                            SELECT 1
+                              FROM account_bank_statement_line st_line
+                             WHERE st_line.journal_id = %s
+                               AND st_line.online_transaction_identifier = transaction.identifier
+                     )
+                """,
+                transaction_identifiers,
+                journal_id.id,
+            ))}
 
         filtered_transactions = []
         # Remove transactions already imported in Odoo
         for transaction in new_transactions:
             if transaction_identifier := transaction['online_transaction_identifier']:
-                if transaction_identifier in existing_online_transaction_identifier:
+                transaction_identifier = str(transaction_identifier)
+                if transaction_identifier not in new_transaction_identifiers:
                     continue
-                existing_online_transaction_identifier.add(transaction_identifier)
+                # Only keep the first occurrence of a transaction received several times.
+                new_transaction_identifiers.remove(transaction_identifier)
 
             filtered_transactions.append(transaction)
         return filtered_transactions
@@ -203,6 +203,32 @@ class TestSynchStatementCreation(AccountOnlineSynchronizationCommon):
         bnk_stmt_lines = self.BankStatementLine.search([('online_transaction_identifier', '!=', False), ('journal_id', '=', self.euro_bank_journal.id)])
         self.assertEqual(len(bnk_stmt_lines), 2, 'Should only have created two lines')
 
+    @patch('odoo.addons.account_online_synchronization.models.account_online.AccountOnlineLink._fetch_odoo_fin')
+    def test_bulk_import_transactions(self, patched_fetch):
+        # The patched _fetch_odoo_fin stands in for the synchronization server, returning a year of transactions at once.
+        merchant = self.env['res.partner'].create({'name': 'Merchant', 'online_partner_information': 'merchant_1'})
+        transactions = [
+            {
+                **self._create_one_online_transaction(transaction_identifier=f'tx_{i}', date=f'2016-{i % 12 + 1:02}-01'),
+                'online_partner_information': 'merchant_1' if i % 2 else 'unknown_merchant',
+            }
+            for i in range(300)
+        ]
+        patched_fetch.return_value = {'transactions': transactions}
+
+        fetched_transactions = self.account_online_account._retrieve_transactions()['transactions']
+        self.BankStatementLine._online_sync_bank_statement(fetched_transactions, self.account_online_account)
+        st_lines = self.BankStatementLine.search([('online_transaction_identifier', '!=', False), ('journal_id', '=', self.euro_bank_journal.id)])
+        self.assertEqual(len(st_lines), 300)
+        self.assertEqual(st_lines.filtered(lambda st_line: st_line.online_partner_information == 'merchant_1').partner_id, merchant)
+        self.assertFalse(st_lines.filtered(lambda st_line: st_line.online_partner_information == 'unknown_merchant').partner_id)
+
+        # Fetching the same transactions again, e.g. when reconnecting the account, doesn't import them twice.
+        fetched_transactions = self.account_online_account._retrieve_transactions()['transactions']
+        self.assertFalse(self.account_online_account._get_filtered_transactions(fetched_transactions))
+        self.BankStatementLine._online_sync_bank_statement(fetched_transactions, self.account_online_account)
+        self.assertEqual(self.BankStatementLine.search_count([('journal_id', '=', self.euro_bank_journal.id), ('online_transaction_identifier', '!=', False)]), 300)
+
     @patch('odoo.addons.account_online_synchronization.models.account_online.AccountOnlineLink._fetch_odoo_fin')
     def test_fetch_transactions_reauth(self, patched_refresh):
         patched_refresh.side_effect = [
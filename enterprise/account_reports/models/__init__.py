@@ -3,8 +3,12 @@
 
 from . import res_partner
 from . import res_company
+from . import res_currency
 from . import account
 from . import account_report
+from . import account_report_balance_snapshot
+from . import account_report_ledger_change
+from . import account_report_xlsx_export
 from . import account_analytic_report
 from . import bank_reconciliation_report
 from . import account_general_ledger
@@ -25,6 +29,7 @@ from . import account_journal_dashboard
 from . import ir_actions
 from . import account_sales_report
 from . import account_move
+from . import account_partial_reconcile
 from . import account_tax
 from . import executive_summary_report
 from . import budget
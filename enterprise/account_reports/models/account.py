@@ -9,3 +9,8 @@ class AccountAccount(models.Model):
 
     exclude_provision_currency_ids = fields.Many2many('res.currency', relation='account_account_exclude_res_currency_provision', help="Whether or not we have to make provisions for the selected foreign currencies.")
     budget_item_ids = fields.One2many(comodel_name='account.report.budget.item', inverse_name='account_id')  # To use it in the domain when adding accounts from the report
+
+    def write(self, vals):
+        # Codes, types and tags are used by the report engines
+        self.company_ids._bump_account_report_ledger_version()
+        return super().write(vals)
@@ -96,3 +96,7 @@ class AccountFollowupCustomHandler(models.AbstractModel):
 
     def _get_order_by_aml_values(self):
         return SQL('account_move_line.date_maturity, %(order_by)s', order_by=super()._get_order_by_aml_values())
+
+    def _get_keyset_aml_values(self):
+        # The lines are regrouped by due status after the query, so a page doesn't end on the last row of the query.
+        return None
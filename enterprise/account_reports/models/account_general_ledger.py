@@ -363,18 +363,29 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
 
         return new_options
 
-    def _get_aml_values(self, report, options, expanded_account_ids, offset=0, limit=None):
+    def _get_aml_values(self, report, options, expanded_account_ids, offset=0, limit=None, keyset=None):
+        """ Fetches the move lines of the expanded accounts.
+
+        :return: A tuple (results, has_more, next_keyset), next_keyset being the cursor to pass as keyset to load the
+                 results following the ones returned, if has_more is set (see _get_query_amls).
+        """
         rslt = {account_id: {} for account_id in expanded_account_ids}
-        aml_query = self._get_query_amls(report, options, expanded_account_ids, offset=offset, limit=limit)
+        aml_query = self._get_query_amls(report, options, expanded_account_ids, offset=offset, limit=limit, keyset=keyset)
         self._cr.execute(aml_query)
         aml_results_number = 0
         has_more = False
+        next_keyset = None
         for aml_result in self._cr.dictfetchall():
             aml_results_number += 1
             if aml_results_number == limit:
                 has_more = True
                 break
 
+            next_keyset = {
+                'column_group_key': aml_result['column_group_key'],
+                'values': [fields.Date.to_string(aml_result['date']), aml_result['move_name'], aml_result['id']],
+            }
+
             # For asset_receivable the name will already contains the ref with the _compute_name
             if aml_result['ref'] and aml_result['account_type'] != 'asset_receivable':
                 aml_result['communication'] = f"{aml_result['ref']} - {aml_result['name']}"
@@ -402,21 +413,41 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
             else:
                 account_result[aml_key][aml_result['column_group_key']] = aml_result
 
-        return rslt, has_more
+        return rslt, has_more, next_keyset
 
-    def _get_query_amls(self, report, options, expanded_account_ids, offset=0, limit=None) -> SQL:
+    def _get_query_amls(self, report, options, expanded_account_ids, offset=0, limit=None, keyset=None) -> SQL:
         """ Construct a query retrieving the account.move.lines when expanding a report line with or without the load
         more.
         :param options:               The report options.
         :param expanded_account_ids:  The account.account ids corresponding to consider. If None, match every account.
         :param offset:                The offset of the query (used by the load more).
         :param limit:                 The limit of the query (used by the load more).
+        :param keyset:                The cursor of the last line already loaded, as a dict with the column_group_key and
+                                      the (date, move_name, id) values of its move line (used by the load more). When given,
+                                      the query starts right after this line, and the offset is ignored.
         :return:                      (query, params)
         """
         additional_domain = [('account_id', 'in', expanded_account_ids)] if expanded_account_ids is not None else None
         queries = []
         journal_name = self.env['account.journal']._field_to_sql('journal', 'name')
+        column_group_keys = list(options['column_groups'])
         for column_group_key, group_options in report._split_options_per_column_group(options).items():
+            keyset_condition = SQL()
+            if keyset:
+                # The subqueries of the column groups are chained in the order of the column groups: the ones before the group
+                # of the cursor have all been loaded already.
+                if column_group_keys.index(column_group_key) < column_group_keys.index(keyset['column_group_key']):
+                    continue
+                if column_group_key == keyset['column_group_key']:
+                    keyset_condition = SQL("AND %s", report._get_keyset_pagination_condition(
+                        [
+                            (SQL("account_move_line.date"), False),
+                            (SQL("account_move_line.move_name"), True),
+                            (SQL("account_move_line.id"), False),
+                        ],
+                        keyset['values'],
+                    ))
+
             # Get sums for the account move lines.
             # period: [('date' <= options['date_to']), ('date', '>=', options['date_from'])]
             query = report._get_report_query(group_options, domain=additional_domain, date_scope='strict_range')
@@ -462,7 +493,7 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
                 LEFT JOIN res_partner partner               ON partner.id = account_move_line.partner_id
                 LEFT JOIN account_journal journal           ON journal.id = account_move_line.journal_id
                 LEFT JOIN account_full_reconcile full_rec   ON full_rec.id = account_move_line.full_reconcile_id
-                WHERE %(search_condition)s
+                WHERE %(search_condition)s %(keyset_condition)s
                 ORDER BY account_move_line.date, account_move_line.move_name, account_move_line.id
                 ''',
                 account_code=account_code,
@@ -476,12 +507,13 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
                 credit_select=report._currency_table_apply_rate(SQL("account_move_line.credit")),
                 balance_select=report._currency_table_apply_rate(SQL("account_move_line.balance")),
                 search_condition=query.where_clause,
+                keyset_condition=keyset_condition,
             )
             queries.append(query)
 
         full_query = SQL(" UNION ALL ").join(SQL("(%s)", query) for query in queries)
 
-        if offset:
+        if offset and not keyset:
             full_query = SQL('%s OFFSET %s ', full_query, offset)
         if limit:
             full_query = SQL('%s LIMIT %s ', full_query, limit)
@@ -727,7 +759,9 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
             aml_results = unfold_all_batch_data['aml_results'][model_id]
             has_more = unfold_all_batch_data['has_more'].get(model_id, False)
         else:
-            aml_results, has_more = self._get_aml_values(report, options, [model_id], offset=offset, limit=limit_to_load)
+            # Once a first page has been loaded, the following ones are fetched from the cursor it left in the progress.
+            keyset = progress.get('keyset') if offset else None
+            aml_results, has_more, next_keyset = self._get_aml_values(report, options, [model_id], offset=offset, limit=limit_to_load, keyset=keyset)
             aml_results = aml_results[model_id]
 
         next_progress = progress
@@ -736,6 +770,9 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
             lines.append(new_line)
             next_progress = init_load_more_progress(new_line)
 
+        if has_more and not unfold_all_batch_data and next_keyset:
+            next_progress = {**next_progress, 'keyset': next_keyset}
+
         return {
             'lines': lines,
             'offset_increment': report.load_more_limit,
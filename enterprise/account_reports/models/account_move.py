@@ -27,7 +27,10 @@ class AccountMove(models.Model):
             options = move._get_tax_closing_report_options(move.company_id, move.fiscal_position_id, report, move.date)
             move._close_tax_period(report, options)
 
-        return super()._post(soft)
+        posted = super()._post(soft)
+        self.env['account.report.balance.snapshot']._refresh_for_moves(posted)
+        posted.company_id._bump_account_report_ledger_version()
+        return posted
 
     def action_post(self):
         # In the case of a TaxClosingNonPostedDependingMovesError, which can occur when dealing with branches or tax
@@ -58,6 +61,8 @@ class AccountMove(models.Model):
     def button_draft(self):
         # Overridden in order to delete the carryover values when resetting the tax closing to draft
         super().button_draft()
+        self.env['account.report.balance.snapshot']._refresh_for_moves(self)
+        self.company_id._bump_account_report_ledger_version()
         for closing_move in self.filtered(lambda m: m.tax_closing_report_id):
             report = closing_move.tax_closing_report_id
             options = closing_move._get_tax_closing_report_options(closing_move.company_id, closing_move.fiscal_position_id, report, closing_move.date)
@@ -5,6 +5,7 @@ from odoo import api, models, fields, _
 
 from odoo.exceptions import UserError
 from odoo.tools import SQL
+from odoo.tools.sql import create_index
 
 class AccountMoveLine(models.Model):
     _name = "account.move.line"
@@ -12,6 +13,18 @@ class AccountMoveLine(models.Model):
 
     exclude_bank_lines = fields.Boolean(compute='_compute_exclude_bank_lines', store=True)
 
+    def init(self):
+        super().init()
+        # Follow the order of the General Ledger and Partner Ledger lines, so that their load more can start each page right
+        # after the last line of the previous one (see account.report._get_keyset_pagination_condition).
+        create_index(self.env.cr, 'account_move_line_account_id_date_move_name_id_idx', self._table, ['account_id', 'date', 'move_name', 'id'])
+        create_index(self.env.cr, 'account_move_line_partner_id_date_id_idx', self._table, ['partner_id', 'date', 'id'])
+
+    def write(self, vals):
+        # Some fields can still be changed on posted items (analytic distribution, due date, ...)
+        self.filtered(lambda line: line.parent_state == 'posted').company_id._bump_account_report_ledger_version()
+        return super().write(vals)
+
     @api.depends('journal_id')
     def _compute_exclude_bank_lines(self):
         for move_line in self:
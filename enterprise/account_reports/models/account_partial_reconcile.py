@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = 'account.partial.reconcile'
+
+    # Reconciliations change the residual amounts of the journal items, used by the aged balances and partner ledger.
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        partials.company_id._bump_account_report_ledger_version()
+        return partials
+
+    def unlink(self):
+        self.company_id._bump_account_report_ledger_version()
+        return super().unlink()
@@ -469,11 +469,24 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
         if unfold_all_batch_data:
             aml_results = unfold_all_batch_data['aml_values'][record_id]
         else:
-            aml_results = self._get_aml_values(options, [record_id], offset=offset, limit=limit_to_load)[record_id]
+            # Once a first page has been loaded, the following ones are fetched from the cursor it left in the progress.
+            keyset = progress.get('keyset') if offset else None
+            aml_results = self._get_aml_values(options, [record_id], offset=offset, limit=limit_to_load, keyset=keyset)[record_id]
 
         aml_report_lines, next_progress, treated_results_count, has_more = self._get_partner_aml_report_lines(report, options, line_dict_id, aml_results, progress, offset, level_shift=level_shift)
         lines.extend(aml_report_lines)
 
+        if has_more and not unfold_all_batch_data and treated_results_count and self._get_keyset_aml_values() is not None:
+            last_aml_result = aml_results[treated_results_count - 1]
+            next_progress = {
+                **next_progress,
+                'keyset': {
+                    'column_group_key': last_aml_result['column_group_key'],
+                    'key': last_aml_result['key'],
+                    'values': last_aml_result['keyset_values'],
+                },
+            }
+
         return {
             'lines': lines,
             'offset_increment': treated_results_count,
@@ -522,7 +535,24 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
     def _get_order_by_aml_values(self):
         return SQL('account_move_line.date, account_move_line.id')
 
-    def _get_aml_values(self, options, partner_ids, offset=0, limit=None):
+    def _get_keyset_aml_values(self):
+        """
+        Returns the keyset used to paginate the partner ledger query with the load more, as a list of (expression, nullable)
+        tuples following _get_order_by_aml_values (see account.report._get_keyset_pagination_condition).
+
+        Returns None if the lines aren't displayed in the order of the query, in which case the pagination falls back on an offset.
+        """
+        return [
+            (SQL('account_move_line.date'), False),
+            (SQL('account_move_line.id'), False),
+        ]
+
+    def _get_aml_values(self, options, partner_ids, offset=0, limit=None, keyset=None):
+        """ Fetches the move lines of the given partners.
+
+        :param keyset: The cursor of the last line already loaded, as a dict with its column_group_key, key and keyset_values,
+                       used by the load more. When given, the query starts right after this line, and the offset is ignored.
+        """
         rslt = {partner_id: [] for partner_id in partner_ids}
 
         partner_ids_wo_none = [x for x in partner_ids if x]
@@ -540,6 +570,18 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
         report = self.env.ref('account_reports.partner_ledger_report')
         additional_columns = self._get_additional_column_aml_values()
         order_by = self._get_order_by_aml_values()
+        keyset_expressions = self._get_keyset_aml_values()
+
+        def get_keyset_values(partial_id):
+            if keyset_expressions is None:
+                return SQL('NULL')
+            return SQL('json_build_array(%s)', SQL(', ').join([expression for expression, _nullable in keyset_expressions] + [partial_id]))
+
+        def get_keyset_condition(column_group_key, key, partial_id):
+            if not keyset or (column_group_key, key) != (keyset['column_group_key'], keyset['key']):
+                return SQL()
+            return SQL('AND %s', report._get_keyset_pagination_condition([*keyset_expressions, (partial_id, False)], keyset['values']))
+
         for column_group_key, group_options in report._split_options_per_column_group(options).items():
             query = report._get_report_query(group_options, 'strict_range')
             account_alias = query.left_join(lhs_alias='account_move_line', lhs_column='account_id', rhs_table='account_account', rhs_column='id', link='account_id')
@@ -576,14 +618,15 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                     %(journal_name)s                                                 AS journal_name,
                     %(column_group_key)s                                             AS column_group_key,
                     'directly_linked_aml'                                            AS key,
-                    0                                                                AS partial_id
+                    0                                                                AS partial_id,
+                    %(keyset_values)s                                                AS keyset_values
                 FROM %(table_references)s
                 JOIN account_move ON account_move.id = account_move_line.move_id
                 %(currency_table_join)s
                 LEFT JOIN res_company company               ON company.id = account_move_line.company_id
                 LEFT JOIN res_partner partner               ON partner.id = account_move_line.partner_id
                 LEFT JOIN account_journal journal           ON journal.id = account_move_line.journal_id
-                WHERE %(search_condition)s AND %(directly_linked_aml_partner_clause)s
+                WHERE %(search_condition)s AND %(directly_linked_aml_partner_clause)s %(keyset_condition)s
                 ORDER BY %(order_by)s
                 ''',
                 additional_columns=additional_columns,
@@ -598,6 +641,8 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                 currency_table_join=report._currency_table_aml_join(group_options),
                 search_condition=query.where_clause,
                 directly_linked_aml_partner_clause=directly_linked_aml_partner_clause,
+                keyset_values=get_keyset_values(SQL('0')),
+                keyset_condition=get_keyset_condition(column_group_key, 'directly_linked_aml', SQL('0')),
                 order_by=order_by,
             ))
 
@@ -630,7 +675,8 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                     %(journal_name)s                                                 AS journal_name,
                     %(column_group_key)s                                             AS column_group_key,
                     'indirectly_linked_aml'                                          AS key,
-                    partial.id                                                       AS partial_id
+                    partial.id                                                       AS partial_id,
+                    %(keyset_values)s                                                AS keyset_values
                 FROM %(table_references)s
                     %(currency_table_join)s,
                     account_partial_reconcile partial,
@@ -647,7 +693,8 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                     AND %(account_alias)s.id = account_move_line.account_id
                     AND %(search_condition)s
                     AND partial.max_date BETWEEN %(date_from)s AND %(date_to)s
-                ORDER BY %(order_by)s
+                    %(keyset_condition)s
+                ORDER BY %(order_by)s, partial.id
                 ''',
                 additional_columns=additional_columns,
                 debit_select=report._currency_table_apply_rate(SQL("CASE WHEN aml_with_partner.balance > 0 THEN 0 ELSE partial.amount END")),
@@ -664,12 +711,23 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                 search_condition=query.where_clause,
                 date_from=group_options['date']['date_from'],
                 date_to=group_options['date']['date_to'],
+                keyset_values=get_keyset_values(SQL('partial.id')),
+                keyset_condition=get_keyset_condition(column_group_key, 'indirectly_linked_aml', SQL('partial.id')),
                 order_by=order_by,
             ))
 
+        if keyset:
+            # The subqueries are chained in the order they were built: the ones before the subquery of the cursor have all been loaded already.
+            subquery_keys = [
+                (column_group_key, key)
+                for column_group_key in options['column_groups']
+                for key in ('directly_linked_aml', 'indirectly_linked_aml')
+            ]
+            queries = queries[subquery_keys.index((keyset['column_group_key'], keyset['key'])):]
+
         query = SQL(" UNION ALL ").join(SQL("(%s)", query) for query in queries)
 
-        if offset:
+        if offset and not keyset:
             query = SQL('%s OFFSET %s ', query, offset)
 
         if limit:
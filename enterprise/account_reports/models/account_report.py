@@ -3,13 +3,15 @@
 
 import ast
 import base64
+import copy
 import datetime
+import hashlib
 import io
 import json
 import logging
 import re
 from ast import literal_eval
-from collections import defaultdict
+from collections import Counter, defaultdict
 from functools import cmp_to_key
 from itertools import groupby
 
@@ -23,6 +25,7 @@ from odoo.exceptions import RedirectWarning, UserError, ValidationError
 from odoo.service.model import get_public_method
 from odoo.tools import date_utils, get_lang, float_is_zero, float_repr, SQL, parse_version, Query
 from odoo.tools.float_utils import float_round, float_compare
+from odoo.tools.lru import LRU
 from odoo.tools.misc import file_path, format_date, formatLang, split_every, xlsxwriter
 from odoo.tools.safe_eval import expr_eval, safe_eval
 
@@ -48,6 +51,13 @@ LINE_ID_HIERARCHY_DELIMITER = '|'
 
 CURRENCIES_USING_LAKH = {'AFN', 'BDT', 'INR', 'MMK', 'NPR', 'PKR', 'LKR'}
 
+# Expression totals computed by this worker, in json-friendly form; see _get_expression_totals_cache_key for their key.
+EXPRESSION_TOTALS_CACHE = LRU(256)
+EXPRESSION_TOTALS_CACHE_STATS = Counter()
+
+# Options only impacting the way the lines are displayed, and not the value of the expressions; ignored in the cache key.
+EXPRESSION_TOTALS_CACHE_IGNORED_OPTIONS = {'unfolded_lines', 'unfold_all', 'buttons', 'order_column', 'hide_0_lines'}
+
 
 class AccountReportAnnotation(models.Model):
     _name = 'account.report.annotation'
@@ -1740,6 +1750,7 @@ class AccountReport(models.Model):
         options['buttons'] = [
             {'name': _('PDF'), 'sequence': 10, 'action': 'export_file', 'action_param': 'export_to_pdf', 'file_export_type': _('PDF'), 'branch_allowed': True, 'always_show': True},
             {'name': _('XLSX'), 'sequence': 20, 'action': 'export_file', 'action_param': 'export_to_xlsx', 'file_export_type': _('XLSX'), 'branch_allowed': True, 'always_show': True},
+            {'name': _('XLSX (background)'), 'sequence': 25, 'action': 'action_export_xlsx_in_background', 'branch_allowed': True},
         ]
 
     def open_account_report_file_download_error_wizard(self, errors, content):
@@ -2769,6 +2780,10 @@ class AccountReport(models.Model):
         def line_need_expansion(line_dict):
             return line_dict.get('unfolded') and line_dict.get('expand_function')
 
+        if self._context.get('account_report_skip_full_unfold'):
+            # The caller takes care of the expansions itself (see _get_lines_chunks)
+            return lines
+
         custom_unfold_all_batch_data = None
 
         # If it's possible to batch unfold and we're unfolding all lines, compute the batch, so that individual expansions are more efficient
@@ -2796,6 +2811,45 @@ class AccountReport(models.Model):
 
         return lines
 
+    def _get_lines_chunks(self, options, lines):
+        """ Generator yielding the lines of the report by consecutive chunks, unfolding them one line at a time instead of all
+        at once like _fully_unfold_lines_if_needed does. Used by the streamed xlsx export, so that only the sublines of the
+        lines currently being unfolded are held in memory.
+
+        Each unfolded line is expanded right after having been yielded, depth first, so that chaining the chunks gives the
+        lines in their display order. As in get_expanded_lines, the custom line postprocessor and the formatting are applied
+        to each expansion separately.
+
+        :param options: The report options.
+        :param lines: The lines of the report, as returned by _get_lines with the account_report_skip_full_unfold context key.
+        """
+        chunk = []
+        for line_dict in lines:
+            chunk.append(line_dict)
+            if not (line_dict.get('unfolded') and line_dict.get('expand_function')):
+                continue
+
+            yield chunk
+            chunk = []
+
+            sublines = self._expand_unfoldable_line(
+                line_dict['expand_function'], line_dict['id'], line_dict.get('groupby'), options, line_dict.get('progress'), 0,
+                line_dict.get('horizontal_split_side'),
+            )
+
+            if self.custom_handler_model_id:
+                sublines = self.env[self.custom_handler_model_name]._custom_line_postprocessor(self, options, sublines)
+
+            self._format_column_values(options, sublines)
+
+            if options.get('export_mode') == 'print' and options.get('hide_0_lines'):
+                sublines = self._filter_out_0_lines(sublines)
+
+            yield from self._get_lines_chunks(options, sublines)
+
+        if chunk:
+            yield chunk
+
     def _generate_total_below_section_line(self, section_line_dict):
         return {
             **section_line_dict,
@@ -3080,6 +3134,25 @@ class AccountReport(models.Model):
                 - column group key is string identifying each column group in a unique way ; as in options['column_groups']
                 - expressions_totals is a dict in the format returned by _compute_expression_totals_for_single_column_group
         """
+        cache_key = None
+        if forced_all_column_groups_expression_totals is None:
+            cache_key = self._get_expression_totals_cache_key(
+                options, expressions, groupby_to_expand, col_groups_restrict, offset, limit, include_default_vals,
+            )
+
+        if cache_key:
+            cached_totals = EXPRESSION_TOTALS_CACHE.get(cache_key)
+            if cached_totals:
+                EXPRESSION_TOTALS_CACHE_STATS['hits'] += 1
+                json_friendly_column_group_totals, cached_warnings = copy.deepcopy(cached_totals)
+                if warnings is not None:
+                    warnings.update(cached_warnings)
+                return self._convert_json_friendly_column_group_totals(json_friendly_column_group_totals)
+
+            EXPRESSION_TOTALS_CACHE_STATS['misses'] += 1
+
+        # The warnings raised by the computation are cached along with its result, to be raised again on cache hits.
+        computation_warnings = {} if cache_key else warnings
 
         def add_expressions_to_groups(expressions_to_add, grouped_formulas, force_date_scope=None):
             """ Groups the expressions that should be computed together.
@@ -3130,8 +3203,20 @@ class AccountReport(models.Model):
                 add_expressions_to_groups(expanded_cross, grouped_formulas, force_date_scope=forced_date_scope)
 
         # Treat each formula batch for each column group
+        options_per_group = self._split_options_per_column_group(options)
+        merged_formula_results = self._compute_formula_batches_merged_column_groups(
+            {
+                group_key: group_options
+                for group_key, group_options in options_per_group.items()
+                if not col_groups_restrict or group_key in col_groups_restrict
+            },
+            grouped_formulas,
+            offset=offset,
+            limit=limit,
+        )
+
         all_column_groups_expression_totals = {}
-        for group_key, group_options in self._split_options_per_column_group(options).items():
+        for group_key, group_options in options_per_group.items():
             if forced_all_column_groups_expression_totals:
                 forced_column_group_totals = forced_all_column_groups_expression_totals.get(group_key, None)
             else:
@@ -3144,15 +3229,102 @@ class AccountReport(models.Model):
                     forced_column_group_expression_totals=forced_column_group_totals,
                     offset=offset,
                     limit=limit,
-                    warnings=warnings,
+                    warnings=computation_warnings,
+                    prefetched_formula_results=merged_formula_results.get(group_key),
                 )
             else:
                 current_group_expression_totals = forced_column_group_totals
 
             all_column_groups_expression_totals[group_key] = current_group_expression_totals
 
+        if cache_key:
+            EXPRESSION_TOTALS_CACHE[cache_key] = copy.deepcopy((
+                self._get_json_friendly_column_group_totals(all_column_groups_expression_totals),
+                computation_warnings,
+            ))
+            if warnings is not None:
+                warnings.update(computation_warnings)
+
         return all_column_groups_expression_totals
 
+    def _get_expression_totals_cache_key(self, options, expressions, *computation_params):
+        """ Returns the key under which the totals of the provided expressions are kept in EXPRESSION_TOTALS_CACHE, or None if
+        they must not be cached.
+
+        Besides the normalized options, the context flags changing the way the totals are computed and the other parameters
+        of the computation, the key contains the ledger version of each company of the report (see
+        account.report.ledger.change). Those versions change with anything impacting the values of the reports (posted
+        journal items, reconciliations, manual values, currency rates, accounts, ...), so the totals computed before such a
+        change are never reused afterwards; they simply age out of the LRU. The changes not tracked by the ledger versions
+        are caught by also putting the last modification of the report lines and expressions, of the journals, tax tags,
+        tax repartition lines and analytic accounts in the key. The totals are never cached when they depend on data
+        tracked by neither: draft entries and analytic lines.
+
+        :param computation_params: The parameters of _compute_expression_totals_for_each_column_group also impacting its result.
+        """
+        if self._context.get('account_report_skip_expression_totals_cache') or options.get('analytic_accounts_groupby') or options.get('analytic_plans_groupby'):
+            # Analytic groupbys are computed from the analytic lines, whose changes aren't tracked by the ledger versions.
+            return None
+
+        if options.get('all_entries'):
+            # Draft entries are included, whose changes aren't tracked by the ledger versions either.
+            return None
+
+        LedgerChange = self.env['account.report.ledger.change']
+        if LedgerChange._has_pending_changes():
+            # The current transaction changed some data the cached totals could depend on.
+            return None
+
+        ledger_versions = LedgerChange._get_ledger_versions(self.get_report_company_ids(options))
+        [data_version] = self.env.execute_query(SQL(
+            """
+                SELECT (SELECT ROW(COUNT(*), MAX(write_date))::TEXT FROM account_report_line),
+                       (SELECT ROW(COUNT(*), MAX(write_date))::TEXT FROM account_report_expression),
+                       (SELECT ROW(COUNT(*), MAX(write_date))::TEXT FROM account_journal),
+                       (SELECT ROW(COUNT(*), MAX(write_date))::TEXT FROM account_account_tag),
+                       (SELECT ROW(COUNT(*), MAX(write_date))::TEXT FROM account_tax_repartition_line),
+                       (SELECT ROW(COUNT(*), MAX(write_date))::TEXT FROM account_analytic_account)
+            """
+        ))
+        context_flags = tuple(
+            bool(self._context.get(key))
+            for key in ('account_report_skip_balance_snapshot', 'account_report_no_column_groups_merge')
+        )
+
+        normalized_options = {key: value for key, value in options.items() if key not in EXPRESSION_TOTALS_CACHE_IGNORED_OPTIONS}
+        options_hash = hashlib.sha256(json.dumps(normalized_options, sort_keys=True, default=str).encode()).hexdigest()
+
+        return (
+            self.env.cr.dbname,
+            self.env.uid,
+            tuple(self.env.companies.ids),
+            self.id,
+            tuple(expressions.ids),
+            options_hash,
+            context_flags,
+            ledger_versions,
+            tuple(data_version),
+            json.dumps(computation_params, default=str),
+        )
+
+    @api.model
+    def _get_expression_totals_cache_stats(self):
+        """ Returns the usage statistics of the expression totals cache of the current worker. """
+        hits = EXPRESSION_TOTALS_CACHE_STATS['hits']
+        misses = EXPRESSION_TOTALS_CACHE_STATS['misses']
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'size': len(EXPRESSION_TOTALS_CACHE),
+            'max_size': EXPRESSION_TOTALS_CACHE.count,
+        }
+
+    @api.model
+    def _clear_expression_totals_cache(self):
+        EXPRESSION_TOTALS_CACHE.clear()
+        EXPRESSION_TOTALS_CACHE_STATS.clear()
+
     def _standardize_date_scope_for_date_range(self, date_scope):
         """ Depending on the fact the report accepts date ranges or not, different date scopes might mean the same thing.
         This function is used so that, in those cases, only one of these date_scopes' values is used, to avoid useless creation
@@ -3189,7 +3361,210 @@ class AccountReport(models.Model):
             'owner_column_group': group_key,
         }
 
-    def _compute_expression_totals_for_single_column_group(self, column_group_options, grouped_formulas, forced_column_group_expression_totals=None, offset=0, limit=None, warnings=None):
+    def _compute_formula_batches_merged_column_groups(self, options_per_group, grouped_formulas, offset=0, limit=None):
+        """ Computes the formula batches of the account_codes and domain engines for all the provided column groups at once. Instead of running
+        the same queries once per column group, a single query aggregates the move lines of every column group, each of them being selected
+        with a FILTER clause on its own conditions (typically, its own dates). This way, the number of queries doesn't grow with the number
+        of comparison periods or horizontal groups.
+
+        Batches that cannot be merged are left out of the result, and will be computed column group by column group.
+
+        :param options_per_group: A dict(column_group_key, options_dict), in the format returned by _split_options_per_column_group, containing
+                                  the column groups to compute.
+
+        :param grouped_formulas: The formulas to compute, in the format used by _compute_expression_totals_for_single_column_group.
+
+        :return: A dict(column_group_key, {(engine, (date_scope, current_groupby, next_groupby)): formula_results}), formula_results being in
+                 the format returned by _compute_formula_batch.
+        """
+        if len(options_per_group) < 2 or offset or limit or self._context.get('account_report_no_column_groups_merge'):
+            return {}
+
+        if any(group_options['currency_table']['type'] != 'monocurrency' for group_options in options_per_group.values()):
+            # Rates depend on the period of each column group, which would need a different join for each of them.
+            return {}
+
+        all_company_ids = {tuple(self.get_report_company_ids(group_options)) for group_options in options_per_group.values()}
+        if len(all_company_ids) != 1:
+            return {}
+
+        rslt = defaultdict(dict)
+        for engine in ('account_codes', 'domain'):
+            for grouping_key, formulas_dict in grouped_formulas.get(engine, {}).items():
+                date_scope, current_groupby, next_groupby = grouping_key
+                engine_function_name = f'_compute_formula_batch_merged_with_engine_{engine}'
+                merged_results = getattr(self, engine_function_name)(options_per_group, date_scope, formulas_dict, current_groupby, next_groupby)
+                for group_key, formula_results in (merged_results or {}).items():
+                    rslt[group_key][(engine, grouping_key)] = formula_results
+
+        return rslt
+
+    def _get_merged_column_groups_query(self, options_per_group, date_scope, domain=None, groupby_fields=()):
+        """ Builds the report query of each column group, and checks they only differ by their WHERE clause, so that they can be merged.
+
+        :return: A tuple (query, condition_by_group_key), where query is the report query of the first column group (used for its FROM clause),
+                 and condition_by_group_key a dict giving the WHERE clause of each column group. None is returned if the queries can't be merged.
+        """
+        queries = {}
+        for group_key, group_options in options_per_group.items():
+            if self._get_balance_snapshot_table(group_options, date_scope, domain=domain, groupby_fields=groupby_fields):
+                return None
+
+            query = self._get_report_query(group_options, date_scope, domain=domain)
+            for groupby_field in groupby_fields:
+                # Called for the joins it might add to the query
+                self.env['account.move.line']._field_to_sql('account_move_line', groupby_field, query)
+            queries[group_key] = query
+
+        first_query = next(iter(queries.values()))
+        if any(
+            (query.from_clause.code, query.from_clause.params) != (first_query.from_clause.code, first_query.from_clause.params)
+            for query in queries.values()
+        ):
+            return None
+
+        return first_query, {group_key: query.where_clause for group_key, query in queries.items()}
+
+    def _compute_formula_batch_merged_with_engine_account_codes(self, options_per_group, date_scope, formulas_dict, current_groupby, next_groupby):
+        """ Merged version of _compute_formula_batch_with_engine_account_codes; see _compute_formula_batches_merged_column_groups.
+
+        :return: A dict(column_group_key, formula_results), or None if the column groups cannot be merged for this batch.
+        """
+        self._check_groupby_fields([current_groupby] if current_groupby else [])
+
+        merged_query_data = self._get_merged_column_groups_query(options_per_group, date_scope, groupby_fields=[current_groupby] if current_groupby else [])
+        if not merged_query_data:
+            return None
+        query, condition_by_group_key = merged_query_data
+
+        first_group_options = next(iter(options_per_group.values()))
+        prefix_details_by_formula, accounts_prefix_map = self._get_account_codes_engine_prefixes(first_group_options, formulas_dict)
+        current_groupby_aml_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
+        balance_select = self._currency_table_apply_rate(SQL("account_move_line.balance"))
+
+        self._cr.execute(SQL(
+            """
+            SELECT
+                account_move_line.account_id AS account_id,
+                %(aggregates_sql)s
+                %(extra_select_sql)s
+            FROM %(table_references)s
+            %(currency_table_join)s
+            WHERE %(search_condition)s
+            GROUP BY account_move_line.account_id%(extra_groupby_sql)s
+            %(order_by_sql)s
+            """,
+            aggregates_sql=SQL(', ').join(
+                SQL(
+                    """
+                    SUM(%(balance_select)s) FILTER (WHERE %(condition)s) AS %(sum_alias)s,
+                    COUNT(account_move_line.id) FILTER (WHERE %(condition)s) AS %(aml_count_alias)s
+                    """,
+                    balance_select=balance_select,
+                    condition=condition,
+                    sum_alias=SQL.identifier(f'sum_{index}'),
+                    aml_count_alias=SQL.identifier(f'aml_count_{index}'),
+                )
+                for index, condition in enumerate(condition_by_group_key.values())
+            ),
+            extra_select_sql=SQL(", %s AS grouping_key", current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
+            table_references=query.from_clause,
+            currency_table_join=self._currency_table_aml_join(first_group_options),
+            search_condition=SQL(' OR ').join(SQL("(%s)", condition) for condition in condition_by_group_key.values()),
+            extra_groupby_sql=SQL(", %s", current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
+            order_by_sql=SQL('ORDER BY %s', current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
+        ))
+        all_query_res = self._cr.dictfetchall()
+
+        rslt = {}
+        for index, group_key in enumerate(condition_by_group_key):
+            group_query_res = [
+                {
+                    'account_id': query_res['account_id'],
+                    'grouping_key': query_res.get('grouping_key'),
+                    'sum': query_res[f'sum_{index}'],
+                    'aml_count': query_res[f'aml_count_{index}'],
+                }
+                for query_res in all_query_res
+                if query_res[f'aml_count_{index}']
+            ]
+            rslt[group_key] = self._get_account_codes_engine_formula_results(formulas_dict, prefix_details_by_formula, accounts_prefix_map, group_query_res, current_groupby)
+        return rslt
+
+    def _compute_formula_batch_merged_with_engine_domain(self, options_per_group, date_scope, formulas_dict, current_groupby, next_groupby):
+        """ Merged version of _compute_formula_batch_with_engine_domain; see _compute_formula_batches_merged_column_groups.
+
+        :return: A dict(column_group_key, formula_results), or None if the column groups cannot be merged for this batch.
+        """
+        self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
+
+        first_group_options = next(iter(options_per_group.values()))
+        next_groupby_field = next_groupby.split(',')[0] if next_groupby else None
+        groupby_fields = [groupby_field for groupby_field in (current_groupby, next_groupby_field) if groupby_field]
+        rslt = defaultdict(dict)
+        for formula, expressions in formulas_dict.items():
+            line_domain = self._parse_domain_engine_formula(formula, expressions)
+            merged_query_data = self._get_merged_column_groups_query(options_per_group, date_scope, domain=line_domain, groupby_fields=groupby_fields)
+            if not merged_query_data:
+                return None
+            query, condition_by_group_key = merged_query_data
+
+            groupby_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
+            select_count_field = self.env['account.move.line']._field_to_sql('account_move_line', next_groupby_field or 'id', query)
+            balance_select = self._currency_table_apply_rate(SQL("account_move_line.balance"))
+
+            self._cr.execute(SQL(
+                """
+                SELECT
+                    %(aggregates_sql)s
+                    %(select_groupby_sql)s
+                FROM %(table_references)s
+                %(currency_table_join)s
+                WHERE %(search_condition)s
+                %(group_by_groupby_sql)s
+                %(order_by_sql)s
+                """,
+                aggregates_sql=SQL(', ').join(
+                    SQL(
+                        """
+                        COALESCE(SUM(%(balance_select)s) FILTER (WHERE %(condition)s), 0.0) AS %(sum_alias)s,
+                        COUNT(DISTINCT %(select_count_field)s) FILTER (WHERE %(condition)s) AS %(count_rows_alias)s,
+                        COUNT(*) FILTER (WHERE %(condition)s) AS %(line_count_alias)s
+                        """,
+                        balance_select=balance_select,
+                        select_count_field=select_count_field,
+                        condition=condition,
+                        sum_alias=SQL.identifier(f'sum_{index}'),
+                        count_rows_alias=SQL.identifier(f'count_rows_{index}'),
+                        line_count_alias=SQL.identifier(f'line_count_{index}'),
+                    )
+                    for index, condition in enumerate(condition_by_group_key.values())
+                ),
+                select_groupby_sql=SQL(', %s AS grouping_key', groupby_sql) if groupby_sql else SQL(),
+                table_references=query.from_clause,
+                currency_table_join=self._currency_table_aml_join(first_group_options),
+                search_condition=SQL(' OR ').join(SQL("(%s)", condition) for condition in condition_by_group_key.values()),
+                group_by_groupby_sql=SQL('GROUP BY %s', groupby_sql) if groupby_sql else SQL(),
+                order_by_sql=SQL(' ORDER BY %s', groupby_sql) if groupby_sql else SQL(),
+            ))
+            all_query_res = self._cr.dictfetchall()
+
+            for index, group_key in enumerate(condition_by_group_key):
+                group_query_res = [
+                    {
+                        'grouping_key': query_res.get('grouping_key'),
+                        'sum': query_res[f'sum_{index}'],
+                        'count_rows': query_res[f'count_rows_{index}'],
+                    }
+                    for query_res in all_query_res
+                    # Without groupby, the aggregate always returns a row, even if nothing matched (as in the non-merged query)
+                    if not current_groupby or query_res[f'line_count_{index}']
+                ]
+                rslt[group_key].update(self._get_domain_engine_formula_results(formula, expressions, group_query_res, current_groupby))
+
+        return rslt
+
+    def _compute_expression_totals_for_single_column_group(self, column_group_options, grouped_formulas, forced_column_group_expression_totals=None, offset=0, limit=None, warnings=None, prefetched_formula_results=None):
         """ Evaluates expressions for a single column group.
 
             :param column_group_options: The options dict obtained from _split_options_per_column_group() for the column group to evaluate.
@@ -3210,6 +3585,10 @@ class AccountReport(models.Model):
             :param limit: The SQL limit to apply when computing these expressions' result. Used if self.load_more_limit is set, to handle
                           the load more feature.
 
+            :param prefetched_formula_results: A dict {(engine, (date_scope, current_groupby, next_groupby)): formula_results} of the batches
+                                               already computed for this column group, as returned for it by
+                                               _compute_formula_batches_merged_column_groups. Those batches won't be recomputed.
+
             :return: A dict(expression, {'value': value, 'has_sublines': has_sublines}), where:
                      - expression is one of the account.report.expressions that got evaluated
 
@@ -3305,8 +3684,10 @@ class AccountReport(models.Model):
         ]
         for engine in batchable_engines:
             for (date_scope, current_groupby, next_groupby), formulas_dict in grouped_formulas.get(engine, {}).items():
-                formula_results = self._compute_formula_batch(column_group_options, engine, date_scope, formulas_dict, current_groupby, next_groupby,
-                                                              offset=offset, limit=limit, warnings=warnings)
+                formula_results = (prefetched_formula_results or {}).get((engine, (date_scope, current_groupby, next_groupby)))
+                if formula_results is None:
+                    formula_results = self._compute_formula_batch(column_group_options, engine, date_scope, formulas_dict, current_groupby, next_groupby,
+                                                                  offset=offset, limit=limit, warnings=warnings)
                 inject_formula_results(
                     formula_results,
                     column_group_expression_totals,
@@ -3754,48 +4135,38 @@ class AccountReport(models.Model):
                       then it will be the number of matching amls. If there is a groupby, it will be the number of distinct grouping
                       keys at the first level of this groupby (so, if groupby is 'partner_id, account_id', the number of partners).
         """
-        def _format_result_depending_on_groupby(formula_rslt):
-            if not current_groupby:
-                if formula_rslt:
-                    # There should be only one element in the list; we only return its totals (a dict) ; so that a list is only returned in case
-                    # of a groupby being unfolded.
-                    return formula_rslt[0][1]
-                else:
-                    # No result at all
-                    return {
-                        'sum': 0,
-                        'sum_if_pos': 0,
-                        'sum_if_neg': 0,
-                        'count_rows': 0,
-                        'has_sublines': False,
-                    }
-            return formula_rslt
-
         self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
 
         rslt = {}
 
         for formula, expressions in formulas_dict.items():
-            try:
-                line_domain = literal_eval(formula)
-            except (ValueError, SyntaxError):
-                raise UserError(_(
-                    'Invalid domain formula in expression "%(expression)s" of line "%(line)s": %(formula)s',
-                    expression=expressions.label,
-                    line=expressions.report_line_id.name,
-                    formula=formula,
-                ))
-            query = self._get_report_query(options, date_scope, domain=line_domain)
-
-            groupby_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
-            select_count_field = self.env['account.move.line']._field_to_sql('account_move_line', next_groupby.split(',')[0] if next_groupby else 'id', query)
+            line_domain = self._parse_domain_engine_formula(formula, expressions)
+            next_groupby_field = next_groupby.split(',')[0] if next_groupby else None
+            snapshot_table = self._get_balance_snapshot_table(
+                options, date_scope, domain=line_domain,
+                groupby_fields=[groupby_field for groupby_field in (current_groupby, next_groupby_field) if groupby_field],
+            )
+            if snapshot_table:
+                # Closed months are read from the balance snapshot; see account.report.balance.snapshot
+                groupby_sql = SQL.identifier('account_move_line', current_groupby) if current_groupby else None
+                count_rows_sql = SQL("COUNT(DISTINCT %s)", SQL.identifier('account_move_line', next_groupby_field)) if next_groupby_field \
+                    else SQL("COALESCE(SUM(account_move_line.aml_count), 0)")
+                table_references = SQL("%s AS account_move_line", snapshot_table)
+                search_condition = SQL("TRUE")
+            else:
+                query = self._get_report_query(options, date_scope, domain=line_domain)
+                groupby_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
+                select_count_field = self.env['account.move.line']._field_to_sql('account_move_line', next_groupby_field or 'id', query)
+                count_rows_sql = SQL("COUNT(DISTINCT %s)", select_count_field)
+                table_references = query.from_clause
+                search_condition = query.where_clause
 
             tail_query = self._get_engine_query_tail(offset, limit)
             query = SQL(
                 """
                 SELECT
                     COALESCE(SUM(%(balance_select)s), 0.0) AS sum,
-                    COUNT(DISTINCT %(select_count_field)s) AS count_rows
+                    %(count_rows_sql)s AS count_rows
                     %(select_groupby_sql)s
                 FROM %(table_references)s
                 %(currency_table_join)s
@@ -3804,63 +4175,101 @@ class AccountReport(models.Model):
                 %(order_by_sql)s
                 %(tail_query)s
                 """,
-                select_count_field=select_count_field,
+                count_rows_sql=count_rows_sql,
                 select_groupby_sql=SQL(', %s AS grouping_key', groupby_sql) if groupby_sql else SQL(),
-                table_references=query.from_clause,
+                table_references=table_references,
                 balance_select=self._currency_table_apply_rate(SQL("account_move_line.balance")),
                 currency_table_join=self._currency_table_aml_join(options),
-                search_condition=query.where_clause,
+                search_condition=search_condition,
                 group_by_groupby_sql=SQL('GROUP BY %s', groupby_sql) if groupby_sql else SQL(),
                 order_by_sql=SQL(' ORDER BY %s', groupby_sql) if groupby_sql else SQL(),
                 tail_query=tail_query,
             )
 
-            # Fetch the results.
-            formula_rslt = []
             self._cr.execute(query)
-            all_query_res = self._cr.dictfetchall()
+            rslt.update(self._get_domain_engine_formula_results(formula, expressions, self._cr.dictfetchall(), current_groupby))
 
-            total_sum = 0
-            for query_res in all_query_res:
-                res_sum = query_res['sum']
-                total_sum += res_sum
-                totals = {
-                    'sum': res_sum,
-                    'sum_if_pos': 0,
-                    'sum_if_neg': 0,
-                    'count_rows': query_res['count_rows'],
-                    'has_sublines': query_res['count_rows'] > 0,
-                }
-                formula_rslt.append((query_res.get('grouping_key', None), totals))
+        return rslt
 
-            # Handle sum_if_pos, -sum_if_pos, sum_if_neg and -sum_if_neg
-            expressions_by_sign_policy = defaultdict(lambda: self.env['account.report.expression'])
-            for expression in expressions:
-                subformula_without_sign = expression.subformula.replace('-', '').strip()
-                if subformula_without_sign in ('sum_if_pos', 'sum_if_neg'):
-                    expressions_by_sign_policy[subformula_without_sign] += expression
+    def _parse_domain_engine_formula(self, formula, expressions):
+        """ Returns the account.move.line domain of a formula of the domain engine. """
+        try:
+            return literal_eval(formula)
+        except (ValueError, SyntaxError):
+            raise UserError(_(
+                'Invalid domain formula in expression "%(expression)s" of line "%(line)s": %(formula)s',
+                expression=expressions.label,
+                line=expressions.report_line_id.name,
+                formula=formula,
+            ))
+
+    def _get_domain_engine_formula_results(self, formula, expressions, all_query_res, current_groupby):
+        """ Builds the domain engine results of a formula from the rows fetched by its query, each of them containing
+        the 'sum' and 'count_rows' of a group, and its 'grouping_key' if current_groupby is set.
+
+        :return: A dict {(formula, expressions): result}, in the format returned by _compute_formula_batch.
+        """
+        def _format_result_depending_on_groupby(formula_rslt):
+            if not current_groupby:
+                if formula_rslt:
+                    # There should be only one element in the list; we only return its totals (a dict) ; so that a list is only returned in case
+                    # of a groupby being unfolded.
+                    return formula_rslt[0][1]
                 else:
-                    expressions_by_sign_policy['no_sign_check'] += expression
+                    # No result at all
+                    return {
+                        'sum': 0,
+                        'sum_if_pos': 0,
+                        'sum_if_neg': 0,
+                        'count_rows': 0,
+                        'has_sublines': False,
+                    }
+            return formula_rslt
+
+        rslt = {}
+        formula_rslt = []
+
+        total_sum = 0
+        for query_res in all_query_res:
+            res_sum = query_res['sum']
+            total_sum += res_sum
+            totals = {
+                'sum': res_sum,
+                'sum_if_pos': 0,
+                'sum_if_neg': 0,
+                'count_rows': query_res['count_rows'],
+                'has_sublines': query_res['count_rows'] > 0,
+            }
+            formula_rslt.append((query_res.get('grouping_key', None), totals))
+
+        # Handle sum_if_pos, -sum_if_pos, sum_if_neg and -sum_if_neg
+        expressions_by_sign_policy = defaultdict(lambda: self.env['account.report.expression'])
+        for expression in expressions:
+            subformula_without_sign = expression.subformula.replace('-', '').strip()
+            if subformula_without_sign in ('sum_if_pos', 'sum_if_neg'):
+                expressions_by_sign_policy[subformula_without_sign] += expression
+            else:
+                expressions_by_sign_policy['no_sign_check'] += expression
 
-            # Then we have to check the total of the line and only give results if its sign matches the desired policy.
-            # This is important for groupby managements, for which we can't just check the sign query_res by query_res
-            if expressions_by_sign_policy['sum_if_pos'] or expressions_by_sign_policy['sum_if_neg']:
-                sign_policy_with_value = 'sum_if_pos' if self.env.company.currency_id.compare_amounts(total_sum, 0.0) >= 0 else 'sum_if_neg'
-                # >= instead of > is intended; usability decision: 0 is considered positive
+        # Then we have to check the total of the line and only give results if its sign matches the desired policy.
+        # This is important for groupby managements, for which we can't just check the sign query_res by query_res
+        if expressions_by_sign_policy['sum_if_pos'] or expressions_by_sign_policy['sum_if_neg']:
+            sign_policy_with_value = 'sum_if_pos' if self.env.company.currency_id.compare_amounts(total_sum, 0.0) >= 0 else 'sum_if_neg'
+            # >= instead of > is intended; usability decision: 0 is considered positive
 
-                formula_rslt_with_sign = [(grouping_key, {**totals, sign_policy_with_value: totals['sum']}) for grouping_key, totals in formula_rslt]
+            formula_rslt_with_sign = [(grouping_key, {**totals, sign_policy_with_value: totals['sum']}) for grouping_key, totals in formula_rslt]
 
-                for sign_policy in ('sum_if_pos', 'sum_if_neg'):
-                    policy_expressions = expressions_by_sign_policy[sign_policy]
+            for sign_policy in ('sum_if_pos', 'sum_if_neg'):
+                policy_expressions = expressions_by_sign_policy[sign_policy]
 
-                    if policy_expressions:
-                        if sign_policy == sign_policy_with_value:
-                            rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby(formula_rslt_with_sign)
-                        else:
-                            rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby([])
+                if policy_expressions:
+                    if sign_policy == sign_policy_with_value:
+                        rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby(formula_rslt_with_sign)
+                    else:
+                        rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby([])
 
-            if expressions_by_sign_policy['no_sign_check']:
-                rslt[(formula, expressions_by_sign_policy['no_sign_check'])] = _format_result_depending_on_groupby(formula_rslt)
+        if expressions_by_sign_policy['no_sign_check']:
+            rslt[(formula, expressions_by_sign_policy['no_sign_check'])] = _format_result_depending_on_groupby(formula_rslt)
 
         return rslt
 
@@ -3891,6 +4300,82 @@ class AccountReport(models.Model):
         """
         self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
 
+        prefix_details_by_formula, accounts_prefix_map = self._get_account_codes_engine_prefixes(options, formulas_dict)
+
+        # Run main query
+        snapshot_table = self._get_balance_snapshot_table(options, date_scope, groupby_fields=[current_groupby] if current_groupby else [])
+        if snapshot_table:
+            # Closed months are read from the balance snapshot; see account.report.balance.snapshot
+            current_groupby_aml_sql = SQL.identifier('account_move_line', current_groupby) if current_groupby else None
+            table_references = SQL("%s AS account_move_line", snapshot_table)
+            search_condition = SQL("TRUE")
+            aml_count_sql = SQL("SUM(account_move_line.aml_count)")
+        else:
+            query = self._get_report_query(options, date_scope)
+            current_groupby_aml_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
+            table_references = query.from_clause
+            search_condition = query.where_clause
+            aml_count_sql = SQL("COUNT(account_move_line.id)")
+
+        tail_query = self._get_engine_query_tail(offset, limit)
+        if current_groupby_aml_sql and tail_query:
+            tail_query_additional_groupby_where_sql = SQL(
+                """
+                AND %(current_groupby_aml_sql)s IN (
+                    SELECT DISTINCT %(current_groupby_aml_sql)s
+                    FROM %(table_references)s
+                    WHERE %(search_condition)s
+                    ORDER BY %(current_groupby_aml_sql)s
+                    %(tail_query)s
+                )
+                """,
+                current_groupby_aml_sql=current_groupby_aml_sql,
+                table_references=table_references,
+                search_condition=search_condition,
+                tail_query=tail_query,
+            )
+        else:
+            tail_query_additional_groupby_where_sql = SQL()
+
+        extra_groupby_sql =  SQL(", %s", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
+        extra_select_sql = SQL(", %s AS grouping_key", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
+
+        query = SQL(
+            """
+            SELECT
+                account_move_line.account_id AS account_id,
+                SUM(%(balance_select)s) AS sum,
+                %(aml_count_sql)s AS aml_count
+                %(extra_select_sql)s
+            FROM %(table_references)s
+            %(currency_table_join)s
+            WHERE %(search_condition)s
+            %(tail_query_additional_groupby_where_sql)s
+            GROUP BY account_move_line.account_id%(extra_groupby_sql)s
+            %(order_by_sql)s
+            %(tail_query)s
+            """,
+            aml_count_sql=aml_count_sql,
+            extra_select_sql=extra_select_sql,
+            table_references=table_references,
+            balance_select=self._currency_table_apply_rate(SQL("account_move_line.balance")),
+            currency_table_join=self._currency_table_aml_join(options),
+            search_condition=search_condition,
+            extra_groupby_sql=extra_groupby_sql,
+            tail_query_additional_groupby_where_sql=tail_query_additional_groupby_where_sql,
+            order_by_sql=SQL('ORDER BY %s', current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
+            tail_query=tail_query if not tail_query_additional_groupby_where_sql else SQL(),
+        )
+        self._cr.execute(query)
+        return self._get_account_codes_engine_formula_results(formulas_dict, prefix_details_by_formula, accounts_prefix_map, self._cr.dictfetchall(), current_groupby)
+
+    def _get_account_codes_engine_prefixes(self, options, formulas_dict):
+        """ Parses the formulas of the account_codes engine, and matches the prefixes they use with the accounts of the report's companies.
+
+        :return: A tuple (prefix_details_by_formula, accounts_prefix_map), where:
+                 - prefix_details_by_formula is a dict {formula: [(multiplicator, prefix_key, balance_character), ...]}
+                 - accounts_prefix_map is a dict {account_id: [prefix_key, ...]}, giving the prefixes each account matches
+        """
         # Gather the account code prefixes to compute the total from
         prefix_details_by_formula = {}  # in the form {formula: [(1, prefix1), (-1, prefix2)]}
         prefixes_to_compute = set()
@@ -3959,64 +4444,18 @@ class AccountReport(models.Model):
         for prefix, account_id in self.env.execute_query(SQL(' UNION ALL ').join(all_prefixes_queries)):
             accounts_prefix_map[account_id].append(tuple(prefix))
 
-        # Run main query
-        query = self._get_report_query(options, date_scope)
+        return prefix_details_by_formula, accounts_prefix_map
 
-        current_groupby_aml_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
-        tail_query = self._get_engine_query_tail(offset, limit)
-        if current_groupby_aml_sql and tail_query:
-            tail_query_additional_groupby_where_sql = SQL(
-                """
-                AND %(current_groupby_aml_sql)s IN (
-                    SELECT DISTINCT %(current_groupby_aml_sql)s
-                    FROM account_move_line
-                    WHERE %(search_condition)s
-                    ORDER BY %(current_groupby_aml_sql)s
-                    %(tail_query)s
-                )
-                """,
-                current_groupby_aml_sql=current_groupby_aml_sql,
-                search_condition=query.where_clause,
-                tail_query=tail_query,
-            )
-        else:
-            tail_query_additional_groupby_where_sql = SQL()
-
-        extra_groupby_sql =  SQL(", %s", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
-        extra_select_sql = SQL(", %s AS grouping_key", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
-
-        query = SQL(
-            """
-            SELECT
-                account_move_line.account_id AS account_id,
-                SUM(%(balance_select)s) AS sum,
-                COUNT(account_move_line.id) AS aml_count
-                %(extra_select_sql)s
-            FROM %(table_references)s
-            %(currency_table_join)s
-            WHERE %(search_condition)s
-            %(tail_query_additional_groupby_where_sql)s
-            GROUP BY account_move_line.account_id%(extra_groupby_sql)s
-            %(order_by_sql)s
-            %(tail_query)s
-            """,
-            extra_select_sql=extra_select_sql,
-            table_references=query.from_clause,
-            balance_select=self._currency_table_apply_rate(SQL("account_move_line.balance")),
-            currency_table_join=self._currency_table_aml_join(options),
-            search_condition=query.where_clause,
-            extra_groupby_sql=extra_groupby_sql,
-            tail_query_additional_groupby_where_sql=tail_query_additional_groupby_where_sql,
-            order_by_sql=SQL('ORDER BY %s', current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
-            tail_query=tail_query if not tail_query_additional_groupby_where_sql else SQL(),
-        )
-        self._cr.execute(query)
+    def _get_account_codes_engine_formula_results(self, formulas_dict, prefix_details_by_formula, accounts_prefix_map, all_query_res, current_groupby):
+        """ Builds the account_codes engine results from the rows fetched by its query, each of them containing the 'sum' and 'aml_count'
+        of an account, and its 'grouping_key' if current_groupby is set.
 
-        # Parse result
+        :return: A dict {(formula, expressions): result}, in the format returned by _compute_formula_batch.
+        """
         rslt = {}
 
         res_by_prefix_account_id = {}
-        for query_res in self._cr.dictfetchall():
+        for query_res in all_query_res:
             # Done this way so that we can run similar code for groupby and non-groupby
             grouping_key = query_res['grouping_key'] if current_groupby else None
             account_id = query_res['account_id']
@@ -4203,6 +4642,34 @@ class AccountReport(models.Model):
 
         return query_tail
 
+    @api.model
+    def _get_keyset_pagination_condition(self, keyset, values) -> SQL:
+        """ Helper to generate the condition matching the rows coming strictly after a given row, for a query ordered ascendingly
+        (with PostgreSQL's default NULLS LAST) on the expressions of a keyset.
+
+        Contrary to an OFFSET, which still requires the database to produce and discard all the skipped rows, this condition
+        starts the scan right after the last row of the previous page, provided an index follows the keyset. Loading a page
+        then costs the same whatever its position.
+
+        :param keyset:  A list of (expression, nullable) tuples, expression being the SQL object the query is ordered by and nullable
+                        telling whether it may be NULL. The last expression must be unique (typically, the id of the record).
+        :param values:  The values of the keyset's expressions for the last row of the previous page.
+        :return:        The SQL condition.
+        """
+        (expression, nullable), *next_keyset = keyset
+        value, *next_values = values
+
+        if not next_keyset:
+            return SQL("%s > %s", expression, value)
+
+        next_condition = self._get_keyset_pagination_condition(next_keyset, next_values)
+        if value is None:
+            return SQL("(%s IS NULL AND %s)", expression, next_condition)
+        if nullable:
+            return SQL("(%s > %s OR %s IS NULL OR (%s = %s AND %s))", expression, value, expression, expression, value, next_condition)
+        # The redundant lower bound lets PostgreSQL start an index range scan at the position of the previous page's last row.
+        return SQL("(%s >= %s AND (%s > %s OR %s))", expression, value, expression, value, next_condition)
+
     def _generate_carryover_external_values(self, options):
         """ Generates the account.report.external.value objects corresponding to this report's carryover under the provided options.
 
@@ -5884,12 +6351,16 @@ class AccountReport(models.Model):
                         })
         return annotations_to_render
 
-    def _filter_out_folded_children(self, lines):
+    def _filter_out_folded_children(self, lines, folded_lines=None):
         """ Returns a list containing all the lines of the provided list that need to be displayed when printing,
         hence removing the children whose parent is folded (especially useful to remove total lines).
+
+        :param folded_lines: Optional set of the ids of the folded lines met so far, updated in place. It allows filtering
+                             consecutive chunks of the same list of lines.
         """
         rslt = []
-        folded_lines = set()
+        if folded_lines is None:
+            folded_lines = set()
         for line in lines:
             if line.get('unfoldable') and not line.get('unfolded'):
                 folded_lines.add(line['id'])
@@ -5899,6 +6370,47 @@ class AccountReport(models.Model):
         return rslt
 
     def export_to_xlsx(self, options, response=None):
+        self.ensure_one()
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output, {
+            'in_memory': True,
+            'strings_to_formulas': False,
+        })
+
+        self._inject_reports_into_xlsx_workbook(options, workbook)
+
+        workbook.close()
+        output.seek(0)
+        generated_file = output.read()
+        output.close()
+
+        return {
+            'file_name': self.get_default_report_filename(options, 'xlsx'),
+            'file_content': generated_file,
+            'file_type': 'xlsx',
+        }
+
+    def _export_to_xlsx_streamed(self, options, output):
+        """ Streaming counterpart of export_to_xlsx, used by the background exports (see account.report.xlsx.export).
+
+        The workbook is written into the provided file object using xlsxwriter's constant_memory mode, which flushes each row
+        to disk as soon as the next one starts, and the lines are generated chunk by chunk instead of being fully unfolded
+        at once. This way, neither the lines nor the cells of the whole report are held in memory.
+
+        :param options: The report options.
+        :param output: A binary file object the xlsx file is written into.
+        """
+        self.ensure_one()
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+        })
+
+        self._inject_reports_into_xlsx_workbook(options, workbook, streamed=True)
+
+        workbook.close()
+
+    def _inject_reports_into_xlsx_workbook(self, options, workbook, streamed=False):
         def add_worksheet_unique_name(workbook, sheet_name):
             existing_names = set(workbook.sheetnames.keys())
             count = 1
@@ -5912,13 +6424,6 @@ class AccountReport(models.Model):
                 count += 1
             return workbook.add_worksheet(new_sheet_name)
 
-        self.ensure_one()
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {
-            'in_memory': True,
-            'strings_to_formulas': False,
-        })
-
         print_options = self.get_options(previous_options={**options, 'export_mode': 'print'})
         if print_options['sections']:
             reports_to_print = self.env['account.report'].browse([section['id'] for section in print_options['sections']])
@@ -5929,19 +6434,29 @@ class AccountReport(models.Model):
         for report in reports_to_print:
             report_options = report.get_options(previous_options={**print_options, 'selected_section_id': report.id})
             reports_options.append(report_options)
-            report._inject_report_into_xlsx_sheet(report_options, workbook, add_worksheet_unique_name(workbook, report.name))
+            report._inject_report_into_xlsx_sheet(report_options, workbook, add_worksheet_unique_name(workbook, report.name), streamed=streamed)
 
         self._add_options_xlsx_sheet(workbook, reports_options)
 
-        workbook.close()
-        output.seek(0)
-        generated_file = output.read()
-        output.close()
+    def action_export_xlsx_in_background(self, options):
+        """ Queues the xlsx export of the report, to be generated by a cron instead of within the request.
+        The user gets notified with a download link once the file is ready.
+        """
+        self.ensure_one()
+        self.env['account.report.xlsx.export'].create({
+            'report_id': self.id,
+            'options': options,
+        })
+        self.env.ref('account_reports.ir_cron_account_report_xlsx_export')._trigger()
 
         return {
-            'file_name': self.get_default_report_filename(options, 'xlsx'),
-            'file_content': generated_file,
-            'file_type': 'xlsx',
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _("The export of %s is being generated. You will be notified with a download link once it is ready.", self.name),
+                'sticky': False,
+            },
         }
 
     @api.model
@@ -5989,7 +6504,14 @@ class AccountReport(models.Model):
             if width > col_width:
                 sheet.set_column(col, col, min(width + 4, 75))  # We need to add a little extra padding to ensure our columns are not clipping the text
 
-    def _inject_report_into_xlsx_sheet(self, options, workbook, sheet):
+    def _inject_report_into_xlsx_sheet(self, options, workbook, sheet, streamed=False):
+        """ Writes the lines of the report into the provided sheet.
+
+        :param streamed: If True, the lines are generated and written chunk by chunk (see _get_lines_chunks) instead of all
+                         at once. The layout of the sheet (account code column, currency code columns) is then decided based
+                         on the top-level lines of the report. Sorting the lines requires all of them, so it disables streaming.
+        """
+        streamed = streamed and not options.get('order_column')
 
         # We start by gathering the bold, italic and regular fonts to use later.
         fonts = {}
@@ -6067,18 +6589,30 @@ class AccountReport(models.Model):
                 return level_formats.get('default_indent', level_formats.get(content_type.removesuffix('_indent'), level_formats['default']))
             return level_formats.get(content_type, level_formats['default'])
 
+        def add_account_lines_split_names(lines):
+            for line in lines:
+                line_model = self._get_model_info_from_id(line['id'])[0]
+                if line_model == 'account.account':
+                    # Reuse the _split_code_name to split the name and code in two values.
+                    account_lines_split_names[line['id']] = self.env['account.account']._split_code_name(line['name'])
+
+        def disable_bold_for_level(max_level):
+            if max_level in {0, 1, 2}:
+                # Total lines are supposed to be a level above, so we don't touch them.
+                for wb_format in (s for s in workbook_formats[max_level] if 'total' not in s):
+                    workbook_formats[max_level][wb_format].set_bold(False)
+
         print_mode_self = self.with_context(no_format=True)
-        lines = self._filter_out_folded_children(print_mode_self._get_lines(options))
+        if streamed:
+            lines = self._filter_out_folded_children(print_mode_self.with_context(account_report_skip_full_unfold=True)._get_lines(options))
+        else:
+            lines = self._filter_out_folded_children(print_mode_self._get_lines(options))
         annotations = self.get_annotations(options)
 
         # For reports with lines generated for accounts, the account name and codes are shown in a single column.
         # To help user post-process the report if they need, we should in such a case split the account name and code in two columns.
         account_lines_split_names = {}
-        for line in lines:
-            line_model = self._get_model_info_from_id(line['id'])[0]
-            if line_model == 'account.account':
-                # Reuse the _split_code_name to split the name and code in two values.
-                account_lines_split_names[line['id']] = self.env['account.account']._split_code_name(line['name'])
+        add_account_lines_split_names(lines)
 
         # Set the (Account) Name column width to 50.
         # If we have account lines and split the name and code in two columns, we will also set the code column.
@@ -6088,8 +6622,10 @@ class AccountReport(models.Model):
         else:
             sheet.set_column(0, 0, 50)
 
-        if not options.get('no_xlsx_currency_code_columns'):
-            self._add_xlsx_currency_codes_columns(options, lines)
+        add_currency_code_columns = not options.get('no_xlsx_currency_code_columns')
+        if add_currency_code_columns:
+            # When streaming, the values are added to each chunk of lines right before writing it.
+            self._add_xlsx_currency_codes_columns(options, [] if streamed else lines)
 
         original_x_offset = 1 if len(account_lines_split_names) > 0 else 0
 
@@ -6149,16 +6685,33 @@ class AccountReport(models.Model):
             lines = self.sort_lines(lines, options)
 
         # Disable bold styling for the max level.
-        max_level = max(line.get('level', -1) for line in lines) if lines else -1
-        if max_level in {0, 1, 2}:
-            # Total lines are supposed to be a level above, so we don't touch them.
-            for wb_format in (s for s in workbook_formats[max_level] if 'total' not in s):
-                workbook_formats[max_level][wb_format].set_bold(False)
+        # When streaming, the max level is only known once all the lines are written; since the formats are only serialized
+        # when closing the workbook, updating them afterwards still applies to the cells already written.
+        if streamed:
+            max_level = -1
+        else:
+            max_level = max(line.get('level', -1) for line in lines) if lines else -1
+            disable_bold_for_level(max_level)
+
+        def get_lines_chunks():
+            if not streamed:
+                yield lines
+                return
+
+            folded_lines = set()
+            for lines_chunk in print_mode_self._get_lines_chunks(options, lines):
+                lines_chunk = self._filter_out_folded_children(lines_chunk, folded_lines=folded_lines)
+                add_account_lines_split_names(lines_chunk)
+                if add_currency_code_columns:
+                    self._add_xlsx_currency_codes_columns(options, lines_chunk, update_columns=False)
+                yield lines_chunk
 
         # Add lines.
         counter = 1
-        for y, line in enumerate(lines):
+        for y, line in enumerate(line for lines_chunk in get_lines_chunks() for line in lines_chunk):
             level = line.get('level')
+            if streamed and level is not None:
+                max_level = max(max_level, level)
             if level == 0:
                 y_offset += 1
             elif not level:
@@ -6182,18 +6735,18 @@ class AccountReport(models.Model):
                 cell_format = get_format('default_indent', level)
 
             x_offset = original_x_offset + 1
-            if lines[y]['id'] in account_lines_split_names:
+            if original_x_offset and line['id'] in account_lines_split_names:
                 # Write the Account Code and Name columns.
-                code, name = account_lines_split_names[lines[y]['id']]
+                code, name = account_lines_split_names[line['id']]
                 # Don't indent the account code and don't format is as a monetary value either.
                 write_cell(sheet, 0, y + y_offset, code, account_code_cell_format)
                 write_cell(sheet, 1, y + y_offset, name, cell_format)
             else:
                 write_cell(sheet, original_x_offset, y + y_offset, cell_value, cell_format, datetime=cell_type == 'date')
 
-                if 'parent_id' in line and line['parent_id'] in account_lines_split_names:
+                if original_x_offset and 'parent_id' in line and line['parent_id'] in account_lines_split_names:
                     write_cell(sheet, 1 + original_x_offset, y + y_offset, account_lines_split_names[line['parent_id']][0], account_code_cell_format)
-                elif account_lines_split_names:
+                elif original_x_offset:
                     write_cell(sheet, 1 + original_x_offset, y + y_offset, "", account_code_cell_format)
 
             # Write all the remaining cells.
@@ -6223,29 +6776,37 @@ class AccountReport(models.Model):
                     counter += 1
                 write_cell(sheet, annotations_x_offset, y + y_offset, "\n".join(line_annotation_text), annotation_format)
 
-    def _add_xlsx_currency_codes_columns(self, options, lines):
+        if streamed:
+            disable_bold_for_level(max_level)
+
+    def _add_xlsx_currency_codes_columns(self, options, lines, update_columns=True):
         """ Adds a 'Currency Code' column for each column displaying amounts in foreign currencies. This is done because
         the raw number is displayed on the xlsx file, making it impossible to know the currency used.
-        To have it displayed, the line must have an expression label starting with '_currency_' """
+        To have it displayed, the line must have an expression label starting with '_currency_'
+
+        :param update_columns: Whether options['columns'] still needs to receive the new columns. Set to False when only adding
+                               the values of already added columns to a new chunk of lines.
+        """
         required_currency_code_columns = {
             label.removeprefix('_currency_')
             for label in self.line_ids.expression_ids.mapped('label')
             if label.startswith('_currency_')
         }
 
-        new_columns = []
-        for col in options['columns']:
-            new_columns.append(col)
+        if update_columns:
+            new_columns = []
+            for col in options['columns']:
+                new_columns.append(col)
 
-            if col['expression_label'] in required_currency_code_columns:
-                new_columns.append({
-                    **col,
-                    'name': _("Currency Code"),
-                    'figure_type': 'string',
-                    'expression_label': f"_xlsx_currency_code_{col['expression_label']}"
-                })
+                if col['expression_label'] in required_currency_code_columns:
+                    new_columns.append({
+                        **col,
+                        'name': _("Currency Code"),
+                        'figure_type': 'string',
+                        'expression_label': f"_xlsx_currency_code_{col['expression_label']}"
+                    })
 
-        options['columns'] = new_columns
+            options['columns'] = new_columns
 
         # Add 'Currency Code' values to each line
         for line in lines:
@@ -7290,6 +7851,24 @@ class AccountReportExpression(models.Model):
         }
 
 
+class AccountReportExternalValue(models.Model):
+    _inherit = 'account.report.external.value'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        external_values = super().create(vals_list)
+        external_values.company_id._bump_account_report_ledger_version()
+        return external_values
+
+    def write(self, vals):
+        self.company_id._bump_account_report_ledger_version()
+        return super().write(vals)
+
+    def unlink(self):
+        self.company_id._bump_account_report_ledger_version()
+        return super().unlink()
+
+
 class AccountReportHorizontalGroup(models.Model):
     _name = "account.report.horizontal.group"
     _description = "Horizontal group for reports"
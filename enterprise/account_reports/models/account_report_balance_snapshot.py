@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models, osv
+from odoo.tools import date_utils, SQL
+
+_logger = logging.getLogger(__name__)
+
+# account.move.line fields that are kept in the balance snapshot; any domain or groupby only targeting those fields can
+# be evaluated on the snapshot instead of the move lines themselves.
+BALANCE_SNAPSHOT_FIELDS = ('company_id', 'account_id', 'journal_id', 'partner_id')
+
+
+class AccountReportBalanceSnapshot(models.Model):
+    """ Monthly balances of the posted journal items, per company, account, journal and partner.
+
+    The snapshot only covers the closed periods of a company, i.e. the months ending on or before
+    res.company.account_report_balance_snapshot_date. It is maintained incrementally when moves are posted or reset
+    to draft, and extended by a cron at the beginning of each month. The account_codes and domain report engines use
+    it to avoid aggregating every single journal item of those periods when opening a report.
+    """
+    _name = 'account.report.balance.snapshot'
+    _description = "Accounting Report Balance Snapshot"
+    _log_access = False
+    _order = 'date, id'
+
+    company_id = fields.Many2one(comodel_name='res.company', required=True, readonly=True, index=True, ondelete='cascade')
+    company_currency_id = fields.Many2one(related='company_id.currency_id')
+    account_id = fields.Many2one(comodel_name='account.account', required=True, readonly=True, ondelete='cascade')
+    journal_id = fields.Many2one(comodel_name='account.journal', readonly=True, ondelete='cascade')
+    partner_id = fields.Many2one(comodel_name='res.partner', readonly=True, ondelete='cascade')
+    date = fields.Date(required=True, readonly=True, help="First day of the month aggregated by this snapshot row.")
+    debit = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    credit = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    balance = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    line_count = fields.Integer(readonly=True, help="Number of journal items aggregated by this snapshot row.")
+
+    def init(self):
+        super().init()
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS account_report_balance_snapshot_unique_key_idx
+            ON account_report_balance_snapshot (company_id, date, account_id, COALESCE(journal_id, 0), COALESCE(partner_id, 0))
+        """)
+
+    ####################################################
+    # MAINTENANCE
+    ####################################################
+
+    @api.model
+    def _get_closed_period_end(self, today=None):
+        """ Returns the last day of the last closed period, i.e. the end of the month preceding today. """
+        today = today or fields.Date.context_today(self)
+        return date_utils.start_of(today, 'month') - relativedelta(days=1)
+
+    @api.model
+    def _get_aml_aggregate_query(self, where_sql) -> SQL:
+        """ Returns the SELECT aggregating the posted journal items matching where_sql into snapshot rows.
+        account_move_line is joined with res_company, so that where_sql can refer to the snapshot date of the company.
+        """
+        return SQL(
+            """
+            SELECT
+                account_move_line.company_id,
+                account_move_line.account_id,
+                account_move_line.journal_id,
+                account_move_line.partner_id,
+                DATE_TRUNC('month', account_move_line.date)::date,
+                SUM(account_move_line.debit),
+                SUM(account_move_line.credit),
+                SUM(account_move_line.balance),
+                COUNT(*)
+            FROM account_move_line
+            JOIN res_company ON res_company.id = account_move_line.company_id
+            WHERE account_move_line.parent_state = 'posted'
+              AND account_move_line.display_type NOT IN ('line_section', 'line_note')
+              AND %(where_sql)s
+            GROUP BY 1, 2, 3, 4, 5
+            """,
+            where_sql=where_sql,
+        )
+
+    @api.model
+    def _insert_aggregated_rows(self, where_sql):
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO account_report_balance_snapshot
+                (company_id, account_id, journal_id, partner_id, date, debit, credit, balance, line_count)
+            %s
+            """,
+            self._get_aml_aggregate_query(where_sql),
+        ))
+        return self.env.cr.rowcount
+
+    @api.model
+    def _rebuild(self, companies):
+        """ Fully recomputes the snapshot of the provided companies, up to the end of their last closed period. """
+        if not companies:
+            return
+
+        self.env['account.move.line'].flush_model()
+        closed_period_end = self._get_closed_period_end()
+        self.env.cr.execute(SQL(
+            "DELETE FROM account_report_balance_snapshot WHERE company_id IN %s",
+            tuple(companies.ids),
+        ))
+        companies.sudo().account_report_balance_snapshot_date = closed_period_end
+        companies.flush_recordset(['account_report_balance_snapshot_date'])
+        row_count = self._insert_aggregated_rows(SQL(
+            "account_move_line.company_id IN %s AND account_move_line.date <= %s",
+            tuple(companies.ids),
+            closed_period_end,
+        ))
+        self.invalidate_model()
+        _logger.info("Rebuilt the balance snapshot of companies %s up to %s: %s rows.", companies.ids, closed_period_end, row_count)
+
+    @api.model
+    def _clear(self, companies):
+        if not companies:
+            return
+
+        self.env.cr.execute(SQL(
+            "DELETE FROM account_report_balance_snapshot WHERE company_id IN %s",
+            tuple(companies.ids),
+        ))
+        companies.sudo().account_report_balance_snapshot_date = False
+        self.invalidate_model()
+
+    @api.model
+    def _refresh_for_moves(self, moves):
+        """ Recomputes the snapshot rows impacted by the journal items of the provided moves. Must be called once the
+        state of the moves has been changed (posted, or reset to draft).
+        """
+        companies = moves.company_id.filtered('account_report_balance_snapshot_date')
+        if not companies:
+            return
+
+        self.env['account.move.line'].flush_model()
+        impacted_keys_sql = SQL(
+            """
+            SELECT DISTINCT
+                account_move_line.company_id,
+                account_move_line.account_id,
+                account_move_line.journal_id,
+                account_move_line.partner_id,
+                DATE_TRUNC('month', account_move_line.date)::date AS date
+            FROM account_move_line
+            JOIN res_company ON res_company.id = account_move_line.company_id
+            WHERE account_move_line.move_id IN %(move_ids)s
+              AND account_move_line.date <= res_company.account_report_balance_snapshot_date
+            """,
+            move_ids=tuple(moves.ids),
+        )
+        self.env.cr.execute(SQL(
+            """
+            CREATE TEMPORARY TABLE IF NOT EXISTS account_report_balance_snapshot_impacted_keys (
+                company_id INTEGER, account_id INTEGER, journal_id INTEGER, partner_id INTEGER, date DATE
+            ) ON COMMIT DROP;
+            TRUNCATE account_report_balance_snapshot_impacted_keys;
+            INSERT INTO account_report_balance_snapshot_impacted_keys %(impacted_keys_sql)s;
+
+            DELETE FROM account_report_balance_snapshot snapshot
+            USING account_report_balance_snapshot_impacted_keys impacted_key
+            WHERE snapshot.company_id = impacted_key.company_id
+              AND snapshot.date = impacted_key.date
+              AND snapshot.account_id = impacted_key.account_id
+              AND snapshot.journal_id IS NOT DISTINCT FROM impacted_key.journal_id
+              AND snapshot.partner_id IS NOT DISTINCT FROM impacted_key.partner_id;
+            """,
+            impacted_keys_sql=impacted_keys_sql,
+        ))
+        self._insert_aggregated_rows(SQL(
+            """
+            EXISTS(
+                SELECT 1
+                FROM account_report_balance_snapshot_impacted_keys impacted_key
+                WHERE impacted_key.company_id = account_move_line.company_id
+                  AND impacted_key.date = DATE_TRUNC('month', account_move_line.date)::date
+                  AND impacted_key.account_id = account_move_line.account_id
+                  AND impacted_key.journal_id IS NOT DISTINCT FROM account_move_line.journal_id
+                  AND impacted_key.partner_id IS NOT DISTINCT FROM account_move_line.partner_id
+            )
+            """
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def _cron_extend_balance_snapshots(self):
+        """ Adds the periods closed since the last run to the snapshot of every company using it. """
+        closed_period_end = self._get_closed_period_end()
+        companies = self.env['res.company'].search([
+            ('account_report_balance_snapshot_date', '!=', False),
+            ('account_report_balance_snapshot_date', '<', closed_period_end),
+        ])
+        if not companies:
+            return
+
+        self.env['account.move.line'].flush_model()
+        row_count = self._insert_aggregated_rows(SQL(
+            """
+            account_move_line.company_id IN %s
+            AND account_move_line.date > res_company.account_report_balance_snapshot_date
+            AND account_move_line.date <= %s
+            """,
+            tuple(companies.ids),
+            closed_period_end,
+        ))
+        companies.account_report_balance_snapshot_date = closed_period_end
+        _logger.info("Extended the balance snapshot of companies %s up to %s: %s rows.", companies.ids, closed_period_end, row_count)
+
+    ####################################################
+    # CONSISTENCY CHECK
+    ####################################################
+
+    @api.model
+    def _check_consistency(self, companies):
+        """ Compares the snapshot of the provided companies with the live aggregation of their journal items.
+
+        :return: A list of dict, one per inconsistent snapshot row, containing the key of the row as well as the
+                 snapshot and live balances and line counts. An empty list means the snapshot is consistent.
+        """
+        companies = companies.filtered('account_report_balance_snapshot_date')
+        if not companies:
+            return []
+
+        self.env['account.move.line'].flush_model()
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            WITH live AS (%(live_sql)s),
+            snapshot AS (
+                SELECT company_id, account_id, journal_id, partner_id, date, balance, line_count
+                FROM account_report_balance_snapshot
+                WHERE company_id IN %(company_ids)s
+            )
+            SELECT
+                COALESCE(live.company_id, snapshot.company_id) AS company_id,
+                COALESCE(live.account_id, snapshot.account_id) AS account_id,
+                COALESCE(live.journal_id, snapshot.journal_id) AS journal_id,
+                COALESCE(live.partner_id, snapshot.partner_id) AS partner_id,
+                COALESCE(live.date, snapshot.date) AS date,
+                COALESCE(snapshot.balance, 0.0) AS snapshot_balance,
+                COALESCE(live.balance, 0.0) AS live_balance,
+                COALESCE(snapshot.line_count, 0) AS snapshot_line_count,
+                COALESCE(live.line_count, 0) AS live_line_count
+            FROM live
+            FULL OUTER JOIN snapshot
+                ON snapshot.company_id = live.company_id
+                AND snapshot.date = live.date
+                AND snapshot.account_id = live.account_id
+                AND snapshot.journal_id IS NOT DISTINCT FROM live.journal_id
+                AND snapshot.partner_id IS NOT DISTINCT FROM live.partner_id
+            WHERE COALESCE(snapshot.balance, 0.0) != COALESCE(live.balance, 0.0)
+               OR COALESCE(snapshot.line_count, 0) != COALESCE(live.line_count, 0)
+            ORDER BY 1, 5, 2
+            """,
+            live_sql=SQL(
+                """
+                SELECT company_id, account_id, journal_id, partner_id, date, balance, line_count
+                FROM (%s) AS aggregated (company_id, account_id, journal_id, partner_id, date, debit, credit, balance, line_count)
+                """,
+                self._get_aml_aggregate_query(SQL(
+                    "account_move_line.company_id IN %s AND account_move_line.date <= res_company.account_report_balance_snapshot_date",
+                    tuple(companies.ids),
+                )),
+            ),
+            company_ids=tuple(companies.ids),
+        ))
+        inconsistencies = self.env.cr.dictfetchall()
+        if inconsistencies:
+            _logger.warning("Balance snapshot of companies %s has %s inconsistent rows.", companies.ids, len(inconsistencies))
+        return inconsistencies
+
+
+class AccountReport(models.Model):
+    _inherit = 'account.report'
+
+    def _get_balance_snapshot_table(self, options, date_scope, domain=None, groupby_fields=()) -> SQL | None:
+        """ Returns a derived table to use instead of account_move_line in the queries of the account_codes and domain
+        engines, combining the balance snapshot rows of the closed months fully included in the period with the journal
+        items of the remaining, open, part of the period.
+
+        The table exposes the company_id, account_id, journal_id, partner_id, balance and aml_count columns, aml_count
+        being the number of journal items each row stands for.
+
+        :return: The derived table SQL, or None if the snapshot cannot be used to compute these options, in which case
+                 the engines fall back on the live computation.
+        """
+        if self._context.get('account_report_skip_balance_snapshot'):
+            return None
+
+        if any(groupby_field not in BALANCE_SNAPSHOT_FIELDS for groupby_field in groupby_fields):
+            return None
+
+        if (
+            self.only_tax_exigible
+            or options.get('all_entries')
+            or options['currency_table']['type'] == 'cta'
+            or any(options.get(option_key) for option_key in ('compute_budget', 'analytic_groupby_option', 'analytic_accounts', 'report_cash_basis'))
+        ):
+            return None
+
+        companies = self.env['res.company'].browse(self.get_report_company_ids(options))
+        snapshot_dates = companies.mapped('account_report_balance_snapshot_date')
+        if not companies or not all(snapshot_dates):
+            return None
+
+        # Only the months fully included in the period can be taken from the snapshot.
+        date_from, date_to = self._get_date_bounds_info(options, date_scope)
+        date_to = fields.Date.to_date(date_to)
+        if date_to != date_utils.end_of(date_to, 'month'):
+            date_to = date_utils.start_of(date_to, 'month') - relativedelta(days=1)
+        snapshot_to = min(date_to, *snapshot_dates)
+        snapshot_from = None
+        if date_from:
+            date_from = fields.Date.to_date(date_from)
+            snapshot_from = date_from if date_from == date_utils.start_of(date_from, 'month') else date_utils.start_of(date_from, 'month') + relativedelta(months=1)
+            if snapshot_from > snapshot_to:
+                return None
+
+        # Translate the domain to the snapshot model; it can only target the fields the snapshot is grouped by.
+        snapshot_domain = []
+        for leaf in self._get_options_domain(options, None) + (domain or []):
+            if not osv.expression.is_leaf(leaf) or leaf in (osv.expression.TRUE_LEAF, osv.expression.FALSE_LEAF):
+                snapshot_domain.append(leaf)
+                continue
+
+            field_name, operator, value = leaf
+            # The snapshot only contains posted journal items, without sections nor notes.
+            root_field_name = field_name.split('.')[0]
+            if root_field_name == 'display_type' and operator == 'not in' and set(value) >= {'line_section', 'line_note'}:
+                snapshot_domain.append(osv.expression.TRUE_LEAF)
+            elif root_field_name == 'parent_state' and operator == '=' and value == 'posted':
+                snapshot_domain.append(osv.expression.TRUE_LEAF)
+            elif root_field_name in BALANCE_SNAPSHOT_FIELDS:
+                snapshot_domain.append(leaf)
+            else:
+                return None
+
+        snapshot_date_domain = [('date', '<=', date_utils.start_of(snapshot_to, 'month'))]
+        if snapshot_from:
+            snapshot_date_domain.append(('date', '>=', snapshot_from))
+
+        Snapshot = self.env['account.report.balance.snapshot']
+        snapshot_query = Snapshot._where_calc(osv.expression.AND([snapshot_domain, snapshot_date_domain]))
+        Snapshot._apply_ir_rules(snapshot_query)
+
+        live_query = self._get_report_query(options, date_scope, domain=domain)
+        if snapshot_from:
+            live_query.add_where(SQL("account_move_line.date NOT BETWEEN %s AND %s", snapshot_from, snapshot_to))
+        else:
+            live_query.add_where(SQL("account_move_line.date > %s", snapshot_to))
+
+        return SQL(
+            "(%s UNION ALL %s)",
+            snapshot_query.select(*(
+                SQL.identifier('account_report_balance_snapshot', column)
+                for column in (*BALANCE_SNAPSHOT_FIELDS, 'balance')
+            ), SQL("account_report_balance_snapshot.line_count AS aml_count")),
+            live_query.select(*(
+                SQL.identifier('account_move_line', column)
+                for column in (*BALANCE_SNAPSHOT_FIELDS, 'balance')
+            ), SQL("1 AS aml_count")),
+        )
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+# Key of the cursor's precommit data holding the ids of the companies whose accounting data changed in the transaction
+PENDING_LEDGER_CHANGES_KEY = 'account_reports.ledger_change_company_ids'
+
+
+class AccountReportLedgerChange(models.Model):
+    """ Append-only log of the transactions having changed the accounting data of a company, from which the ledger versions
+    keying the expression totals cache of the reports are derived (see account.report._get_expression_totals_cache_key).
+
+    A transaction inserts one row per impacted company right before being committed. Unlike incrementing a counter on the
+    company, inserting rows never makes concurrent transactions of the same company conflict with each other.
+
+    The ledger version of a company is the pair (number of rows, greatest row id), as seen by the current transaction:
+    - the number of rows only grows with each commit, so it identifies the committed data a transaction can see; the rows
+      compacted by _cron_compact_ledger_changes are kept into account through res.company.account_report_ledger_version_offset;
+    - the ids coming from a sequence, they're never reused: a transaction seeing its own uncommitted rows gets a version no
+      other transaction will ever get, even if it's rolled back.
+    """
+    _name = 'account.report.ledger.change'
+    _description = "Accounting Report Ledger Change"
+    _log_access = False
+
+    company_id = fields.Many2one(comodel_name='res.company', required=True, readonly=True, ondelete='cascade')
+
+    def init(self):
+        super().init()
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_report_ledger_change_company_id_id_idx
+            ON account_report_ledger_change (company_id, id)
+        """)
+
+    @api.model
+    def _register_changes(self, companies):
+        """ Registers the companies for a new change row, inserted when the current transaction gets committed. Until then,
+        the reports computed in the transaction bypass the cache.
+        """
+        if not companies:
+            return
+
+        pending_company_ids = self.env.cr.precommit.data.setdefault(PENDING_LEDGER_CHANGES_KEY, set())
+        if not pending_company_ids:
+            self.env.cr.precommit.add(self._flush_pending_changes)
+        pending_company_ids.update(companies.ids)
+
+    @api.model
+    def _flush_pending_changes(self):
+        company_ids = self.env.cr.precommit.data.pop(PENDING_LEDGER_CHANGES_KEY, None)
+        if company_ids:
+            self.env.cr.execute(SQL(
+                "INSERT INTO account_report_ledger_change (company_id) SELECT UNNEST(%s)",
+                sorted(company_ids),
+            ))
+
+    @api.model
+    def _has_pending_changes(self):
+        return bool(self.env.cr.precommit.data.get(PENDING_LEDGER_CHANGES_KEY))
+
+    @api.model
+    def _get_ledger_versions(self, company_ids):
+        """ Returns the ledger version of each of the provided companies, as a tuple of (company_id, number of changes,
+        greatest change id) tuples, ordered by company.
+        """
+        return tuple(map(tuple, self.env.execute_query(SQL(
+            """
+                SELECT company.id,
+                       COALESCE(company.account_report_ledger_version_offset, 0) + COUNT(change.id),
+                       COALESCE(MAX(change.id), 0)
+                  FROM res_company company
+             LEFT JOIN account_report_ledger_change change ON change.company_id = company.id
+                 WHERE company.id IN %s
+              GROUP BY company.id
+              ORDER BY company.id
+            """,
+            tuple(company_ids),
+        ))))
+
+    @api.model
+    def _cron_compact_ledger_changes(self):
+        """ Deletes all the change rows but the last one of each company, adding their number to the offset of the company
+        so that its ledger version remains the same.
+        """
+        self.env.cr.execute("""
+            WITH deleted AS (
+                DELETE FROM account_report_ledger_change change
+                      USING (
+                          SELECT company_id, MAX(id) AS max_id
+                            FROM account_report_ledger_change
+                        GROUP BY company_id
+                      ) last_change
+                      WHERE change.company_id = last_change.company_id
+                        AND change.id < last_change.max_id
+                  RETURNING change.company_id
+            )
+            UPDATE res_company company
+               SET account_report_ledger_version_offset = COALESCE(company.account_report_ledger_version_offset, 0) + deleted_count.count
+              FROM (SELECT company_id, COUNT(*) AS count FROM deleted GROUP BY company_id) deleted_count
+             WHERE company.id = deleted_count.company_id
+        """)
+        self.env['res.company'].invalidate_model(['account_report_ledger_version_offset'])
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+from markupsafe import Markup
+
+from odoo import _, api, fields, models, modules
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class AccountReportXlsxExport(models.Model):
+    """ Xlsx export of an accounting report, queued to be generated in the background.
+
+    Fully unfolding a big report (typically the General Ledger of a large company) within a request can exhaust the memory
+    of the worker and exceed its time limit. Those exports are hence processed by a cron, which streams the lines of the
+    report into a temporary file (see account.report._export_to_xlsx_streamed), stores it as an attachment and notifies the
+    user who requested it with a download link.
+    """
+    _name = 'account.report.xlsx.export'
+    _description = "Accounting Report Background Xlsx Export"
+    _order = 'id'
+
+    report_id = fields.Many2one(comodel_name='account.report', required=True, readonly=True, ondelete='cascade')
+    options = fields.Json(readonly=True, help="Options of the report at the time the export was requested.")
+    user_id = fields.Many2one(comodel_name='res.users', required=True, readonly=True, default=lambda self: self.env.user, ondelete='cascade')
+    company_id = fields.Many2one(comodel_name='res.company', required=True, readonly=True, default=lambda self: self.env.company, ondelete='cascade')
+    state = fields.Selection(
+        selection=[
+            ('to_process', "To Process"),
+            ('done', "Done"),
+            ('failed', "Failed"),
+        ],
+        required=True,
+        readonly=True,
+        default='to_process',
+    )
+    attachment_id = fields.Many2one(comodel_name='ir.attachment', readonly=True)
+    error_message = fields.Text(readonly=True)
+
+    @api.model
+    def _cron_process_xlsx_exports(self, job_count=5):
+        """ Generates the pending xlsx exports, committing after each of them so that a failure or a timeout on one export
+        doesn't lose the others.
+
+        :param job_count: maximum number of exports to generate in this run; the cron is retriggered if some are left.
+        """
+        auto_commit = not modules.module.current_test
+        exports = self.search([('state', '=', 'to_process')], limit=job_count + 1)
+        for export in exports[:job_count]:
+            export._process_xlsx_export()
+            if auto_commit:
+                self.env.cr.commit()
+
+        if len(exports) > job_count:
+            self.env.ref('account_reports.ir_cron_account_report_xlsx_export')._trigger()
+
+    def _process_xlsx_export(self):
+        self.ensure_one()
+        # The export is generated with the access rights of the user who requested it.
+        report = self.report_id.with_user(self.user_id).with_company(self.company_id)
+
+        try:
+            with self.env.cr.savepoint(), tempfile.TemporaryFile() as output:
+                file_name = self._generate_xlsx_export(report, output)
+                attachment = self._create_xlsx_export_attachment(file_name, output, report.get_export_mime_type('xlsx'))
+        except Exception as e:  # noqa: BLE001
+            _logger.exception("Background xlsx export %s of report %s failed.", self.id, self.report_id.id)
+            self.write({'state': 'failed', 'error_message': str(e)})
+            self._notify_xlsx_export_user()
+            return
+
+        self.write({'state': 'done', 'attachment_id': attachment.id})
+        self._notify_xlsx_export_user()
+
+    def _generate_xlsx_export(self, report, output):
+        """ Writes the xlsx file of the export into output.
+
+        Reports whose custom handler overrides export_to_xlsx are exported through it, exactly like the synchronous
+        export; the others are streamed into the file.
+
+        :param report: the report to export, with the user and company who requested the export.
+        :param output: binary file object the xlsx file is written into.
+        :return: the name of the file.
+        """
+        self.ensure_one()
+        custom_handler_model = report._get_custom_handler_model()
+        if custom_handler_model and hasattr(self.env[custom_handler_model], 'export_to_xlsx'):
+            export_result = report.dispatch_report_action(self.options, 'export_to_xlsx')
+            output.write(export_result['file_content'])
+            return export_result['file_name']
+
+        report._export_to_xlsx_streamed(self.options, output)
+        return report.get_default_report_filename(self.options, 'xlsx')
+
+    def _create_xlsx_export_attachment(self, file_name, output, mimetype):
+        """ Stores the generated file as an attachment of the export, only readable by the user who requested it (see
+        the record rules of the export). With a file storage, the file is copied by chunks into the filestore rather
+        than loaded into memory.
+        """
+        self.ensure_one()
+        Attachment = self.env['ir.attachment']
+        attachment_vals = {
+            'name': file_name,
+            'mimetype': mimetype,
+            'res_model': self._name,
+            'res_id': self.id,
+        }
+        output.seek(0)
+        if Attachment._storage() != 'file':
+            return Attachment.create({**attachment_vals, 'raw': output.read()})
+
+        sha1 = hashlib.sha1()
+        while chunk := output.read(CHUNK_SIZE):
+            sha1.update(chunk)
+        checksum = sha1.hexdigest()
+        file_size = output.tell()
+        store_fname, full_path = Attachment._get_path(b'', checksum)
+        if not os.path.exists(full_path):
+            output.seek(0)
+            with open(full_path, 'wb') as file:
+                shutil.copyfileobj(output, file, CHUNK_SIZE)
+            Attachment._mark_for_gc(store_fname)
+
+        # The file fields can't be given to create, which only computes them from the content.
+        attachment = Attachment.create(attachment_vals)
+        self.env.cr.execute(SQL(
+            "UPDATE ir_attachment SET store_fname = %s, file_size = %s, checksum = %s WHERE id = %s",
+            store_fname, file_size, checksum, attachment.id,
+        ))
+        attachment.invalidate_recordset(['store_fname', 'file_size', 'checksum', 'raw', 'datas'])
+        return attachment
+
+    def _notify_xlsx_export_user(self):
+        self.ensure_one()
+        if self.state == 'done':
+            subject = _("Your export of %s is ready", self.report_id.name)
+            body = Markup('<p>%s</p><a href="/web/content/%s?download=true">%s</a>') % (
+                _("The xlsx export of %s you requested has been generated.", self.report_id.name),
+                self.attachment_id.id,
+                self.attachment_id.name,
+            )
+        else:
+            subject = _("Your export of %s failed", self.report_id.name)
+            body = Markup('<p>%s</p><p>%s</p>') % (
+                _("The xlsx export of %s you requested could not be generated:", self.report_id.name),
+                self.error_message,
+            )
+
+        self.env['mail.thread'].message_notify(
+            partner_ids=self.user_id.partner_id.ids,
+            model_description=_("Accounting Report Export"),
+            subject=subject,
+            body=body,
+            email_layout_xmlid='mail.mail_notification_light',
+        )
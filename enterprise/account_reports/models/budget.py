@@ -109,3 +109,17 @@ class AccountReportBudgetItem(models.Model):
     account_id = fields.Many2one(string="Account", comodel_name='account.account', required=True)
     amount = fields.Float(string="Amount", default=0)
     date = fields.Date(required=True)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        items = super().create(vals_list)
+        items.budget_id.company_id._bump_account_report_ledger_version()
+        return items
+
+    def write(self, vals):
+        self.budget_id.company_id._bump_account_report_ledger_version()
+        return super().write(vals)
+
+    def unlink(self):
+        self.budget_id.company_id._bump_account_report_ledger_version()
+        return super().unlink()
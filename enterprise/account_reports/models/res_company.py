@@ -33,6 +33,15 @@ class ResCompany(models.Model):
     account_representative_id = fields.Many2one('res.partner', string='Accounting Firm',
                                                 help="Specify an Accounting Firm that will act as a representative when exporting reports.")
     account_display_representative_field = fields.Boolean(compute='_compute_account_display_representative_field')
+    account_report_use_balance_snapshot = fields.Boolean(
+        string="Use Balance Snapshot",
+        help="When ticked, the balances of the closed months are kept in a snapshot, so that the reports do not need to aggregate all their journal items.")
+    account_report_balance_snapshot_date = fields.Date(
+        string="Balance Snapshot Date", readonly=True,
+        help="Last day of the last closed month included in the balance snapshot.")
+    account_report_ledger_version_offset = fields.Integer(
+        readonly=True, default=0,
+        help="Number of ledger changes compacted away from account.report.ledger.change for this company.")
 
     @api.depends('account_fiscal_country_id.code')
     def _compute_account_display_representative_field(self):
@@ -40,6 +49,12 @@ class ResCompany(models.Model):
         for record in self:
             record.account_display_representative_field = record.account_fiscal_country_id.code in country_set
 
+    def _bump_account_report_ledger_version(self):
+        """ Records that the accounting data of the companies changed in the current transaction, making the expression totals
+        cached for their reports unreachable once it's committed (see account.report.ledger.change).
+        """
+        self.env['account.report.ledger.change']._register_changes(self)
+
     def _get_countries_allowing_tax_representative(self):
         """ Returns a set containing the country codes of the countries for which
         it is possible to use a representative to submit the tax report.
@@ -83,8 +98,19 @@ class ResCompany(models.Model):
                 if need_tax_closing_update:
                     to_update += company
 
+        if 'account_report_use_balance_snapshot' in values:
+            snapshot_companies_to_update = self.filtered(lambda c: c.account_report_use_balance_snapshot != values['account_report_use_balance_snapshot'])
+        else:
+            snapshot_companies_to_update = self.env['res.company']
+
         res = super().write(values)
 
+        if snapshot_companies_to_update:
+            if values['account_report_use_balance_snapshot']:
+                self.env['account.report.balance.snapshot']._rebuild(snapshot_companies_to_update)
+            else:
+                self.env['account.report.balance.snapshot']._clear(snapshot_companies_to_update)
+
         # Early return
         if not to_update:
             return res
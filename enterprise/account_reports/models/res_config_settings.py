@@ -17,6 +17,8 @@ class ResConfigSettings(models.TransientModel):
     account_tax_periodicity = fields.Selection(related='company_id.account_tax_periodicity', string='Periodicity', readonly=False, required=True)
     account_tax_periodicity_reminder_day = fields.Integer(related='company_id.account_tax_periodicity_reminder_day', string='Reminder', readonly=False, required=True)
     account_tax_periodicity_journal_id = fields.Many2one(related='company_id.account_tax_periodicity_journal_id', string='Journal', readonly=False)
+    account_report_use_balance_snapshot = fields.Boolean(related='company_id.account_report_use_balance_snapshot', readonly=False)
+    account_report_balance_snapshot_date = fields.Date(related='company_id.account_report_balance_snapshot_date')
 
     account_reports_show_per_company_setting = fields.Boolean(compute="_compute_account_reports_show_per_company_setting")
 
@@ -33,6 +35,46 @@ class ResConfigSettings(models.TransientModel):
             },
         }
 
+    def action_rebuild_account_report_balance_snapshot(self):
+        self.ensure_one()
+        self.env['account.report.balance.snapshot']._rebuild(self.company_id)
+
+    def action_check_account_report_balance_snapshot(self):
+        self.ensure_one()
+        inconsistencies = self.env['account.report.balance.snapshot']._check_consistency(self.company_id)
+        if inconsistencies:
+            message = _("%s balance snapshot rows differ from the journal items. Rebuild the snapshot to fix them.", len(inconsistencies))
+        else:
+            message = _("The balance snapshot is consistent with the journal items.")
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'warning' if inconsistencies else 'success',
+                'message': message,
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    def action_show_account_report_cache_stats(self):
+        stats = self.env['account.report']._get_expression_totals_cache_stats()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _(
+                    "Report values cache of this server worker: %(hits)s hits, %(misses)s misses (%(hit_ratio)s%% hit ratio), %(size)s/%(max_size)s entries.",
+                    hits=stats['hits'],
+                    misses=stats['misses'],
+                    hit_ratio=round(stats['hit_ratio'] * 100, 1),
+                    size=stats['size'],
+                    max_size=stats['max_size'],
+                ),
+            },
+        }
+
     @api.depends('company_id')
     def _compute_account_reports_show_per_company_setting(self):
         custom_start_country_codes = self._get_country_codes_with_another_tax_closing_start_date()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+
+class ResCurrencyRate(models.Model):
+    _inherit = 'res.currency.rate'
+
+    def _bump_account_report_ledger_version(self):
+        # Rates without company apply to all of them
+        if any(not rate.company_id for rate in self):
+            companies = self.env['res.company'].sudo().search([])
+        else:
+            companies = self.company_id
+        companies._bump_account_report_ledger_version()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        rates = super().create(vals_list)
+        rates._bump_account_report_ledger_version()
+        return rates
+
+    def write(self, vals):
+        self._bump_account_report_ledger_version()
+        return super().write(vals)
+
+    def unlink(self):
+        self._bump_account_report_ledger_version()
+        return super().unlink()
@@ -28,6 +28,11 @@ class TestAccountReportsCommon(AccountTestInvoicingCommon):
         cls.company_data_2['company'].currency_id = cls.other_currency
         cls.company_data_2['currency'] = cls.other_currency
 
+    def setUp(self):
+        super().setUp()
+        # The expression totals cache is kept by the worker; don't let a test reuse the totals computed by another one.
+        self.env['account.report']._clear_expression_totals_cache()
+
     @classmethod
     def _generate_options(cls, report, date_from, date_to, default_options=None):
         ''' Create new options at a certain date.
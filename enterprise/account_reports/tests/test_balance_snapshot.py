@@ -0,0 +1,141 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from freezegun import freeze_time
+
+from .common import TestAccountReportsCommon
+
+from odoo import Command
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestBalanceSnapshot(TestAccountReportsCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.company_data['company']
+        cls.company.totals_below_sections = False
+
+        cls.account_revenue = cls.company_data['default_account_revenue']
+        cls.account_receivable = cls.company_data['default_account_receivable']
+
+        cls.report = cls.env['account.report'].create({
+            'name': "Snapshot Report",
+            'filter_date_range': True,
+            'filter_unfold_all': True,
+            'column_ids': [Command.create({'name': "Balance", 'expression_label': 'balance'})],
+            'line_ids': [
+                Command.create({
+                    'name': "Revenue",
+                    'code': 'REV',
+                    'groupby': 'partner_id',
+                    'expression_ids': [Command.create({
+                        'label': 'balance',
+                        'engine': 'account_codes',
+                        'formula': f'-{cls.account_revenue.code}',
+                        'date_scope': 'strict_range',
+                    })],
+                }),
+                Command.create({
+                    'name': "Receivable",
+                    'code': 'REC',
+                    'expression_ids': [Command.create({
+                        'label': 'balance',
+                        'engine': 'domain',
+                        'formula': f"[('account_id.code', '=', '{cls.account_receivable.code}')]",
+                        'subformula': 'sum',
+                        'date_scope': 'from_beginning',
+                    })],
+                }),
+            ],
+        })
+
+        cls.moves = cls.env['account.move'].create([
+            cls._prepare_snapshot_test_move(date, amount)
+            for date, amount in (('2020-01-10', 100.0), ('2020-02-10', 200.0), ('2020-02-29', 400.0), ('2020-03-15', 800.0))
+        ])
+        cls.moves.action_post()
+
+    @classmethod
+    def _prepare_snapshot_test_move(cls, date, amount):
+        return {
+            'date': date,
+            'line_ids': [
+                Command.create({'account_id': cls.account_receivable.id, 'partner_id': cls.partner_a.id, 'debit': amount}),
+                Command.create({'account_id': cls.account_revenue.id, 'partner_id': cls.partner_a.id, 'credit': amount}),
+            ],
+        }
+
+    def _assert_report_matches_live_computation(self, date_from, date_to, expected_values):
+        options = self._generate_options(self.report, date_from, date_to, default_options={'unfold_all': True})
+        live_lines = self.report.with_context(account_report_skip_balance_snapshot=True)._get_lines(options)
+        self.assertLinesValues(self.report._get_lines(options), [0, 1], expected_values, options)
+        self.assertLinesValues(live_lines, [0, 1], expected_values, options)
+
+    @freeze_time('2020-03-20')
+    def test_balance_snapshot_engines(self):
+        self.company.account_report_use_balance_snapshot = True
+        self.assertEqual(str(self.company.account_report_balance_snapshot_date), '2020-02-29')
+        self.assertEqual(
+            sorted(self.env['account.report.balance.snapshot'].search([('company_id', '=', self.company.id)]).mapped('balance')),
+            [-600.0, -100.0, 100.0, 600.0],
+        )
+
+        # Range covering closed months only, closed months and the open one, and partial months.
+        self._assert_report_matches_live_computation('2020-01-01', '2020-02-29', [
+            ("Revenue",             700.0),
+            ("partner_a",           700.0),
+            ("Receivable",          700.0),
+        ])
+        self._assert_report_matches_live_computation('2020-01-01', '2020-03-31', [
+            ("Revenue",             1500.0),
+            ("partner_a",           1500.0),
+            ("Receivable",          1500.0),
+        ])
+        self._assert_report_matches_live_computation('2020-01-15', '2020-02-28', [
+            ("Revenue",             200.0),
+            ("partner_a",           200.0),
+            ("Receivable",          300.0),
+        ])
+
+    @freeze_time('2020-03-20')
+    def test_balance_snapshot_incremental_refresh(self):
+        Snapshot = self.env['account.report.balance.snapshot']
+        self.company.account_report_use_balance_snapshot = True
+
+        move = self.env['account.move'].create(self._prepare_snapshot_test_move('2020-02-15', 1000.0))
+        move.action_post()
+        self.assertFalse(Snapshot._check_consistency(self.company))
+        self._assert_report_matches_live_computation('2020-02-01', '2020-02-29', [
+            ("Revenue",             1600.0),
+            ("partner_a",           1600.0),
+            ("Receivable",          1700.0),
+        ])
+
+        move.button_draft()
+        self.assertFalse(Snapshot._check_consistency(self.company))
+        self._assert_report_matches_live_computation('2020-02-01', '2020-02-29', [
+            ("Revenue",             600.0),
+            ("partner_a",           600.0),
+            ("Receivable",          700.0),
+        ])
+
+        # Altering the snapshot behind the ORM's back is reported by the consistency check.
+        self.env.cr.execute("UPDATE account_report_balance_snapshot SET balance = balance + 1 WHERE company_id = %s", [self.company.id])
+        self.assertEqual(len(Snapshot._check_consistency(self.company)), 4)
+
+    @freeze_time('2020-03-20')
+    def test_balance_snapshot_cron_and_disable(self):
+        Snapshot = self.env['account.report.balance.snapshot']
+        self.company.account_report_use_balance_snapshot = True
+
+        with freeze_time('2020-04-02'):
+            Snapshot._cron_extend_balance_snapshots()
+        self.assertEqual(str(self.company.account_report_balance_snapshot_date), '2020-03-31')
+        self.assertFalse(Snapshot._check_consistency(self.company))
+        self.assertEqual(Snapshot.search_count([('company_id', '=', self.company.id), ('date', '=', '2020-03-01')]), 2)
+
+        self.company.account_report_use_balance_snapshot = False
+        self.assertFalse(self.company.account_report_balance_snapshot_date)
+        self.assertFalse(Snapshot.search_count([('company_id', '=', self.company.id)]))
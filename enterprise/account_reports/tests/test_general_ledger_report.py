@@ -4,10 +4,18 @@ from .common import TestAccountReportsCommon
 import odoo.tests
 
 from odoo import fields, Command
-from odoo.tests import tagged
+from odoo.exceptions import AccessError
+from odoo.tests import tagged, new_test_user
 from freezegun import freeze_time
 
+import io
 import json
+import unittest
+
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
 
 @tagged('post_install', '-at_install')
 class TestGeneralLedgerReport(TestAccountReportsCommon, odoo.tests.HttpCase):
@@ -395,6 +403,19 @@ class TestGeneralLedgerReport(TestAccountReportsCommon, odoo.tests.HttpCase):
             options,
         )
 
+        # The pages following the first one are fetched from the cursor left in the progress, rather than from the offset.
+        self.assertTrue(load_more_1[2]['progress'].get('keyset'))
+        load_more_2_from_keyset = self.report.get_expanded_lines(
+            options,
+            report_lines[3]['id'],
+            load_more_1[2]['groupby'],
+            '_report_expand_unfoldable_line_general_ledger',
+            load_more_1[2]['progress'],
+            1,
+            None,
+        )
+        self.assertEqual([line['id'] for line in load_more_2_from_keyset], [line['id'] for line in load_more_2])
+
     def test_general_ledger_foreign_currency_account(self):
         ''' Ensure the total in foreign currency of an account is displayed only if all journal items are sharing the
         same currency.
@@ -684,3 +705,36 @@ class TestGeneralLedgerReport(TestAccountReportsCommon, odoo.tests.HttpCase):
             ],
             options
         )
+
+    def test_general_ledger_xlsx_background_export(self):
+        """ The streamed xlsx export, fetching the lines chunk by chunk, must produce the same sheets as the regular one. """
+        if load_workbook is None:
+            raise unittest.SkipTest("openpyxl not available")
+
+        def get_workbook_values(file_content):
+            workbook = load_workbook(filename=io.BytesIO(file_content), data_only=True)
+            return [list(sheet.values) for sheet in workbook.worksheets]
+
+        options = self._generate_options(self.report, fields.Date.from_string('2017-01-01'), fields.Date.from_string('2017-12-31'))
+
+        with io.BytesIO() as output:
+            self.report._export_to_xlsx_streamed(options, output)
+            streamed_values = get_workbook_values(output.getvalue())
+        regular_values = get_workbook_values(self.report.export_to_xlsx(options)['file_content'])
+        self.assertEqual(streamed_values, regular_values)
+
+        # Queue the export and let the cron generate it
+        self.report.action_export_xlsx_in_background(options)
+        export = self.env['account.report.xlsx.export'].search([('report_id', '=', self.report.id)])
+        export._cron_process_xlsx_exports()
+        self.assertRecordValues(export, [{'state': 'done', 'user_id': self.env.user.id}])
+        self.assertEqual(get_workbook_values(export.attachment_id.raw), regular_values)
+
+        # The export and its file are private to the user who requested it
+        other_user = new_test_user(
+            self.env, login='other_xlsx_export_user', groups='account.group_account_readonly',
+            company_id=self.env.company.id, company_ids=[Command.set(self.env.company.ids)],
+        )
+        self.assertFalse(self.env['account.report.xlsx.export'].with_user(other_user).search([]))
+        with self.assertRaises(AccessError):
+            export.attachment_id.with_user(other_user).read(['name'])
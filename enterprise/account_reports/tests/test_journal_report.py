@@ -1,9 +1,17 @@
 # pylint: disable=C0326
+import io
+import unittest
+
 from .common import TestAccountReportsCommon
 
 from odoo import Command, fields
 from odoo.tests import tagged
 
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
+
 
 @tagged('post_install', '-at_install')
 class TestJournalReport(TestAccountReportsCommon):
@@ -489,3 +497,22 @@ class TestJournalReport(TestAccountReportsCommon):
                 },
             ],
         )
+
+    def test_journal_report_xlsx_background_export(self):
+        """ The background export must go through the custom xlsx export of the journal report handler. """
+        if load_workbook is None:
+            raise unittest.SkipTest("openpyxl not available")
+
+        def get_workbook_values(file_content):
+            workbook = load_workbook(filename=io.BytesIO(file_content), data_only=True)
+            return [list(sheet.values) for sheet in workbook.worksheets]
+
+        options = self._generate_options(self.report, '2017-01-01', '2017-01-31')
+        handler_export = self.env[self.report.custom_handler_model_name].export_to_xlsx(options)
+
+        self.report.action_export_xlsx_in_background(options)
+        export = self.env['account.report.xlsx.export'].search([('report_id', '=', self.report.id)])
+        export._cron_process_xlsx_exports()
+        self.assertRecordValues(export, [{'state': 'done'}])
+        self.assertEqual(export.attachment_id.name, handler_export['file_name'])
+        self.assertEqual(get_workbook_values(export.attachment_id.raw), get_workbook_values(handler_export['file_content']))
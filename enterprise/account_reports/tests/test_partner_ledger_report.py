@@ -189,6 +189,19 @@ class TestPartnerLedgerReport(TestAccountReportsCommon):
             options,
         )
 
+        # The pages following the first one are fetched from the cursor left in the progress, rather than from the offset.
+        self.assertTrue(load_more_1[2]['progress'].get('keyset'))
+        load_more_2_from_keyset = self.report.get_expanded_lines(
+            options,
+            report_lines[0]['id'],
+            load_more_1[2]['groupby'],
+            '_report_expand_unfoldable_line_partner_ledger',
+            load_more_1[2]['progress'],
+            1,
+            None,
+        )
+        self.assertEqual([line['id'] for line in load_more_2_from_keyset], [line['id'] for line in load_more_2])
+
     def test_partner_ledger_filter_account_types(self):
         ''' Test building the report with a filter on account types.
         When filtering on receivable accounts (i.e. trade_receivable and/or non_trade_receivable), partner_b should disappear from the report.
@@ -1838,3 +1838,127 @@ class TestReportEngines(TestAccountReportsCommon):
             ],
             options,
         )
+
+    def test_column_groups_merged_computation(self):
+        """ The account_codes and domain engines compute all the column groups in a single query per batch; make sure it gives the same
+        results as computing each column group separately.
+        """
+        report = self._create_report(
+            [
+                self._prepare_test_report_line(
+                    self._prepare_test_expression_account_codes('1'),
+                    groupby='partner_id',
+                ),
+                self._prepare_test_report_line(
+                    self._prepare_test_expression_domain([('account_id.code', '=like', '1%')], 'sum_if_pos'),
+                ),
+                self._prepare_test_report_line(
+                    self._prepare_test_expression_domain([('account_id.code', '=like', '1%')], 'count_rows'),
+                    groupby='partner_id',
+                ),
+            ],
+            filter_period_comparison=True,
+        )
+
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(10.0, account_code='11', partner_id=self.partner_a.id, date='2020-01-10'),
+            self._prepare_test_account_move_line(-30.0, account_code='12', partner_id=self.partner_b.id, date='2020-02-10'),
+            self._prepare_test_account_move_line(50.0, account_code='11', date='2020-03-10'),
+            self._prepare_test_account_move_line(20.0, account_code='12', partner_id=self.partner_a.id, date='2020-03-20'),
+        ])
+
+        options = self._generate_options(report, '2020-03-01', '2020-03-31', default_options={'unfold_all': True})
+        options = self._update_comparison_filter(options, report, 'previous_period', 2)
+
+        original_compute_formula_batch = type(report)._compute_formula_batch
+        computed_engines = []
+
+        def compute_formula_batch(report, column_group_options, formula_engine, *args, **kwargs):
+            computed_engines.append(formula_engine)
+            return original_compute_formula_batch(report, column_group_options, formula_engine, *args, **kwargs)
+
+        with patch.object(type(report), '_compute_formula_batch', compute_formula_batch):
+            merged_lines = report._get_lines(options)
+        self.assertFalse({'account_codes', 'domain'} & set(computed_engines), "All column groups should have been computed at once")
+
+        expected_values = [
+            ('test_line_1',              70.0,       -30.0,     10.0),
+            ('partner_a',                20.0,         0.0,     10.0),
+            ('partner_b',                 0.0,       -30.0,      0.0),
+            ('Unknown',                  50.0,         0.0,      0.0),
+            ('test_line_2',              70.0,         0.0,     10.0),
+            ('test_line_3',                 1,           1,        1),
+            ('partner_a',                   1,           0,        1),
+            ('partner_b',                   0,           1,        0),
+            ('Unknown',                     1,           0,        0),
+        ]
+        self.assertLinesValues(merged_lines, [0, 1, 2, 3], expected_values, options)
+        self.assertLinesValues(report.with_context(account_report_no_column_groups_merge=True)._get_lines(options), [0, 1, 2, 3], expected_values, options)
+
+    def test_expression_totals_cache(self):
+        report = self._create_report(
+            [
+                self._prepare_test_report_line(
+                    self._prepare_test_expression_account_codes('1'),
+                    groupby='partner_id',
+                    foldable=True,
+                ),
+            ],
+        )
+
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(10.0, account_code='11', partner_id=self.partner_a.id, date='2020-01-10'),
+        ])
+        # Simulate the end of the transaction, recording the ledger changes
+        self.env.cr.flush()
+        self.env['account.report']._clear_expression_totals_cache()
+        Report = self.env['account.report']
+
+        options = self._generate_options(report, '2020-01-01', '2020-01-31', default_options={'unfold_all': True})
+        expected_values = [
+            ('test_line_1',         10.0),
+            ('partner_a',           10.0),
+        ]
+        self.assertLinesValues(report._get_lines(options), [0, 1], expected_values, options)
+        self.assertEqual(Report._get_expression_totals_cache_stats()['misses'], 2)  # The line and its groupby expansion
+
+        # Re-opening the report, or only changing the unfolded lines, hits the cache
+        self.assertLinesValues(report._get_lines(options), [0, 1], expected_values, options)
+        self.assertLinesValues(report._get_lines({**options, 'unfold_all': False, 'unfolded_lines': []}), [0], expected_values[:1], options)
+        self.assertEqual(Report._get_expression_totals_cache_stats()['hits'], 3)
+
+        # Changes of the ledger made in the current transaction bypass the cache...
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(20.0, account_code='12', partner_id=self.partner_b.id, date='2020-01-20'),
+        ])
+        expected_values = [
+            ('test_line_1',         30.0),
+            ('partner_a',           10.0),
+            ('partner_b',           20.0),
+        ]
+        self.assertLinesValues(report._get_lines(options), [0, 1], expected_values, options)
+        cache_stats = Report._get_expression_totals_cache_stats()
+        self.assertEqual((cache_stats['hits'], cache_stats['misses']), (3, 2))
+
+        # ... and invalidate it once recorded
+        self.env.cr.flush()
+        self.assertLinesValues(report._get_lines(options), [0, 1], expected_values, options)
+        self.assertEqual(Report._get_expression_totals_cache_stats()['misses'], 4)
+
+        # Reports including the draft entries are never cached
+        draft_options = {**options, 'all_entries': True}
+        self.assertLinesValues(report._get_lines(draft_options), [0, 1], expected_values, draft_options)
+        self.assertLinesValues(report._get_lines(draft_options), [0, 1], expected_values, draft_options)
+        cache_stats = Report._get_expression_totals_cache_stats()
+        self.assertEqual((cache_stats['hits'], cache_stats['misses']), (3, 4))
+
+        # The context flags changing the computation are part of the key
+        self.assertLinesValues(report.with_context(account_report_skip_balance_snapshot=True)._get_lines(options), [0, 1], expected_values, options)
+        self.assertEqual(Report._get_expression_totals_cache_stats()['misses'], 6)
+
+        # So are the journals, whose changes aren't tracked by the ledger versions
+        self.env['account.journal'].create({'name': "Other Operations", 'code': 'OTHER', 'type': 'general'})
+        self.env.cr.flush()
+        self.assertLinesValues(report._get_lines(options), [0, 1], expected_values, options)
+        cache_stats = Report._get_expression_totals_cache_stats()
+        self.assertEqual((cache_stats['hits'], cache_stats['misses']), (3, 8))
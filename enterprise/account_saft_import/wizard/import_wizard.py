@@ -2,12 +2,17 @@
 
 import base64
 import datetime
+import io
+import logging
+import time
 from collections import defaultdict
 from lxml import etree
 
-from odoo import Command, fields, models, _
+from odoo import Command, fields, models, modules, _
 from odoo.exceptions import RedirectWarning
 
+_logger = logging.getLogger(__name__)
+
 
 class SaftImportWizard(models.TransientModel):
     """ SAF-T import wizard is the main class to import SAF-T files.  """
@@ -360,19 +365,23 @@ class SaftImportWizard(models.TransientModel):
         """
         nsmap = self._get_cleaned_namespace(journal_tree)
         moves_to_create = {}
+        move_nodes = journal_tree.findall('saft:Transaction', namespaces=nsmap)
+        move_xml_ids = [
+            self._make_xml_id('move', f"{saft_journal_code}_{move_node.find('./saft:TransactionID', namespaces=nsmap).text}")
+            for move_node in move_nodes
+        ]
         already_imported_move_xmlids = self.env['ir.model.data'].sudo().search_fetch(
-            [('name', 'like', f'{self.company_id.id}_move_{saft_journal_code}_'), ('model', '=', 'account.move')],
+            [('model', '=', 'account.move'), ('name', 'in', [xml_id.split('.', 1)[1] for xml_id in move_xml_ids])],
             field_names=['module', 'name'],
         )
-        already_imported_move_xmlids = [f'{move_data.module}.{move_data.name}' for move_data in already_imported_move_xmlids]
+        already_imported_move_xmlids = {f'{move_data.module}.{move_data.name}' for move_data in already_imported_move_xmlids}
 
-        for move_node in journal_tree.findall('saft:Transaction', namespaces=nsmap):
+        for move_node, xml_id in zip(move_nodes, move_xml_ids):
             move_date = move_node.find('./saft:TransactionDate', namespaces=nsmap)
             move_name = move_node.find('./saft:TransactionID', namespaces=nsmap)
             move_customer = move_node.find('./saft:CustomerID', namespaces=nsmap)
             move_supplier = move_node.find('./saft:SupplierID', namespaces=nsmap)
             move_partner = move_customer.text if move_customer is not None else move_supplier.text if move_supplier is not None else None
-            xml_id = self._make_xml_id('move', f'{saft_journal_code}_{move_name.text}')
             if xml_id in already_imported_move_xmlids:
                 continue
             line_data = []
@@ -415,10 +424,42 @@ class SaftImportWizard(models.TransientModel):
             }
         return moves_to_create
 
-    def _get_data(self):
-        """ Returns the data that is stored inside the XML SAF-T attachment, for each model, to be loaded. """
-        import_data = base64.b64decode(self.attachment_id)
-        tree = etree.fromstring(import_data)
+    def _get_attachment_file(self):
+        """ Returns the SAF-T file opened in binary mode, read from the filestore so that it is not loaded in memory. """
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'attachment_id'),
+            ('res_id', '=', self.id),
+        ], limit=1)
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        return io.BytesIO(base64.b64decode(self.attachment_id))
+
+    def _parse_master_data(self, saft_file):
+        """ Parses the SAF-T file, dropping its transactions as soon as they are read, so that only the header and the
+        master data are kept in memory. The transactions are streamed afterwards by `_iter_move_data`.
+
+        :param saft_file: SAF-T file opened in binary mode
+        :returns: tree: tree of the xml file, without the transactions
+        :returns: currency_codes: codes of all the currencies used in the file
+        """
+        currency_codes = set()
+        for _event, element in etree.iterparse(saft_file, events=('end',), huge_tree=True):
+            local_name = etree.QName(element).localname
+            if local_name == 'CurrencyCode':
+                currency_codes.add(element.text)
+            elif local_name == 'Transaction':
+                element.getparent().remove(element)
+        # The last element parsed is the root of the file
+        return element, currency_codes
+
+    def _get_master_data(self, tree, currency_codes):
+        """ Returns the data of the accounts, taxes, partners, journals and of the opening balance move that is stored in
+        the SAF-T file, for each model, to be loaded, as well as the mappings needed to import its transactions.
+
+        :param tree: tree of the xml file, without the transactions
+        :param currency_codes: codes of all the currencies used in the file
+        """
         data = {}
         account_data, map_accounts = self._prepare_account_data(tree)
         data['account.account'] = account_data
@@ -429,36 +470,65 @@ class SaftImportWizard(models.TransientModel):
         partner_data, map_partners = self._prepare_partner_data(tree)
         data['res.partner'] = partner_data
 
-        data['account.journal'] = {}  # so journals are loaded before moves
-        if self.import_opening_balance:
-            data['account.move'] = self._prepare_opening_balance_move(tree, map_accounts)
-        else:
-            data['account.move'] = {}
-
         nsmap = self._get_cleaned_namespace(tree)
         default_currency_code = tree.find('.//saft:DefaultCurrencyCode', namespaces=nsmap)
         default_currency = self.env['res.currency'].with_context(active_test=False).search([('name', '=', default_currency_code.text)])
 
-        all_currency_codes = tree.findall('.//saft:CurrencyCode', namespaces=nsmap)
-        currency_codes_to_look_for = {currency_code_node.text for currency_code_node in all_currency_codes}
         currencies = self.env['res.currency'].with_context(active_test=False)._read_group(
-            domain=[('name', 'in', list(currency_codes_to_look_for))],
+            domain=[('name', 'in', list(currency_codes))],
             aggregates=['id:array_agg'],
             groupby=['name'],
         )
         map_currencies = {curr[0]: curr[1][0] for curr in currencies}
 
-        journal_data, moves_data = self._prepare_journal_data(tree, default_currency, map_accounts, map_taxes, map_currencies, map_partners)
-
+        # The tree has no transaction anymore: only the journals are prepared
+        journal_data, _moves_data = self._prepare_journal_data(tree, default_currency, map_accounts, map_taxes, map_currencies, map_partners)
         data['account.journal'] = journal_data
-        data['account.move'].update(moves_data)
 
-        return data
+        data['account.move'] = self._prepare_opening_balance_move(tree, map_accounts) if self.import_opening_balance else {}
+
+        return data, (default_currency, map_accounts, map_taxes, map_currencies, map_partners)
+
+    def _iter_move_data(self, saft_file, mappings, chunk_size):
+        """ Streams the transactions of the SAF-T file, and yields the values of the moves to create, by chunks of at most
+        `chunk_size` transactions of the same journal. The transactions are dropped once their chunk is prepared.
+
+        :param saft_file: SAF-T file opened in binary mode
+        :param mappings: mappings between saft and odoo ids returned by `_get_master_data`
+        :param chunk_size: number of transactions per chunk
+        :returns: generator of tuples (number of transactions of the chunk, values for the moves to create)
+        """
+        default_currency, map_accounts, map_taxes, map_currencies, map_partners = mappings
+        saft_journal_code = None
+        transactions = []
+        for _event, element in etree.iterparse(saft_file, events=('end',), huge_tree=True):
+            local_name = etree.QName(element).localname
+            if local_name == 'JournalID' and etree.QName(element.getparent()).localname == 'Journal':
+                saft_journal_code = element.text
+            elif local_name == 'Transaction':
+                transactions.append(element)
+            elif local_name == 'MasterFiles':
+                element.getparent().remove(element)
+
+            if transactions and (len(transactions) >= chunk_size or local_name == 'Journal'):
+                # The previous transactions of the journal were removed: it only contains the ones of the chunk
+                journal = next(transactions[0].iterancestors(f'{{{etree.QName(transactions[0]).namespace}}}Journal'))
+                journal_id = self._make_xml_id('journal', saft_journal_code)
+                yield len(transactions), self._prepare_move_data(journal, default_currency, saft_journal_code, journal_id, map_accounts, map_taxes, map_currencies, map_partners)
+                for transaction in transactions:
+                    transaction.getparent().remove(transaction)
+                transactions = []
+            if local_name == 'Journal':
+                element.getparent().remove(element)
 
     # -----------------------------------
     # Main method
     # -----------------------------------
 
+    def _load_saft_data(self, data):
+        # skip_invoice_sync to avoid creating twice the tax lines
+        return self.env['account.chart.template'].with_context(skip_invoice_sync=True)._load_data(data)
+
     def action_import(self):
         """ Start the import by gathering generators and templates and applying them to attached files. """
 
@@ -476,11 +546,36 @@ class SaftImportWizard(models.TransientModel):
         start_date = self.env['account.move'].search(domain, limit=1, order='date asc').date or fields.Date.today()
         self.env['ir.config_parameter'].sudo().set_param('sequence.mixin.constraint_start_date', start_date.strftime("%Y-%m-%d"))
 
-        data = self._get_data()
-
-        # skip_invoice_sync to avoid creating twice the tax lines
-        created_vals = self.env['account.chart.template'].with_context(skip_invoice_sync=True)._load_data(data)
+        # The master data is loaded first, then the moves by chunks, committing after each of them. An interrupted import
+        # can be restarted with the same file: the records already imported are matched and skipped.
+        auto_commit = not modules.module.current_test
+        chunk_size = int(self.env['ir.config_parameter'].sudo().get_param('account_saft_import.chunk_size', 1000))
+        with self._get_attachment_file() as saft_file:
+            tree, currency_codes = self._parse_master_data(saft_file)
+            data, mappings = self._get_master_data(tree, currency_codes)
+            del tree
+            created_vals = self._load_saft_data(data)
+            created_ids = {model: records.ids for model, records in created_vals.items()}
+            if auto_commit:
+                self.env.cr.commit()
+
+            start_time = time.monotonic()
+            transaction_count = 0
+            saft_file.seek(0)
+            for chunk_transaction_count, moves_data in self._iter_move_data(saft_file, mappings, chunk_size):
+                if moves_data:
+                    created_vals = self._load_saft_data({'account.move': moves_data})
+                    created_ids.setdefault('account.move', []).extend(created_vals['account.move'].ids)
+                if auto_commit:
+                    self.env.cr.commit()
+                self.env.invalidate_all()
+                transaction_count += chunk_transaction_count
+                _logger.info(
+                    "SAF-T import: %s transactions processed (%.1f transactions/s)",
+                    transaction_count, transaction_count / max(time.monotonic() - start_time, 1e-6),
+                )
 
+        created_vals = {model: self.env[model].browse(ids) for model, ids in created_ids.items()}
         import_summary = self.env['account.import.summary'].create({
             'import_summary_account_ids': created_vals.get("account.account"),
             'import_summary_journal_ids': created_vals.get("account.journal"),
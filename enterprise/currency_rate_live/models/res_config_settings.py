@@ -3,6 +3,10 @@
 import datetime
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
 from itertools import islice
 from urllib.parse import quote, urlencode
 
@@ -10,14 +14,16 @@ import requests
 from dateutil.relativedelta import relativedelta
 from lxml import etree
 from pytz import timezone
+from requests.adapters import HTTPAdapter
 
-from odoo import api, fields, models
+from odoo import api, fields, models, modules
 from odoo.addons.account.tools import LegacyHTTPAdapter
 from odoo.addons.iap.tools.iap_tools import iap_jsonrpc
 from odoo.tools.zeep import Client
 from odoo.tools.zeep.helpers import serialize_object
 from odoo.exceptions import UserError
-from odoo.tools import DEFAULT_SERVER_DATE_FORMAT
+from odoo.tools import DEFAULT_SERVER_DATE_FORMAT, SQL, split_every
+from odoo.tools.lru import LRU
 from odoo.tools.translate import _
 
 BANXICO_DATE_FORMAT = '%d/%m/%Y'
@@ -110,6 +116,27 @@ MAP_CURRENCIES = {
 }
 _logger = logging.getLogger(__name__)
 
+POOL_MAXSIZE = 8
+CURRENCY_RATES_CACHE = LRU(256)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(provider):
+    """Get the session shared by all the requests made to a provider, to reuse its connections.
+
+    No cookie is kept, so that nothing leaks between the databases served by the same process.
+    """
+    with _sessions_lock:
+        if provider not in _sessions:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            session.mount('http://', HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
+            session.mount('https://', HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
+            _sessions[provider] = session
+        return _sessions[provider]
+
 
 def xml2json_from_elementtree(el, preserve_whitespaces=False):
     """ xml2json-direct
@@ -223,10 +250,10 @@ class ResCompany(models.Model):
         '''
         active_currencies = self.env['res.currency'].search([])
         rslt = True
-        for (currency_provider, companies) in self._group_by_provider().items():
-            parse_function = getattr(companies, '_parse_' + currency_provider + '_data')
+        for currency_provider, (companies, parse_results) in self._fetch_currency_rates(active_currencies).items():
             try:
-                parse_results = parse_function(active_currencies)
+                if isinstance(parse_results, Exception):
+                    raise parse_results
                 companies._generate_currency_rates(parse_results)
             except Exception as error:
                 if self._context.get('suppress_errors'):
@@ -239,6 +266,96 @@ class ResCompany(models.Model):
                     raise UserError(_('Unable to connect to the online exchange rate platform %s. The web service may be temporarily down. Please try again in a moment.', currency_provider))
         return rslt
 
+    def backfill_currency_rates(self, date_from, date_to):
+        """ Insert the rates missing between two dates for the companies in self, using the historical rates of their
+        provider. The existing rates are left untouched, so that the backfill can be run again on overlapping periods.
+
+        The whole period is fetched at once from each provider, which must implement a _parse_xxx_history_data method
+        taking the available currencies and the two dates, and returning a dictionary mapping each date to the rates of
+        that day by currency code.
+
+        :return: the number of inserted rates.
+        """
+        # The rates are inserted in SQL, bypassing the access rights.
+        self.env['res.currency.rate'].check_access('create')
+        date_from, date_to = fields.Date.to_date(date_from), fields.Date.to_date(date_to)
+        providers = self._group_by_provider()
+        unsupported_providers = [provider for provider in providers if not hasattr(self, f'_parse_{provider}_history_data')]
+        if unsupported_providers:
+            raise UserError(_("The following exchange rate providers do not provide historical rates: %s", ", ".join(unsupported_providers)))
+
+        active_currencies = self.env['res.currency'].search([])
+        inserted_count = 0
+        for currency_provider, (companies, rates_by_date) in self._fetch_currency_rates(active_currencies, date_from, date_to).items():
+            if isinstance(rates_by_date, UserError):
+                raise rates_by_date
+            elif isinstance(rates_by_date, Exception):
+                raise UserError(_('Unable to connect to the online exchange rate platform %s. The web service may be temporarily down. Please try again in a moment.', currency_provider)) from rates_by_date
+            inserted_count += companies._insert_currency_rates(rates_by_date)
+        _logger.info("Inserted %s missing currency rates between %s and %s.", inserted_count, date_from, date_to)
+        return inserted_count
+
+    def _fetch_currency_rates(self, available_currencies, date_from=None, date_to=None):
+        """ Fetch the rates of the provider of each group of companies in self, either the latest ones or, if dates are
+        given, the historical ones between those dates.
+
+        Most of the time is spent waiting for the web services of the providers, which are thus queried concurrently,
+        `currency_rate_live.fetch_parallelism` at a time, each one from its own cursor. The latest rates are kept in cache
+        for `currency_rate_live.cache_timeout` seconds, so that the companies updated one after the other only query their
+        provider once.
+
+        :return: a dictionary mapping each provider to the tuple (companies, result), where result is the result of
+            the parse function of the provider, or the exception it raised.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        parallelism = int(ICP.get_param('currency_rate_live.fetch_parallelism', 4))
+        cache_timeout = int(ICP.get_param('currency_rate_live.cache_timeout', 900))
+        currency_names = frozenset(available_currencies.mapped('name'))
+        providers = self._group_by_provider()
+
+        def fetch(currency_provider, companies, env):
+            companies, currencies = companies.with_env(env), available_currencies.with_env(env)
+            if date_from:
+                return getattr(companies, f'_parse_{currency_provider}_history_data')(currencies, date_from, date_to)
+
+            cache_key = (env.cr.dbname, currency_provider, currency_names)
+            try:
+                cached_rates, cached_time = CURRENCY_RATES_CACHE[cache_key]
+            except KeyError:
+                cached_time = None
+            if cached_time is not None and time.monotonic() - cached_time < cache_timeout:
+                return cached_rates
+            rates = getattr(companies, f'_parse_{currency_provider}_data')(currencies)
+            if rates and cache_timeout > 0:
+                CURRENCY_RATES_CACHE[cache_key] = (rates, time.monotonic())
+            return rates
+
+        def fetch_in_thread(currency_provider, companies):
+            with self.env.registry.cursor() as cr:
+                return fetch(currency_provider, companies, self.env(cr=cr))
+
+        results = {}
+        # The test cursor can't be shared between threads: the providers are then queried one after the other.
+        if len(providers) < 2 or parallelism < 2 or modules.module.current_test:
+            for currency_provider, companies in providers.items():
+                try:
+                    results[currency_provider] = (companies, fetch(currency_provider, companies, self.env))
+                except Exception as error:  # noqa: BLE001
+                    results[currency_provider] = (companies, error)
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(parallelism, len(providers))) as executor:
+            futures = {
+                currency_provider: executor.submit(fetch_in_thread, currency_provider, companies)
+                for currency_provider, companies in providers.items()
+            }
+        for currency_provider, future in futures.items():
+            try:
+                results[currency_provider] = (providers[currency_provider], future.result())
+            except Exception as error:  # noqa: BLE001
+                results[currency_provider] = (providers[currency_provider], error)
+        return results
+
     def _group_by_provider(self):
         """ Returns a dictionnary grouping the companies in self by currency
         rate provider. Companies with no provider defined will be ignored."""
@@ -289,6 +406,60 @@ class ResCompany(models.Model):
                     else:
                         CurrencyRate.create({'currency_id': currency_object.id, 'rate': rate_value, 'name': date_rate, 'company_id': company.id})
 
+    def _insert_currency_rates(self, rates_by_date):
+        """ Insert the rates of each of the companies in self that do not exist yet, based on their main currency
+        like in _generate_currency_rates.
+
+        The rates are inserted directly in the database by batches of 10000, a backfill over several years amounting to
+        hundreds of thousands of rates.
+
+        :param rates_by_date: a dictionary mapping dates to dictionaries of rates by currency code, all based on the
+            same currency for a given date.
+        :return: the number of inserted rates.
+        """
+        currency_ids_by_name = {
+            currency.name: currency.id
+            for currency in self.env['res.currency'].search_fetch(
+                [('name', 'in', list({name for rates in rates_by_date.values() for name in rates}))],
+                ['name'],
+            )
+        }
+
+        rows = []
+        for company in self:
+            for date_rate, rates in rates_by_date.items():
+                base_currency_rate = rates.get(company.currency_id.name)
+                if not base_currency_rate:
+                    continue
+                for currency_name, rate in rates.items():
+                    if currency_id := currency_ids_by_name.get(currency_name):
+                        rows.append((date_rate, rate / base_currency_rate, currency_id, company.id))
+
+        CurrencyRate = self.env['res.currency.rate']
+        CurrencyRate.flush_model()
+        inserted_count = 0
+        for rows_batch in split_every(10000, rows):
+            dates, rates, currency_ids, company_ids = (list(column) for column in zip(*rows_batch))
+            inserted_count += len(self.env.execute_query(SQL(
+                """
+                INSERT INTO res_currency_rate (name, rate, currency_id, company_id, create_uid, create_date, write_uid, write_date)
+                     SELECT rate.name, rate.rate, rate.currency_id, rate.company_id, %(uid)s, %(now)s, %(uid)s, %(now)s
+                       FROM unnest(%(dates)s::date[], %(rates)s::numeric[], %(currency_ids)s::int[], %(company_ids)s::int[])
+                         AS rate(name, rate, currency_id, company_id)
+                ON CONFLICT DO NOTHING
+                  RETURNING id
+                """,
+                uid=self.env.uid,
+                now=self.env.cr.now(),
+                dates=dates,
+                rates=rates,
+                currency_ids=currency_ids,
+                company_ids=company_ids,
+            )))
+        CurrencyRate.invalidate_model()
+        self.env['res.currency'].invalidate_model()
+        return inserted_count
+
     @api.model
     def _parse_bsi_data(self, available_currencies):
         """
@@ -303,7 +474,7 @@ class ResCompany(models.Model):
         rates = {}
 
         # Using a session since we're doing requests from multiple endpoints.
-        session = requests.Session()
+        session = _get_session('bsi')
         for endpoint in endpoints:
             try:
                 response = session.get(f"{bsi_url}{endpoint}", timeout=30)
@@ -333,7 +504,7 @@ class ResCompany(models.Model):
         ''' Parses the data returned in xml by FTA servers and returns it in a more
         Python-usable form.'''
         request_url = 'https://www.backend-rates.bazg.admin.ch/api/xmldaily?d=yesterday&locale=en'
-        response = requests.get(request_url, timeout=30)
+        response = _get_session('fta').get(request_url, timeout=30)
         response.raise_for_status()
 
         rates_dict = {}
@@ -372,7 +543,7 @@ class ResCompany(models.Model):
             Rates are given against EURO
         '''
         request_url = "http://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"
-        response = requests.get(request_url, timeout=30)
+        response = _get_session('ecb').get(request_url, timeout=30)
         response.raise_for_status()
 
         xmlstr = etree.fromstring(response.content)
@@ -387,6 +558,34 @@ class ResCompany(models.Model):
 
         return rslt
 
+    def _parse_ecb_history_data(self, available_currencies, date_from, date_to):
+        ''' This method is used to backfill the currencies by using ECB service provider.
+            Rates are given against EURO, and published for the last 90 days in a light file, and since 1999 in a much
+            bigger one.
+        '''
+        if date_from >= fields.Date.today() - relativedelta(days=85):
+            request_url = "http://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist-90d.xml"
+        else:
+            request_url = "http://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist.xml"
+        response = _get_session('ecb').get(request_url, timeout=60)
+        response.raise_for_status()
+
+        available_currency_names = available_currencies.mapped('name')
+        rslt = {}
+        for day_node in etree.fromstring(response.content).xpath("//*[local-name() = 'Cube'][@time]"):
+            date_rate = fields.Date.to_date(day_node.get('time'))
+            if not date_from <= date_rate <= date_to:
+                continue
+            rslt[date_rate] = {
+                node.get('currency'): float(node.get('rate'))
+                for node in day_node
+                if node.get('currency') in available_currency_names
+            }
+            if 'EUR' in available_currency_names:
+                rslt[date_rate]['EUR'] = 1.0
+
+        return rslt
+
     def _parse_cbuae_data(self, available_currencies):
         ''' This method is used to update the currencies by using UAE Central Bank service provider.
             Exchange rates are expressed as 1 unit of the foreign currency converted into AED
@@ -396,7 +595,7 @@ class ResCompany(models.Model):
             'Referer': 'https://www.centralbank.ae/en/forex-eibor/exchange-rates/'
         }
 
-        response = requests.get(CBUAE_URL, headers=headers, timeout=30)
+        response = _get_session('cbuae').get(CBUAE_URL, headers=headers, timeout=30)
         response.raise_for_status()
 
         htmlelem = etree.fromstring(response.content, etree.HTMLParser(encoding='utf-8'))
@@ -425,7 +624,7 @@ class ResCompany(models.Model):
         headers = {
             'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/101.0.4951.41 Safari/537.36',
         }
-        fetched_data = requests.get(CBEGY_URL, headers=headers, timeout=30)
+        fetched_data = _get_session('cbegy').get(CBEGY_URL, headers=headers, timeout=30)
         fetched_data.raise_for_status()
 
         htmlelem = etree.fromstring(fetched_data.content, etree.HTMLParser())
@@ -466,7 +665,7 @@ class ResCompany(models.Model):
                 </soap12:Body>
             </soap12:Envelope>
         """
-        res = requests.post(
+        res = _get_session('banguat').post(
             'https://www.banguat.gob.gt/variables/ws/TipoCambio.asmx',
             data=body,
             headers=headers,
@@ -496,7 +695,7 @@ class ResCompany(models.Model):
         formatted_date = first_of_month.strftime("%Y-%m")
 
         request_url = f"https://www.trade-tariff.service.gov.uk/api/v2/exchange_rates/files/monthly_xml_{formatted_date}.xml"
-        response = requests.get(request_url, timeout=10)
+        response = _get_session('hmrc').get(request_url, timeout=10)
         response.raise_for_status()
 
         xml_tree = etree.fromstring(response.content)
@@ -544,7 +743,7 @@ class ResCompany(models.Model):
             return bid_rate
 
         # Using a session since we're doing multiple requests.
-        session = requests.Session()
+        session = _get_session('bbr')
         # Get the currencies from the bank.
         request_url = "https://olinda.bcb.gov.br/olinda/service/PTAX/version/v1/odata/Currencies?$top=100&$format=json"
         response = session.get(request_url, timeout=10)
@@ -555,25 +754,28 @@ class ResCompany(models.Model):
         available_currency_names = available_currencies.mapped('name')
         currencies = [val['simbolo'] for val in data['value'] if val['simbolo'] in available_currency_names]
 
-        date_rate = datetime.datetime.now(timezone('America/Sao_Paulo'))
+        today = datetime.datetime.now(timezone('America/Sao_Paulo'))
 
-        # For every available currency in the returned currencies, if it's in the
-        # available currencies, get its exchange rate.
-        rslt = {}
-        for currency in currencies:
+        def _get_last_currency_exchange_rate(currency):
             # As there are days where there are no currency changes, we start by calling
             # the api with the current day, and keep decrementing the date by one day until
             # we reach a day with currency changes.
+            date_rate = today
             rate = None
             while not rate:
                 rate = _get_currency_exchange_rate(session, currency, date_rate.strftime("%m-%d-%Y"))
                 if not rate:
                     date_rate = date_rate - datetime.timedelta(days=1)
+            return 1.0/rate, date_rate
 
-            rslt[currency] = (1.0/rate, date_rate)
+        # For every available currency in the returned currencies, if it's in the
+        # available currencies, get its exchange rate. The bank is queried once per
+        # currency and day: the currencies are fetched concurrently.
+        with ThreadPoolExecutor(max_workers=max(1, min(POOL_MAXSIZE, len(currencies)))) as executor:
+            rslt = dict(zip(currencies, executor.map(_get_last_currency_exchange_rate, currencies)))
 
         if 'BRL' in available_currency_names:
-            rslt['BRL'] = (1.0, date_rate)
+            rslt['BRL'] = (1.0, min((date_rate for dummy, date_rate in rslt.values()), default=today))
 
         return rslt
 
@@ -586,7 +788,7 @@ class ResCompany(models.Model):
         available_currency_names = available_currencies.mapped('name')
 
         request_url = "http://www.bankofcanada.ca/valet/observations/group/FX_RATES_DAILY/json"
-        response = requests.get(request_url, timeout=30)
+        response = _get_session('boc').get(request_url, timeout=30)
         response.raise_for_status()
         if not 'application/json' in response.headers.get('Content-Type', ''):
             raise ValueError('Should be json')
@@ -630,7 +832,7 @@ class ResCompany(models.Model):
                 'params': {'provider': 'banxico'},
             }
             # Send request to Odoo proxy
-            response = requests.get(
+            response = _get_session('banxico').get(
                 f'{PROXY_URL}/api/currency_rate/1/get_currency_rates',
                 json=payload,
                 headers={'content-type': 'application/json'},
@@ -721,7 +923,7 @@ class ResCompany(models.Model):
         BNR service provider. Rates are given against RON
         '''
         request_url = "https://www.bnr.ro/nbrfxrates.xml"
-        response = requests.get(request_url, timeout=30)
+        response = _get_session('bnr').get(request_url, timeout=30)
         response.raise_for_status()
 
         xmlstr = etree.fromstring(response.content)
@@ -751,7 +953,7 @@ class ResCompany(models.Model):
         Svenska Riksbanken (SRB) service provider. Rates are given
         against SEK.
         """
-        response = requests.get("https://api.riksbank.se/swea/v1/Observations/Latest/ByGroup/130", timeout=30)
+        response = _get_session('srb').get("https://api.riksbank.se/swea/v1/Observations/Latest/ByGroup/130", timeout=30)
         response.raise_for_status()
 
         # Verify that the response is in JSON format.
@@ -794,7 +996,7 @@ class ResCompany(models.Model):
         result['PEN'] = (1.0, fields.Date.context_today(self.with_context(tz='America/Lima')))
         url_format = "https://www.sunat.gob.pe/a/txt/tipoCambio.txt"
         try:
-            res = requests.get(url_format, timeout=10)
+            res = _get_session('bcrp').get(url_format, timeout=10)
             res.raise_for_status()
             line = res.text.splitlines()[0] or ""
         except Exception as e:
@@ -847,7 +1049,7 @@ class ResCompany(models.Model):
                 logger.debug('Index %s not in available currency name', index)
                 continue
             url = server_url + '/%s/%s' % (currency, request_date)
-            res = requests.get(url, timeout=30)
+            res = _get_session('mindicador').get(url, timeout=30)
             res.raise_for_status()
             if 'html' in res.text:
                 raise ValueError('Should be json')
@@ -968,7 +1170,7 @@ class ResCompany(models.Model):
             if not requested_currency_codes:
                 break
 
-            response = requests.get(request_url.format(table_type), timeout=10)
+            response = _get_session('nbp').get(request_url.format(table_type), timeout=10)
             response.raise_for_status()
             response_data = response.json()
             for exchange_table in response_data:
@@ -1000,7 +1202,7 @@ class ResCompany(models.Model):
             Rates are given against Czech Koruna
         '''
         request_url = "https://www.cnb.cz/cs/financni-trhy/devizovy-trh/kurzy-devizoveho-trhu/kurzy-devizoveho-trhu/denni_kurz.txt"
-        response = requests.get(request_url, timeout=3)
+        response = _get_session('cnb').get(request_url, timeout=3)
         response.raise_for_status()
         response = str(response.content, 'UTF-8')
 
@@ -1104,7 +1306,7 @@ class ResCompany(models.Model):
         request_url = "https://www.bnb.bg/Statistics/StExternalSector/StExchangeRates/StERForeignCurrencies/index.htm?download=xml&search=&lang=EN"
 
         try:
-            response = requests.get(request_url, timeout=10)
+            response = _get_session('bnb').get(request_url, timeout=10)
             response.raise_for_status()
             rowset = etree.fromstring(response.content)
         except (requests.RequestException, etree.ParseError):
@@ -1139,7 +1341,7 @@ class ResCompany(models.Model):
                     'provider': 'Bank of Thailand',
                 },
             }
-            response = requests.post(
+            response = _get_session('bot').post(
                 f'{PROXY_URL}/api/currency_rate/1/get_currency_rates',
                 json=payload,
                 timeout=30,
@@ -1175,7 +1377,7 @@ class ResCompany(models.Model):
         result = {}
 
         try:
-            response = requests.get(url, headers={"Accept": "application/json"}, timeout=10)
+            response = _get_session('boi').get(url, headers={"Accept": "application/json"}, timeout=10)
             response.raise_for_status()
         except Exception as e:  # noqa: BLE001
             _logger.error(e)
@@ -1208,7 +1410,7 @@ class ResCompany(models.Model):
             'accept': 'application/vnd.BNM.API.v1+json',
         }
 
-        response = requests.get(request_url, headers=request_headers, timeout=10)
+        response = _get_session('bnm').get(request_url, headers=request_headers, timeout=10)
         response.raise_for_status()
         result = response.json()
 
@@ -1247,7 +1449,7 @@ class ResCompany(models.Model):
         }
 
         def _fetched_bi_currency_tables(start_date):
-            response = requests.get(request_url, headers=headers, params={
+            response = _get_session('bi').get(request_url, headers=headers, params={
                 'startdate': start_date,
             }, timeout=10)
             response.raise_for_status()
@@ -1,4 +1,12 @@
-from odoo.tests.common import TransactionCase, tagged
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import requests
+
+from odoo.addons.currency_rate_live.models.res_config_settings import CURRENCY_RATES_CACHE
+from odoo.exceptions import AccessError, UserError
+from odoo.tests.common import TransactionCase, new_test_user, tagged
+from odoo.tools import file_open
 
 
 @tagged('-standard', 'external')
@@ -225,3 +233,116 @@ class CurrencyTestCase(TransactionCase):
         self.assertEqual(len(eur.rate_ids), eur_rates_count + 1)
         self.assertEqual(eur.rate_ids[-1].rate, 1.0)
         self.assertEqual(len(usd.rate_ids), usd_rates_count + 1)
+
+
+@tagged('post_install', '-at_install')
+class TestCurrencyRateRecordedResponses(TransactionCase):
+    """ Replay recorded responses of the providers instead of querying them. """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.currency_usd = cls.env.ref('base.USD')
+        cls.currency_eur = cls.env.ref('base.EUR')
+        cls.currency_gbp = cls.env.ref('base.GBP')
+        (cls.currency_usd + cls.currency_eur + cls.currency_gbp).active = True
+        cls.test_company = cls.env['res.company'].create({
+            'name': 'Test Company',
+            'currency_id': cls.currency_usd.id,
+            'currency_provider': 'ecb',
+        })
+
+    def setUp(self):
+        super().setUp()
+        CURRENCY_RATES_CACHE.clear()
+        self.addCleanup(CURRENCY_RATES_CACHE.clear)
+
+    @contextmanager
+    def _replay_responses(self):
+        recorded_responses = {
+            'eurofxref-daily.xml': 'currency_rate_live/tests/data/ecb_daily.xml',
+            'eurofxref-hist': 'currency_rate_live/tests/data/ecb_hist.xml',
+        }
+        requested_urls = []
+
+        def _mock_request(session, method, url, *args, **kwargs):
+            requested_urls.append(url)
+            for endpoint, file_path in recorded_responses.items():
+                if endpoint in url:
+                    response = requests.Response()
+                    with file_open(file_path, 'rb') as recorded_file:
+                        response._content = recorded_file.read()
+                    response.status_code = 200
+                    return response
+            raise Exception('unhandled request url %s' % url)
+
+        with patch.object(requests.Session, 'request', _mock_request):
+            yield requested_urls
+
+    def _get_company_rates(self, company):
+        return {
+            (rate.currency_id.name, rate.name.isoformat()): rate.rate
+            for rate in self.env['res.currency.rate'].search([
+                ('company_id', '=', company.id),
+                ('currency_id', 'in', (self.currency_usd + self.currency_eur + self.currency_gbp).ids),
+            ])
+        }
+
+    def test_update_currency_rates(self):
+        other_company = self.env['res.company'].create({
+            'name': 'Other Company',
+            'currency_id': self.currency_eur.id,
+            'currency_provider': 'ecb',
+        })
+        with self._replay_responses() as requested_urls:
+            self.assertTrue(self.test_company.update_currency_rates())
+            self.assertTrue(other_company.update_currency_rates())
+
+        # The rates of the provider are kept in cache for the second company.
+        self.assertEqual(len(requested_urls), 1)
+        self.assertEqual(self._get_company_rates(self.test_company), {
+            ('USD', '2024-05-10'): 1.0,
+            ('EUR', '2024-05-10'): 1 / 1.0773,
+            ('GBP', '2024-05-10'): 0.86075 / 1.0773,
+        })
+        self.assertEqual(self._get_company_rates(other_company), {
+            ('USD', '2024-05-10'): 1.0773,
+            ('EUR', '2024-05-10'): 1.0,
+            ('GBP', '2024-05-10'): 0.86075,
+        })
+
+    def test_backfill_currency_rates(self):
+        self.env['res.currency.rate'].create({
+            'name': '2024-05-09',
+            'rate': 1.5,
+            'currency_id': self.currency_eur.id,
+            'company_id': self.test_company.id,
+        })
+
+        with self._replay_responses() as requested_urls:
+            self.assertEqual(self.test_company.backfill_currency_rates('2024-05-08', '2024-05-09'), 5)
+            self.assertEqual(self.test_company.backfill_currency_rates('2024-05-08', '2024-05-10'), 3)
+        self.assertEqual(len(requested_urls), 2)
+
+        self.assertEqual(self._get_company_rates(self.test_company), {
+            ('USD', '2024-05-08'): 1.0,
+            ('EUR', '2024-05-08'): 1 / 1.0747,
+            ('GBP', '2024-05-08'): 0.86023 / 1.0747,
+            ('USD', '2024-05-09'): 1.0,
+            ('EUR', '2024-05-09'): 1.5,
+            ('GBP', '2024-05-09'): 0.8603 / 1.0745,
+            ('USD', '2024-05-10'): 1.0,
+            ('EUR', '2024-05-10'): 1 / 1.0773,
+            ('GBP', '2024-05-10'): 0.86075 / 1.0773,
+        })
+        self.assertEqual(self.currency_eur._get_rates(self.test_company, '2024-05-08')[self.currency_eur.id], 1 / 1.0747)
+
+    def test_backfill_currency_rates_unsupported_provider(self):
+        self.test_company.currency_provider = 'boc'
+        with self.assertRaisesRegex(UserError, 'do not provide historical rates: boc'):
+            self.test_company.backfill_currency_rates('2024-05-08', '2024-05-10')
+
+    def test_backfill_currency_rates_access(self):
+        user = new_test_user(self.env, login='backfill_user', groups='base.group_user')
+        with self.assertRaises(AccessError):
+            self.test_company.with_user(user).backfill_currency_rates('2024-05-08', '2024-05-10')
@@ -2,12 +2,16 @@
 
 import base64
 import contextlib
+import functools
 import io
 import logging
 import re
+import subprocess
+import time
 import uuid
 from ast import literal_eval
 from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from dateutil.relativedelta import relativedelta
@@ -16,23 +20,57 @@ from urllib.parse import quote
 from werkzeug.urls import url_encode
 
 import odoo
-from odoo import _, api, Command, fields, models
+from odoo import _, api, Command, fields, models, modules, tools
 from odoo.exceptions import AccessError, UserError, ValidationError
 from odoo.osv import expression
 from odoo.tools import groupby, image_process, SQL, create_index
 from odoo.tools.mimetypes import get_extension
-from odoo.tools.misc import clean_context
+from odoo.tools.misc import clean_context, find_in_path
 from odoo.tools.pdf import PdfFileReader
 from odoo.addons.mail.tools import link_preview
 
 _logger = logging.getLogger(__name__)
 
 
+PDF_RASTERIZE_TIMEOUT = 30
+
+
 def _sanitize_file_extension(extension):
     """ Remove leading and trailing spacing + Remove leading "." """
     return re.sub(r'^[\s.]+|\s+$', '', extension)
 
 
+@functools.cache
+def _get_pdftoppm_path():
+    try:
+        return find_in_path('pdftoppm')
+    except OSError:
+        _logger.info("pdftoppm not found, the thumbnails of the PDFs will be generated by the browsers.")
+        return False
+
+
+def _generate_thumbnail(mimetype, raw):
+    """ Return the base64 encoded thumbnail of an image or of the first page of a PDF, or False if it could not be
+    generated. It does not use the environment, to be called from a pool of threads. Any error is caught, as the
+    decoders can raise about anything on a broken file, which must not fail the other thumbnails of the batch.
+    """
+    if not raw:
+        return False
+    try:
+        if mimetype.startswith('application/pdf'):
+            raw = subprocess.run(
+                [_get_pdftoppm_path(), '-png', '-f', '1', '-l', '1', '-singlefile', '-scale-to', '400', '-', '-'],
+                input=raw, capture_output=True, check=True, timeout=PDF_RASTERIZE_TIMEOUT,
+            ).stdout
+        return base64.b64encode(image_process(raw, size=(200, 140), crop='center'))
+    except (UserError, TypeError, ValueError, OSError, subprocess.SubprocessError):
+        _logger.info("Thumbnail generation failed for a %s file.", mimetype, exc_info=True)
+        return False
+    except Exception:  # noqa: BLE001
+        _logger.warning("Thumbnail generation failed unexpectedly for a %s file.", mimetype, exc_info=True)
+        return False
+
+
 class Document(models.Model):
     _name = 'documents.document'
     _description = 'Document'
@@ -77,6 +115,7 @@ class Document(models.Model):
             ('present', 'Present'),  # Document has a thumbnail
             ('error', 'Error'),  # Error when generating the thumbnail
             ('client_generated', 'Client Generated'),  # The PDF thumbnail is generated by the user browser
+            ('to_generate', 'Pending'),  # The thumbnail is generated by the thumbnails cron
             ('restricted', 'Inaccessible'),  # Shortcut to no-permission source
         ], compute="_compute_thumbnail", store=True, readonly=False, recursive=True,
     )
@@ -329,24 +368,55 @@ class Document(models.Model):
                  'company_id', 'folder_id.access_ids', 'folder_id.access_internal', 'folder_id.access_via_link',
                  'folder_id.owner_id', 'folder_id.company_id')
     def _compute_user_permission(self):
-        for document in self:
-            if self.env.user.has_group('documents.group_documents_system'):
+        if self.env.user.has_group('documents.group_documents_system'):
+            for document in self:
                 document.user_permission = (
                     'edit' if not (company := document.company_id)
                     or company in self.env.companies or company not in self.env.user.company_ids
                     else 'none')
-                continue
-            document.user_permission = document._get_permission_without_token()
-            if document.user_permission == 'view' and document.access_via_link == 'edit':
+            return
+
+        documents = self.filtered('id')
+        for document in self - documents:
+            document._compute_user_permission_without_query()
+        if not documents:
+            return
+        # Resolve the permissions of the whole recordset at once with the domains of `_search_user_permission`.
+        # The links only give edit rights to the users with access to the document, be it directly or through its
+        # parent folder, hence only the documents with any access and those with edit access are searched.
+        Document = documents.with_context(active_test=False)
+        any_access_query = Document._search([('id', 'in', documents.ids), ('user_permission', '!=', 'none')])
+        edit_access_query = Document._search([('id', 'in', documents.ids), ('user_permission', '=', 'edit')])
+        table = SQL.identifier(self._table)
+        rows = self.env.execute_query(SQL(
+            "(%s) UNION ALL (%s)",
+            any_access_query.select(SQL("%s.id", table), SQL("FALSE")),
+            edit_access_query.select(SQL("%s.id", table), SQL("TRUE")),
+        ))
+        accessible_ids = {document_id for document_id, __ in rows}
+        editable_ids = {document_id for document_id, is_edit in rows if is_edit}
+        for document in documents:
+            if document.id not in accessible_ids:
+                document.user_permission = 'none'
+            elif document.id in editable_ids or document.access_via_link == 'edit':
                 document.user_permission = 'edit'
-            elif document.user_permission == 'none' and document.folder_id and document.access_via_link != 'none' \
-                    and not document.is_access_via_link_hidden \
-                    and (document.company_id in self.env.companies or document.company_id not in self.env.user.company_ids):
-                # If the user can access the parent, they have the link.
-                # This only works one level up, as it mimics accessing through the interface.
-                with contextlib.suppress(AccessError):
-                    if document.folder_id._get_permission_without_token() != 'none':
-                        document.user_permission = document.access_via_link
+            else:
+                document.user_permission = 'view'
+
+    def _compute_user_permission_without_query(self):
+        """ Compute the permission of a document not saved yet, by walking its access and its parent folder. """
+        self.ensure_one()
+        self.user_permission = self._get_permission_without_token()
+        if self.user_permission == 'view' and self.access_via_link == 'edit':
+            self.user_permission = 'edit'
+        elif self.user_permission == 'none' and self.folder_id and self.access_via_link != 'none' \
+                and not self.is_access_via_link_hidden \
+                and (self.company_id in self.env.companies or self.company_id not in self.env.user.company_ids):
+            # If the user can access the parent, they have the link.
+            # This only works one level up, as it mimics accessing through the interface.
+            with contextlib.suppress(AccessError):
+                if self.folder_id._get_permission_without_token() != 'none':
+                    self.user_permission = self.access_via_link
 
     def _get_permission_without_token(self):
         self.ensure_one()
@@ -506,6 +576,7 @@ class Document(models.Model):
     @api.depends('checksum', 'shortcut_document_id.thumbnail', 'shortcut_document_id.thumbnail_status',
                  'shortcut_document_id.user_permission')
     def _compute_thumbnail(self):
+        to_generate = False
         for document in self:
             if document.shortcut_document_id:
                 if document.shortcut_document_id.user_permission != 'none':
@@ -514,20 +585,96 @@ class Document(models.Model):
                 else:
                     document.thumbnail = False
                     document.thumbnail_status = 'restricted'
+            elif document.mimetype and (document.mimetype.startswith('image/') or (
+                    document.mimetype.startswith('application/pdf') and _get_pdftoppm_path())):
+                # Generated in the background by `_cron_generate_thumbnails`, not to slow down the uploads.
+                document.thumbnail = False
+                document.thumbnail_status = 'to_generate'
+                to_generate = True
             elif document.mimetype and document.mimetype.startswith('application/pdf'):
                 # Thumbnails of pdfs are generated by the client. To force the generation, we invalidate the thumbnail.
                 document.thumbnail = False
                 document.thumbnail_status = 'client_generated'
-            elif document.mimetype and document.mimetype.startswith('image/'):
-                try:
-                    document.thumbnail = base64.b64encode(image_process(document.raw, size=(200, 140), crop='center'))
-                    document.thumbnail_status = 'present'
-                except (UserError, TypeError):
-                    document.thumbnail = False
-                    document.thumbnail_status = 'error'
             else:
                 document.thumbnail = False
                 document.thumbnail_status = False
+        if to_generate and (cron := self.env.ref('documents.ir_cron_generate_thumbnails', raise_if_not_found=False)):
+            cron._trigger()
+
+    @api.model
+    def _cron_generate_thumbnails(self, batch_size=50, time_budget=None):
+        """ Generate the pending thumbnails by batches, committing after each batch, until they are all generated or
+        the time budget is exceeded, in which case the cron is retriggered.
+
+        :param batch_size: number of documents processed between two commits.
+        :param time_budget: number of seconds after which no new batch is started. Defaults to the time limit of the crons.
+        """
+        auto_commit = not modules.module.current_test
+        if time_budget is None:
+            # 'limit_time_real_cron' defaults to -1.
+            cron_limit_time = tools.config['limit_time_real_cron'] or -1
+            time_budget = (cron_limit_time if cron_limit_time > 0 else 180) * 0.8
+        worker_count = int(self.env['ir.config_parameter'].sudo().get_param('documents.thumbnail_worker_count', 4))
+        start_time = time.monotonic()
+        Document = self.with_context(active_test=False)
+        # The shortcuts follow the thumbnail of their source document.
+        domain = [('thumbnail_status', '=', 'to_generate'), ('shortcut_document_id', '=', False)]
+
+        with ThreadPoolExecutor(max_workers=max(worker_count, 1)) as executor:
+            while documents := Document.search(domain, limit=batch_size):
+                documents._generate_thumbnails(executor)
+                if auto_commit:
+                    self.env.cr.commit()
+                self.env.invalidate_all()
+
+                if time.monotonic() - start_time > time_budget:
+                    if Document.search_count(domain, limit=1):
+                        self.env.ref('documents.ir_cron_generate_thumbnails')._trigger()
+                    return
+
+    def _generate_thumbnails(self, executor):
+        """ Generate the thumbnails of the documents, once per file content: the documents sharing the checksum of a
+        document that already has a thumbnail reuse it, and the other ones are generated in the pool of threads.
+        """
+        documents_by_checksum = self.grouped(lambda document: document.checksum or document.id)
+        thumbnails = {}
+        if checksums := [checksum for checksum in documents_by_checksum if isinstance(checksum, str)]:
+            for document in self.with_context(active_test=False).search_fetch([
+                ('checksum', 'in', checksums),
+                ('thumbnail_status', '=', 'present'),
+                ('shortcut_document_id', '=', False),
+            ], ['thumbnail']):
+                thumbnails.setdefault(document.checksum, document.thumbnail)
+
+        futures = {
+            checksum: executor.submit(_generate_thumbnail, documents[0].mimetype or '', documents[0].raw)
+            for checksum, documents in documents_by_checksum.items()
+            if checksum not in thumbnails
+        }
+        for checksum, future in futures.items():
+            try:
+                thumbnails[checksum] = future.result()
+            except Exception:  # noqa: BLE001
+                _logger.exception("Thumbnail generation of documents %s failed.", documents_by_checksum[checksum].ids)
+                thumbnails[checksum] = False
+
+        # The failure of a document must not leave the others of the batch to generate, or they would stall the queue.
+        for checksum, documents in documents_by_checksum.items():
+            try:
+                with self.env.cr.savepoint():
+                    documents._write_thumbnail(thumbnails[checksum])
+            except Exception:  # noqa: BLE001
+                _logger.exception("Saving the thumbnail of documents %s failed.", documents.ids)
+                documents.write({'thumbnail': False, 'thumbnail_status': 'error'})
+
+    def _write_thumbnail(self, thumbnail):
+        if thumbnail:
+            self.write({'thumbnail': thumbnail, 'thumbnail_status': 'present'})
+            return
+        pdf_documents = self.filtered(lambda document: (document.mimetype or '').startswith('application/pdf'))
+        # The browsers can still render the PDFs that could not be rasterized.
+        pdf_documents.write({'thumbnail': False, 'thumbnail_status': 'client_generated'})
+        (self - pdf_documents).write({'thumbnail': False, 'thumbnail_status': 'error'})
 
     @api.depends('type')
     def _compute_deletion_delay(self):
@@ -485,6 +485,7 @@ class TestDocumentsControllers(HttpCaseWithUserDemo):
         self.assertIn("This document has been requested.", res.text)
 
     def test_doc_ctrl_thumbnail(self):
+        self.env['documents.document']._cron_generate_thumbnails()
         placeholder = self.env['ir.binary']._placeholder(
             self.internal_file._get_placeholder_filename('thumbnail'))
 
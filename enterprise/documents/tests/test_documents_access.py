@@ -1357,3 +1357,40 @@ class TestDocumentsAccess(TransactionCaseDocuments):
 
         with self.assertRaises(UserError):
             self.env['documents.document'].with_user(self.internal_user).get_documents_actions(self.folder_b.id)
+
+    def test_user_permission_batch(self):
+        """Check that the permissions computed for a whole recordset match the ones computed document by document."""
+        folder_edit, folder_view, folder_none = self.env['documents.document'].create([
+            {'type': 'folder', 'name': f'folder {role}', 'owner_id': self.odoobot.id, 'access_internal': role}
+            for role in ('edit', 'view', 'none')
+        ])
+        folder_view.action_update_access_rights(partners={self.portal_user.partner_id.id: ('view', False)})
+        folder_none.action_update_access_rights(partners={self.portal_user.partner_id.id: ('edit', False)})
+        documents = folder_edit | folder_view | folder_none | self.folder_a | self.folder_b | self.document_txt
+        for folder in (folder_edit, folder_view, folder_none):
+            documents |= self.env['documents.document'].create([{
+                'name': f'{folder.name} - {access_internal} - {access_via_link} - {is_hidden}',
+                'folder_id': folder.id,
+                'owner_id': self.odoobot.id,
+                'access_internal': access_internal,
+                'access_via_link': access_via_link,
+                'is_access_via_link_hidden': is_hidden,
+            } for access_internal in ('view', 'none')
+              for access_via_link in ('edit', 'view', 'none')
+              for is_hidden in (False, True)])
+        documents[-1].action_update_access_rights(
+            partners={self.internal_user.partner_id.id: ('edit', fields.Datetime.now() - datetime.timedelta(days=1))})
+
+        for user in (self.document_manager, self.doc_user, self.internal_user, self.portal_user):
+            with self.subTest(user=user.name):
+                self.env.invalidate_all()
+                user_documents = documents.with_user(user)
+                permissions = user_documents.mapped('user_permission')
+                self.env.invalidate_all()
+                expected = []
+                for document in user_documents.sudo():
+                    with self.env.protecting([document._fields['user_permission']], document):
+                        document._compute_user_permission_without_query()
+                    expected.append(document.user_permission)
+                self.assertEqual(permissions, expected)
+                self.assertIn('edit', permissions)
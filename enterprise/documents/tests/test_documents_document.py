@@ -11,6 +11,7 @@ from odoo.exceptions import AccessError, UserError, ValidationError
 from odoo.tests.common import new_test_user
 from odoo.tests import users
 
+from odoo.addons.documents.models import documents_document
 from .test_documents_common import TransactionCaseDocuments, GIF, TEXT
 
 DATA = "data:application/zip;base64,R0lGODdhAQABAIAAAP///////ywAAAAAAQABAAACAkQBADs="
@@ -484,6 +485,8 @@ class TestCaseDocuments(TransactionCaseDocuments):
                     'datas': "JVBERi0gRmFrZSBQREYgY29udGVudA==",
                     'folder_id': self.folder_b.id,
                 })
+                self.env['documents.document']._cron_generate_thumbnails()
+                # The fake PDF cannot be rasterized, it is left to the browser.
                 self.assertEqual(pdf_document.thumbnail, False)
                 self.assertEqual(pdf_document.thumbnail_status, 'client_generated')
 
@@ -502,9 +505,90 @@ class TestCaseDocuments(TransactionCaseDocuments):
                     'datas': GIF,
                     'folder_id': self.folder_b.id,
                 })
+                self.assertEqual(image_document.thumbnail_status, 'to_generate')
+                self.env['documents.document']._cron_generate_thumbnails()
                 self.assertEqual(image_document.thumbnail, GIF)
                 self.assertEqual(image_document.thumbnail_status, 'present')
 
+    def test_document_thumbnail_generation_by_checksum(self):
+        """ The documents with the same content share the thumbnail, that is only generated once. """
+        documents = self.env['documents.document'].create([{
+            'name': f'Scan {i}.gif',
+            'mimetype': 'image/gif',
+            'datas': GIF,
+            'folder_id': self.folder_b.id,
+        } for i in range(3)])
+        broken_image = self.env['documents.document'].create({
+            'name': 'Broken image.png',
+            'mimetype': 'image/png',
+            'datas': TEXT,
+            'folder_id': self.folder_b.id,
+        })
+        self.assertEqual(set((documents | broken_image).mapped('thumbnail_status')), {'to_generate'})
+
+        with patch('odoo.addons.documents.models.documents_document._generate_thumbnail',
+                   wraps=documents_document._generate_thumbnail) as generate_mock:
+            self.env['documents.document']._cron_generate_thumbnails(batch_size=2)
+        self.assertEqual(generate_mock.call_count, 2, "The thumbnail of the same content should be generated once")
+        self.assertEqual(documents.mapped('thumbnail_status'), ['present'] * 3)
+        self.assertEqual(documents.mapped('thumbnail'), [GIF] * 3)
+        self.assertEqual(broken_image.thumbnail_status, 'error')
+        self.assertFalse(broken_image.thumbnail)
+
+        # A new document with the same content reuses the existing thumbnail
+        document = self.env['documents.document'].create({
+            'name': 'Scan 3.gif',
+            'mimetype': 'image/gif',
+            'datas': GIF,
+            'folder_id': self.folder_b.id,
+        })
+        with patch('odoo.addons.documents.models.documents_document._generate_thumbnail') as generate_mock:
+            self.env['documents.document']._cron_generate_thumbnails()
+        generate_mock.assert_not_called()
+        self.assertEqual(document.thumbnail, GIF)
+
+    def test_document_thumbnail_generation_unexpected_error(self):
+        """ An unexpected error on a file only fails its own thumbnail, not the whole batch. """
+        broken_image, image = self.env['documents.document'].create([{
+            'name': name,
+            'mimetype': 'image/png',
+            'datas': datas,
+            'folder_id': self.folder_b.id,
+        } for name, datas in (('Broken image.png', TEXT), ('Image.png', GIF))])
+
+        broken_raw = broken_image.raw
+        original_image_process = documents_document.image_process
+
+        def _image_process(source, *args, **kwargs):
+            if source == broken_raw:
+                raise SyntaxError("broken PNG file")
+            return original_image_process(source, *args, **kwargs)
+
+        with patch('odoo.addons.documents.models.documents_document.image_process', _image_process):
+            self.env['documents.document']._cron_generate_thumbnails()
+        self.assertRecordValues(broken_image | image, [
+            {'thumbnail_status': 'error', 'thumbnail': False},
+            {'thumbnail_status': 'present', 'thumbnail': GIF},
+        ])
+
+    def test_document_thumbnail_generation_shortcut(self):
+        """ The shortcuts are not processed by the cron, they follow the thumbnail of their source document. """
+        document = self.env['documents.document'].create({
+            'name': 'Scan.gif',
+            'mimetype': 'image/gif',
+            'datas': GIF,
+            'folder_id': self.folder_b.id,
+        })
+        shortcut = document.action_create_shortcut(self.folder_a.id)
+        self.assertEqual(shortcut.thumbnail_status, 'to_generate')
+
+        with patch('odoo.addons.documents.models.documents_document._generate_thumbnail',
+                   wraps=documents_document._generate_thumbnail) as generate_mock:
+            self.env['documents.document']._cron_generate_thumbnails()
+        self.assertEqual(generate_mock.call_count, 1, "Only the thumbnail of the source document should be generated")
+        self.assertEqual(shortcut.thumbnail_status, 'present')
+        self.assertEqual(shortcut.thumbnail, GIF)
+
     def test_document_max_upload_limit(self):
         Doc = self.env['documents.document']
         ICP = self.env['ir.config_parameter']
@@ -651,6 +735,7 @@ class TestCaseDocuments(TransactionCaseDocuments):
 
     def test_thumbnail_fix(self):
         """Test the thumbnail fix that force the status to "present" for image when it is False."""
+        self.env['documents.document']._cron_generate_thumbnails()
         read = (self.document_gif | self.document_txt).web_read({'thumbnail_status': {}, 'mimetype': {}})
         self.assertEqual(self.document_gif.thumbnail_status, 'present')
         self.assertEqual(self.document_txt.thumbnail_status, False)
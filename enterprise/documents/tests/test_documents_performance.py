@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import time
+
+from odoo.addons.documents.tests.test_documents_common import TransactionCaseDocuments
+from odoo.tests import tagged
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install', '-standard', 'documents_benchmark')
+class TestDocumentsPermissionBenchmark(TransactionCaseDocuments):
+    DOCUMENTS_COUNT = 5000
+    FOLDERS_COUNT = 200
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.folder = cls.env['documents.document'].create({
+            'type': 'folder',
+            'name': 'Benchmark Folder',
+            'owner_id': cls.odoobot.id,
+            'access_internal': 'view',
+        })
+        cls.env['documents.document'].create([{
+            'type': 'folder',
+            'name': f'Benchmark Subfolder {i}',
+            'folder_id': cls.folder.id,
+            'owner_id': cls.odoobot.id,
+            'access_internal': 'view' if i % 2 else 'none',
+            'access_via_link': 'view',
+        } for i in range(cls.FOLDERS_COUNT)])
+        cls.env['documents.document'].create([{
+            'name': f'Benchmark Document {i}.txt',
+            'folder_id': cls.folder.id,
+            'owner_id': cls.doc_user.id if i % 10 == 0 else cls.odoobot.id,
+            'access_internal': ('edit', 'view', 'none')[i % 3],
+            'access_via_link': ('view', 'none')[i % 2],
+        } for i in range(cls.DOCUMENTS_COUNT)])
+
+    def _benchmark(self, name, func):
+        self.env.invalidate_all()
+        queries_count = self.cr.sql_log_count
+        start_time = time.time()
+        result = func()
+        _logger.info(
+            "%s: %.2f seconds, %s queries", name, time.time() - start_time, self.cr.sql_log_count - queries_count,
+        )
+        return result
+
+    def test_folder_listing_benchmark(self):
+        Document = self.env['documents.document'].with_user(self.internal_user)
+        records = self._benchmark('Folder listing', lambda: Document.web_search_read(
+            [('folder_id', '=', self.folder.id)],
+            {'name': {}, 'user_permission': {}, 'access_via_link': {}},
+            limit=self.DOCUMENTS_COUNT + self.FOLDERS_COUNT,
+        ))
+        self.assertTrue(records['records'])
+        self.assertTrue(all(record['user_permission'] != 'none' for record in records['records']))
+
+    def test_search_panel_folder_tree_benchmark(self):
+        Document = self.env['documents.document'].with_user(self.internal_user)
+        result = self._benchmark('Search panel folder tree', lambda: Document.search_panel_select_range(
+            'folder_id', enable_counters=True,
+        ))
+        self.assertTrue(result['values'])
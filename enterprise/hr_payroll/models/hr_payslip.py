@@ -12,7 +12,7 @@ from functools import reduce
 
 from odoo import api, Command, fields, models, _
 from odoo.exceptions import UserError, ValidationError
-from odoo.tools import float_round, date_utils, convert_file, format_amount
+from odoo.tools import float_round, date_utils, convert_file, format_amount, SQL
 from odoo.tools.float_utils import float_compare
 from odoo.tools.misc import format_date
 from odoo.tools.safe_eval import safe_eval, datetime as safe_eval_datetime, dateutil as safe_eval_dateutil
@@ -472,6 +472,8 @@ class HrPayslip(models.Model):
             raise ValidationError(_('You cannot validate a payslip on which the contract is cancelled'))
         if any(slip.state == 'cancel' for slip in self):
             raise ValidationError(_("You can't validate a cancelled payslip."))
+        if self.env['hr.payslip.run.chunk'].search_count([('slip_ids', 'in', self.ids), ('state', '=', 'to_compute')], limit=1):
+            raise ValidationError(_("You can't validate payslips which are still being computed."))
         if mismatched_slips := self.filtered(lambda slip: slip.payslip_run_id and slip.company_id != slip.payslip_run_id.company_id):
             raise ValidationError(_(
                 "The following payslips company differs from the batch's company:\n%s", "\n".join(mismatched_slips.mapped('number')))
@@ -722,68 +724,95 @@ class HrPayslip(models.Model):
     def _sum(self, code, from_date, to_date=None):
         if to_date is None:
             to_date = fields.Date.today()
-        self.env.cr.execute("""
-            SELECT sum(pl.total)
-            FROM hr_payslip as hp, hr_payslip_line as pl
-            WHERE hp.employee_id = %s
-            AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s
-            AND hp.date_to <= %s
-            AND hp.id = pl.slip_id
-            AND pl.code = %s""", (self.employee_id.id, from_date, to_date, code))
-        res = self.env.cr.fetchone()
-        return res and res[0] or 0.0
+        return self._get_history_sum('line', code, from_date, to_date) or 0.0
 
     def _sum_category(self, code, from_date, to_date=None):
         self.ensure_one()
         if to_date is None:
             to_date = fields.Date.today()
-
-        self.env['hr.payslip'].flush_model(['employee_id', 'state', 'date_from', 'date_to'])
-        self.env['hr.payslip.line'].flush_model(['total', 'slip_id', 'salary_rule_id'])
-        self.env['hr.salary.rule.category'].flush_model(['code'])
-
-        self.env.cr.execute("""
-            SELECT sum(pl.total)
-            FROM
-                hr_payslip as hp,
-                hr_payslip_line as pl,
-                hr_salary_rule_category as rc,
-                hr_salary_rule as sr
-            WHERE hp.employee_id = %s
-            AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s
-            AND hp.date_to <= %s
-            AND hp.id = pl.slip_id
-            AND sr.id = pl.salary_rule_id
-            AND rc.id = sr.category_id
-            AND rc.code = %s""", (self.employee_id.id, from_date, to_date, code))
-        res = self.env.cr.fetchone()
-        return res and res[0] or 0.0
+        return self._get_history_sum('category', code, from_date, to_date) or 0.0
 
     def _sum_worked_days(self, code, from_date, to_date=None):
         self.ensure_one()
         if to_date is None:
             to_date = fields.Date.today()
+        return self._get_history_sum('worked_days', code, from_date, to_date)
+
+    def _get_history_sum(self, history_type, code, from_date, to_date):
+        """ Sum the lines, the lines of a category or the worked days with the given code, of the done and paid payslips
+        of the employee between two dates.
+
+        While computing the lines of a batch of payslips, the sums are read for all the employees of the batch at once
+        and kept in the context, the payslips of the batch sharing their prefetch ids: the number of queries does not
+        depend on the size of the batch.
+        """
+        history_sums = self.env.context.get('payslip_history_sums')
+        if history_sums is None:
+            return self._read_history_sums(history_type, code, from_date, to_date, self.employee_id).get(self.employee_id.id)
+        key = (history_type, code, from_date, to_date)
+        if key not in history_sums:
+            employees = self.browse(self._prefetch_ids).employee_id | self.employee_id
+            history_sums[key] = self._read_history_sums(history_type, code, from_date, to_date, employees)
+        return history_sums[key].get(self.employee_id.id)
 
-        query = """
-            SELECT sum(hwd.amount)
-            FROM hr_payslip hp, hr_payslip_worked_days hwd, hr_work_entry_type hwet
-            WHERE hp.state in ('done', 'paid')
-            AND hp.id = hwd.payslip_id
-            AND hwet.id = hwd.work_entry_type_id
-            AND hp.employee_id = %(employee)s
-            AND hp.date_to <= %(stop)s
-            AND hwet.code = %(code)s
-            AND hp.date_from >= %(start)s"""
-
-        self.env.cr.execute(query, {
-            'employee': self.employee_id.id,
-            'code': code,
-            'start': from_date,
-            'stop': to_date})
-        res = self.env.cr.fetchone()
-        return res[0] if res else 0.0
+    @api.model
+    def _read_history_sums(self, history_type, code, from_date, to_date, employees):
+        if not employees:
+            return {}
+        self.env['hr.payslip'].flush_model(['employee_id', 'state', 'date_from', 'date_to'])
+        if history_type == 'worked_days':
+            self.env['hr.payslip.worked_days'].flush_model(['amount', 'payslip_id', 'work_entry_type_id'])
+            self.env['hr.work.entry.type'].flush_model(['code'])
+            query = SQL("""
+                SELECT hp.employee_id, sum(hwd.amount)
+                FROM hr_payslip hp, hr_payslip_worked_days hwd, hr_work_entry_type hwet
+                WHERE hp.state in ('done', 'paid')
+                AND hp.id = hwd.payslip_id
+                AND hwet.id = hwd.work_entry_type_id
+                AND hp.employee_id IN %(employees)s
+                AND hp.date_to <= %(stop)s
+                AND hwet.code = %(code)s
+                AND hp.date_from >= %(start)s
+                GROUP BY hp.employee_id""",
+                employees=tuple(employees.ids), start=from_date, stop=to_date, code=code,
+            )
+        elif history_type == 'category':
+            self.env['hr.payslip.line'].flush_model(['total', 'slip_id', 'salary_rule_id'])
+            self.env['hr.salary.rule'].flush_model(['category_id'])
+            self.env['hr.salary.rule.category'].flush_model(['code'])
+            query = SQL("""
+                SELECT hp.employee_id, sum(pl.total)
+                FROM
+                    hr_payslip as hp,
+                    hr_payslip_line as pl,
+                    hr_salary_rule_category as rc,
+                    hr_salary_rule as sr
+                WHERE hp.employee_id IN %(employees)s
+                AND hp.state in ('done', 'paid')
+                AND hp.date_from >= %(start)s
+                AND hp.date_to <= %(stop)s
+                AND hp.id = pl.slip_id
+                AND sr.id = pl.salary_rule_id
+                AND rc.id = sr.category_id
+                AND rc.code = %(code)s
+                GROUP BY hp.employee_id""",
+                employees=tuple(employees.ids), start=from_date, stop=to_date, code=code,
+            )
+        else:
+            self.env['hr.payslip.line'].flush_model(['total', 'slip_id', 'code'])
+            query = SQL("""
+                SELECT hp.employee_id, sum(pl.total)
+                FROM hr_payslip as hp, hr_payslip_line as pl
+                WHERE hp.employee_id IN %(employees)s
+                AND hp.state in ('done', 'paid')
+                AND hp.date_from >= %(start)s
+                AND hp.date_to <= %(stop)s
+                AND hp.id = pl.slip_id
+                AND pl.code = %(code)s
+                GROUP BY hp.employee_id""",
+                employees=tuple(employees.ids), start=from_date, stop=to_date, code=code,
+            )
+        return dict(self.env.execute_query(query))
 
     def _get_base_local_dict(self):
         return {
@@ -900,6 +929,9 @@ class HrPayslip(models.Model):
         return last_ytd_payslips
 
     def _get_payslip_lines(self):
+        # Read the history of the employees for the whole batch at once, see _get_history_sum
+        if 'payslip_history_sums' not in self.env.context:
+            self = self.with_context(payslip_history_sums={})
         line_vals = []
 
         if any(self.mapped('ytd_computation')):
@@ -1,10 +1,15 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import logging
+import time
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 
-from odoo import api, fields, models, _
+from odoo import api, fields, models, modules, tools, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL, split_every
+
+_logger = logging.getLogger(__name__)
 
 
 class HrPayslipRun(models.Model):
@@ -39,6 +44,30 @@ class HrPayslipRun(models.Model):
         readonly=True)
     payment_report_filename = fields.Char(readonly=True)
     payment_report_date = fields.Date(readonly=True)
+    chunk_ids = fields.One2many('hr.payslip.run.chunk', 'run_id', string='Computation Chunks', readonly=True)
+    computation_state = fields.Selection([
+        ('running', 'Computing'),
+        ('failed', 'Failed'),
+        ('done', 'Computed'),
+    ], compute='_compute_computation_state')
+    computation_progress = fields.Float(compute='_compute_computation_state')
+    computation_notified = fields.Boolean(readonly=True, copy=False)
+
+    @api.depends('chunk_ids.state', 'chunk_ids.payslip_count')
+    def _compute_computation_state(self):
+        for payslip_run in self:
+            chunks = payslip_run.chunk_ids
+            if not chunks:
+                payslip_run.computation_state = False
+            elif any(chunk.state == 'to_compute' for chunk in chunks):
+                payslip_run.computation_state = 'running'
+            elif any(chunk.state == 'failed' for chunk in chunks):
+                payslip_run.computation_state = 'failed'
+            else:
+                payslip_run.computation_state = 'done'
+            total_count = sum(chunks.mapped('payslip_count'))
+            computed_count = sum(chunks.filtered(lambda chunk: chunk.state != 'to_compute').mapped('payslip_count'))
+            payslip_run.computation_progress = 100 * computed_count / total_count if total_count else 0
 
     def _compute_payslip_count(self):
         for payslip_run in self:
@@ -80,6 +109,10 @@ class HrPayslipRun(models.Model):
         self.write({'state': 'close'})
 
     def action_validate(self):
+        if any(payslip_run.computation_state == 'running' for payslip_run in self):
+            raise UserError(_('You cannot validate a batch while its payslips are being computed.'))
+        if any(payslip_run.computation_state == 'failed' for payslip_run in self):
+            raise UserError(_('You cannot validate a batch whose payslips computation failed. Retry the failed computations first.'))
         payslip_done_result = self.mapped('slip_ids').filtered(lambda slip: slip.state not in ['draft', 'cancel']).action_payslip_done()
         self.action_close()
         return payslip_done_result
@@ -120,3 +153,225 @@ class HrPayslipRun(models.Model):
 
     def _are_payslips_ready(self):
         return all(slip.state in ['done', 'cancel'] for slip in self.mapped('slip_ids'))
+
+    def _compute_payslips_by_chunks(self, payslips):
+        """ Compute the payslips of a big batch in the background, by chunks of `hr_payroll.payslip_computation_chunk_size`
+        payslips computed in parallel by `hr_payroll.payslip_computation_worker_count` crons, each chunk in its own
+        transaction (see hr.payslip.run.chunk).
+
+        :return: False if the batch is small enough to be computed at once.
+        """
+        self.ensure_one()
+        ICP = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(ICP.get_param('hr_payroll.payslip_computation_chunk_size', 500))
+        if chunk_size <= 0 or len(payslips) <= chunk_size:
+            return False
+        self.computation_notified = False
+        self.env['hr.payslip.run.chunk'].create([{
+            'run_id': self.id,
+            'slip_ids': [(6, 0, chunk_payslips.ids)],
+        } for chunk_payslips in split_every(chunk_size, payslips.sorted('id'), payslips.browse)])
+        self.env['hr.payslip.run.chunk']._trigger_workers()
+        return True
+
+    def _notify_computation_done(self):
+        """ Post the result of the computation of the chunks once the last one is computed.
+
+        Must be called in a transaction started after the result of the chunk was committed, so that the workers
+        computing the last chunks at the same time see each other's results.
+        """
+        self.ensure_one()
+        self.flush_recordset(['computation_notified'])
+        self.env['hr.payslip.run.chunk'].flush_model(['run_id', 'state'])
+        # Workers finishing at the same time may both get here: only the one locking the batch posts the message.
+        self.env.cr.execute(SQL(
+            """
+                SELECT run.id
+                  FROM hr_payslip_run run
+                 WHERE run.id = %s
+                   AND NOT run.computation_notified
+                   AND NOT EXISTS (
+                        SELECT 1
+                          FROM hr_payslip_run_chunk chunk
+                         WHERE chunk.run_id = run.id
+                           AND chunk.state = 'to_compute'
+                   )
+                   FOR UPDATE SKIP LOCKED
+            """,
+            self.id,
+        ))
+        if not self.env.cr.rowcount:
+            return
+        self.computation_notified = True
+        self.invalidate_recordset(['chunk_ids'])
+        if self.computation_state == 'failed':
+            failed_chunks = self.chunk_ids.filtered(lambda chunk: chunk.state == 'failed')
+            self.message_post(body=_(
+                'The computation of %(count)s payslips failed: %(error)s',
+                count=sum(failed_chunks.mapped('payslip_count')),
+                error=failed_chunks[0].error_message,
+            ))
+        elif self.computation_state == 'done':
+            self.message_post(body=_('All the payslips of the batch have been computed.'))
+
+    def action_retry_failed_chunks(self):
+        failed_chunks = self.chunk_ids.filtered(lambda chunk: chunk.state == 'failed')
+        failed_chunks.write({'state': 'to_compute', 'attempt_count': 0})
+        failed_chunks.run_id.computation_notified = False
+        failed_chunks._trigger_workers()
+
+
+class HrPayslipRunChunk(models.Model):
+    """ Chunk of the payslips of a batch, computed in the background.
+
+    The payslips of big batches are split into chunks, computed by several crons running in parallel
+    (see _cron_compute_payslip_chunks). Each cron locks the next chunk to compute, computes its payslips and commits,
+    so that a time limit or a crash only loses the current chunk, which is then computed again. The chunks whose
+    computation fails are retried `hr_payroll.payslip_computation_max_attempts` times, then left failed until they are
+    retried from the batch.
+    """
+    _name = 'hr.payslip.run.chunk'
+    _description = 'Payslip Batch Computation Chunk'
+    _order = 'run_id, id'
+
+    run_id = fields.Many2one('hr.payslip.run', string='Batch', required=True, readonly=True, index=True, ondelete='cascade')
+    slip_ids = fields.Many2many('hr.payslip', string='Payslips', readonly=True)
+    payslip_count = fields.Integer(compute='_compute_payslip_count', store=True)
+    state = fields.Selection([
+        ('to_compute', 'To Compute'),
+        ('done', 'Computed'),
+        ('failed', 'Failed'),
+    ], required=True, readonly=True, index=True, default='to_compute')
+    attempt_count = fields.Integer(string='Attempts', readonly=True)
+    error_message = fields.Text(readonly=True)
+
+    @api.depends('slip_ids')
+    def _compute_payslip_count(self):
+        for chunk in self:
+            chunk.payslip_count = len(chunk.slip_ids)
+
+    @api.model
+    def _get_worker_cron(self, worker_index):
+        """ Return the cron of a worker, creating it from the cron of the first worker the first time that many workers
+        are used.
+        """
+        cron = self.env.ref('hr_payroll.ir_cron_compute_payslip_run_chunks').sudo()
+        if not worker_index:
+            return cron
+        code = f"model._cron_compute_payslip_chunks({worker_index})"
+        worker_cron = self.env['ir.cron'].sudo().with_context(active_test=False).search([
+            ('model_id.model', '=', self._name),
+            ('code', '=', code),
+        ], limit=1)
+        if not worker_cron:
+            worker_cron = cron.copy({
+                'name': f"Payroll: Compute payslip batches (worker {worker_index + 1})",
+                'code': code,
+                'active': True,
+            })
+        return worker_cron
+
+    @api.model
+    def _trigger_workers(self):
+        worker_count = int(self.env['ir.config_parameter'].sudo().get_param('hr_payroll.payslip_computation_worker_count', 4))
+        for worker_index in range(max(worker_count, 1)):
+            self._get_worker_cron(worker_index)._trigger()
+
+    @api.model
+    def _cron_compute_payslip_chunks(self, worker_index=0, time_budget=None):
+        """ Compute the chunks left to compute, one per transaction, until they are all computed or the time budget is
+        exceeded, in which case the cron is retriggered.
+
+        :param worker_index: index of the cron running this method, all the workers sharing the same chunks.
+        :param time_budget: number of seconds after which no new chunk is started. Defaults to the time limit of the crons.
+        """
+        auto_commit = not modules.module.current_test
+        if time_budget is None:
+            # 'limit_time_real_cron' defaults to -1.
+            cron_limit_time = tools.config['limit_time_real_cron'] or -1
+            time_budget = (cron_limit_time if cron_limit_time > 0 else 180) * 0.8
+        max_attempts = int(self.env['ir.config_parameter'].sudo().get_param('hr_payroll.payslip_computation_max_attempts', 3))
+        start_time = time.monotonic()
+
+        while chunk := self._claim_chunk(max_attempts, auto_commit):
+            chunk_start_time = time.monotonic()
+            try:
+                with self.env.cr.savepoint():
+                    chunk.slip_ids.compute_sheet()
+            except Exception as e:  # noqa: BLE001
+                _logger.exception("Computation of the payslips of chunk %s of batch %s failed.", chunk.id, chunk.run_id.id)
+                chunk.write({
+                    'state': 'failed' if chunk.attempt_count >= max_attempts else 'to_compute',
+                    'error_message': str(e),
+                })
+            else:
+                chunk.write({'state': 'done', 'error_message': False})
+                _logger.info(
+                    "Payslip computation worker %s: %s payslips of batch %s computed in %.2fs.",
+                    worker_index, chunk.payslip_count, chunk.run_id.id, time.monotonic() - chunk_start_time,
+                )
+            # Commit the result of the chunk before checking whether it was the last one, in a new transaction seeing
+            # the chunks computed in parallel by the other workers.
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            chunk.run_id._notify_computation_done()
+            if auto_commit:
+                self.env.cr.commit()
+
+            if time.monotonic() - start_time > time_budget:
+                if self.search_count([('state', '=', 'to_compute')], limit=1):
+                    self._get_worker_cron(worker_index)._trigger()
+                return
+
+    @api.model
+    def _claim_chunk(self, max_attempts, auto_commit=True):
+        """ Lock the next chunk to compute, skipping the chunks being computed by the other workers.
+
+        The attempt is counted and committed before the computation, so that a chunk whose computation kills the worker
+        (time or memory limit) is not claimed forever: it is failed once it reaches the maximum number of attempts.
+        """
+        while True:
+            self.flush_model(['state', 'attempt_count'])
+            self.env.cr.execute(SQL("""
+                SELECT id, attempt_count
+                  FROM hr_payslip_run_chunk
+                 WHERE state = 'to_compute'
+              ORDER BY attempt_count, id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+            """))
+            row = self.env.cr.fetchone()
+            if not row:
+                return self.browse()
+            chunk_id, attempt_count = row
+            chunk = self.browse(chunk_id)
+
+            if attempt_count >= max_attempts:
+                chunk.write({
+                    'state': 'failed',
+                    'error_message': _('The computation of the payslips was interrupted %s times.', attempt_count),
+                })
+                if auto_commit:
+                    self.env.cr.commit()
+                self.env.invalidate_all()
+                chunk.run_id._notify_computation_done()
+                if auto_commit:
+                    self.env.cr.commit()
+                continue
+
+            chunk.attempt_count = attempt_count + 1
+            if not auto_commit:
+                return chunk
+            self.env.cr.commit()
+            # The commit released the lock: take it again, unless another worker claimed the chunk in the meantime.
+            self.env.cr.execute(SQL("""
+                SELECT id
+                  FROM hr_payslip_run_chunk
+                 WHERE id = %s
+                   AND state = 'to_compute'
+                   AND attempt_count = %s
+                   FOR UPDATE SKIP LOCKED
+            """, chunk_id, attempt_count + 1))
+            if self.env.cr.rowcount:
+                return chunk
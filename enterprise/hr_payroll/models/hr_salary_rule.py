@@ -3,7 +3,10 @@
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
-from odoo.tools.safe_eval import safe_eval
+from odoo.tools import ormcache
+from odoo.tools.safe_eval import _BUILTINS, _SAFE_OPCODES, check_values, test_expr
+
+RULE_CODE_FIELDS = ('quantity', 'amount_percentage_base', 'amount_python_compute', 'condition_range', 'condition_python')
 
 
 class HrSalaryRule(models.Model):
@@ -115,6 +118,28 @@ result = contract.wage * 0.10''')
             code=self.code,
             error_message=e))
 
+    @ormcache('self.id', 'self.write_date', 'field_name', 'mode')
+    def _get_rule_code(self, field_name, mode):
+        """ Validate and compile the code of the given field once per rule and worker, instead of once per evaluation.
+
+        The hit rate of this cache is reported with the other ormcache statistics (see odoo.tools.cache.log_ormcache_stats).
+        """
+        return test_expr(self[field_name], _SAFE_OPCODES, mode=mode)
+
+    def _safe_eval_rule_code(self, field_name, localdict, mode='eval'):
+        """ Evaluate the code of the given field like safe_eval, the localdict being updated in place in 'exec' mode. """
+        code = self._get_rule_code(field_name, mode)
+        if mode == 'eval':
+            localdict = dict(localdict)
+        check_values(localdict)
+        localdict['__builtins__'] = dict(_BUILTINS)
+        try:
+            return eval(code, localdict)  # noqa: S307
+        except (UserError, ZeroDivisionError):
+            raise
+        except Exception as e:  # noqa: BLE001
+            raise ValueError('%s: "%s" while evaluating\n%r' % (type(e), e, self[field_name]))
+
     def _compute_rule(self, localdict):
 
         """
@@ -126,13 +151,13 @@ result = contract.wage * 0.10''')
         localdict['localdict'] = localdict
         if self.amount_select == 'fix':
             try:
-                return self.amount_fix or 0.0, float(safe_eval(self.quantity, localdict)), 100.0
+                return self.amount_fix or 0.0, float(self._safe_eval_rule_code('quantity', localdict)), 100.0
             except Exception as e:
                 self._raise_error(localdict, _("Wrong quantity defined for:"), e)
         if self.amount_select == 'percentage':
             try:
-                return (float(safe_eval(self.amount_percentage_base, localdict)),
-                        float(safe_eval(self.quantity, localdict)),
+                return (float(self._safe_eval_rule_code('amount_percentage_base', localdict)),
+                        float(self._safe_eval_rule_code('quantity', localdict)),
                         self.amount_percentage or 0.0)
             except Exception as e:
                 self._raise_error(localdict, _("Wrong percentage base or quantity defined for:"), e)
@@ -142,7 +167,7 @@ result = contract.wage * 0.10''')
             return localdict['inputs'][self.amount_other_input_id.code].amount, 1.0, 100.0
         # python code
         try:
-            safe_eval(self.amount_python_compute or 0.0, localdict, mode='exec', nocopy=True)
+            self._safe_eval_rule_code('amount_python_compute', localdict, mode='exec')
             return float(localdict['result']), localdict.get('result_qty', 1.0), localdict.get('result_rate', 100.0)
         except Exception as e:
             self._raise_error(localdict, _("Wrong python code defined for:"), e)
@@ -154,7 +179,7 @@ result = contract.wage * 0.10''')
             return True
         if self.condition_select == 'range':
             try:
-                result = safe_eval(self.condition_range, localdict)
+                result = self._safe_eval_rule_code('condition_range', localdict)
                 return self.condition_range_min <= result <= self.condition_range_max
             except Exception as e:
                 self._raise_error(localdict, _("Wrong range condition defined for:"), e)
@@ -162,7 +187,7 @@ result = contract.wage * 0.10''')
             return self.condition_other_input_id.code in localdict['inputs']
         # python code
         try:
-            safe_eval(self.condition_python, localdict, mode='exec', nocopy=True)
+            self._safe_eval_rule_code('condition_python', localdict, mode='exec')
             return localdict.get('result', False)
         except Exception as e:
             self._raise_error(localdict, _("Wrong python condition defined for:"), e)
@@ -220,6 +245,9 @@ result = contract.wage * 0.10''')
         return [dict(vals, name=self.env._("%s (copy)", rule.name)) for rule, vals in zip(self, vals_list)]
 
     def write(self, vals):
+        if any(field_name in vals for field_name in RULE_CODE_FIELDS):
+            # The compiled code is cached by write date, which does not change within a transaction.
+            self.env.registry.clear_cache()
         res = super().write(vals)
         if 'appears_on_payroll_report' in vals:
             if vals['appears_on_payroll_report']:
@@ -4,8 +4,10 @@
 from dateutil.rrule import rrule, DAILY
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
+from unittest.mock import patch
 from odoo.fields import Date
 from odoo.tests import Form, tagged
+from odoo.addons.hr_payroll.models import hr_salary_rule
 from odoo.addons.hr_payroll.tests.common import TestPayslipContractBase
 
 
@@ -550,3 +552,69 @@ class TestPayslipComputation(TestPayslipContractBase):
         payslip_form = Form(payslip)
         payslip_form.date_from = None
         self.assertFalse(payslip_form.warning_message)
+
+    def test_salary_rule_code_cache(self):
+        self.env.registry.clear_cache()
+        with patch.object(hr_salary_rule, 'test_expr', wraps=hr_salary_rule.test_expr) as compile_mock:
+            self.richard_payslip.compute_sheet()
+            compile_count = compile_mock.call_count
+            self.assertTrue(compile_count)
+
+            # The code of the rules is only compiled for the first payslip
+            self.richard_payslip_quarter.compute_sheet()
+            self.assertEqual(compile_mock.call_count, compile_count)
+
+            # Modifying a rule discards its compiled code, even within the same transaction
+            self.hra_rule.amount_percentage_base = 'contract.wage / 2'
+            self.richard_payslip.compute_sheet()
+            self.assertGreater(compile_mock.call_count, compile_count)
+        self.assertAlmostEqual(self.richard_payslip.line_ids.filtered(lambda line: line.code == 'HRA').total, 1000.07, places=2)
+        self.assertAlmostEqual(self.richard_payslip_quarter.line_ids.filtered(lambda line: line.code == 'HRA').total, 2000.13, places=2)
+
+    def test_sum_history_batch(self):
+        jules_payslip = self.env['hr.payslip'].create({
+            'name': 'Payslip of Jules',
+            'employee_id': self.jules_emp.id,
+            'contract_id': self.contract_jules.id,
+            'struct_id': self.developer_pay_structure.id,
+            'date_from': date(2016, 1, 1),
+            'date_to': date(2016, 1, 31)
+        })
+        january_payslips = self.richard_payslip + jules_payslip
+        january_payslips.compute_sheet()
+        january_payslips.action_payslip_done()
+
+        self.env['hr.salary.rule'].create({
+            'name': 'History',
+            'sequence': 200,
+            'amount_select': 'code',
+            'amount_python_compute': """
+result = payslip._sum('BASIC', date(2016, 1, 1), payslip.date_to) \
+    + payslip._sum_category('ALW', date(2016, 1, 1), payslip.date_to) \
+    + (payslip._sum_worked_days('WORK100', date(2016, 1, 1), payslip.date_to) or 0)""",
+            'code': 'HISTORY',
+            'category_id': self.env.ref('hr_payroll.COMP').id,
+            'struct_id': self.developer_pay_structure.id,
+        })
+        february_payslips = self.env['hr.payslip'].create([{
+            'name': 'Payslip of %s' % contract.employee_id.name,
+            'employee_id': contract.employee_id.id,
+            'contract_id': contract.id,
+            'struct_id': self.developer_pay_structure.id,
+            'date_from': date(2016, 2, 1),
+            'date_to': date(2016, 2, 29)
+        } for contract in self.contract_cdi + self.contract_jules])
+
+        HrPayslip = self.env.registry['hr.payslip']
+        with patch.object(HrPayslip, '_read_history_sums', autospec=True, side_effect=HrPayslip._read_history_sums) as read_mock:
+            february_payslips.compute_sheet()
+        # One query per sum of the SUMALW and HISTORY rules, for the whole batch
+        self.assertEqual(read_mock.call_count, 4)
+
+        for payslip in february_payslips:
+            # Same results as summing the history of each payslip separately
+            history = payslip._sum('BASIC', date(2016, 1, 1), date(2016, 2, 29)) \
+                + payslip._sum_category('ALW', date(2016, 1, 1), date(2016, 2, 29)) \
+                + (payslip._sum_worked_days('WORK100', date(2016, 1, 1), date(2016, 2, 29)) or 0)
+            self.assertAlmostEqual(payslip.line_ids.filtered(lambda line: line.code == 'HISTORY').total, history, places=2)
+        self.assertTrue(february_payslips[0].line_ids.filtered(lambda line: line.code == 'HISTORY').total)
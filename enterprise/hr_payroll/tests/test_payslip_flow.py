@@ -2,7 +2,9 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import datetime
+from unittest.mock import patch
 
+from odoo.exceptions import UserError, ValidationError
 from odoo.addons.hr_payroll.tests.common import TestPayslipBase
 from dateutil.relativedelta import relativedelta
 
@@ -222,3 +224,95 @@ class TestPayslipFlow(TestPayslipBase):
         # Check that the rules appears_on_payroll_report are the same after the write
         self.assertTrue(rule_1.appears_on_payroll_report)
         self.assertFalse(rule_2.appears_on_payroll_report)
+
+    def test_05_batch_computation_by_chunks(self):
+        """ Testing the computation of a batch by chunks, with the retry of the chunks that failed """
+        self.richard_emp.contract_ids[0].state = 'open'
+        self.env['ir.config_parameter'].sudo().set_param('hr_payroll.payslip_computation_chunk_size', 1)
+        self.env['ir.config_parameter'].sudo().set_param('hr_payroll.payslip_computation_max_attempts', 2)
+        payslip_run = self.env['hr.payslip.run'].create({
+            'date_start': '2011-09-01',
+            'date_end': '2011-09-30',
+            'name': 'Payslip for Employee',
+        })
+        payslips = self.env['hr.payslip'].create([{
+            'name': 'Payslip of Richard %s' % i,
+            'employee_id': self.richard_emp.id,
+            'struct_id': self.developer_pay_structure.id,
+            'payslip_run_id': payslip_run.id,
+        } for i in range(3)])
+
+        self.assertTrue(payslip_run._compute_payslips_by_chunks(payslips))
+        self.assertEqual(len(payslip_run.chunk_ids), 3)
+        self.assertEqual(payslip_run.computation_state, 'running')
+        self.assertEqual(payslip_run.computation_progress, 0)
+        self.assertFalse(payslips.line_ids)
+        with self.assertRaises(UserError):
+            payslip_run.action_validate()
+        with self.assertRaises(ValidationError):
+            payslips.action_payslip_done()
+
+        failing_payslip = payslips[1]
+        compute_sheet = type(payslips).compute_sheet
+
+        def _compute_sheet(self):
+            if failing_payslip in self:
+                raise UserError('Missing parameter')
+            return compute_sheet(self)
+
+        with patch.object(type(payslips), 'compute_sheet', _compute_sheet):
+            self.env['hr.payslip.run.chunk']._cron_compute_payslip_chunks()
+
+        failed_chunk = payslip_run.chunk_ids.filtered(lambda chunk: chunk.state == 'failed')
+        self.assertEqual(failed_chunk.slip_ids, failing_payslip)
+        self.assertEqual(failed_chunk.attempt_count, 2)
+        self.assertEqual(failed_chunk.error_message, 'Missing parameter')
+        self.assertEqual(payslip_run.computation_state, 'failed')
+        self.assertEqual(payslip_run.computation_progress, 100)
+        self.assertTrue((payslips - failing_payslip).line_ids)
+        self.assertFalse(failing_payslip.line_ids)
+        self.assertEqual(failing_payslip.state, 'draft')
+        with self.assertRaises(UserError):
+            payslip_run.action_validate()
+
+        payslip_run.action_retry_failed_chunks()
+        self.assertEqual(payslip_run.computation_state, 'running')
+        self.env['hr.payslip.run.chunk']._cron_compute_payslip_chunks()
+        self.assertEqual(payslip_run.computation_state, 'done')
+        self.assertTrue(failing_payslip.line_ids)
+        # The result of the computation is posted once per computation
+        payslip_run._notify_computation_done()
+        message_bodies = payslip_run.message_ids.mapped('body')
+        self.assertEqual(len([body for body in message_bodies if 'failed' in body]), 1)
+        self.assertEqual(len([body for body in message_bodies if 'have been computed' in body]), 1)
+        self.assertTrue(all(payslip.state == 'verify' for payslip in payslips))
+
+    def test_06_batch_computation_chunk_interrupted(self):
+        """ A chunk whose computation keeps killing the worker is failed once it reaches the maximum attempts """
+        self.richard_emp.contract_ids[0].state = 'open'
+        self.env['ir.config_parameter'].sudo().set_param('hr_payroll.payslip_computation_chunk_size', 1)
+        self.env['ir.config_parameter'].sudo().set_param('hr_payroll.payslip_computation_max_attempts', 2)
+        payslip_run = self.env['hr.payslip.run'].create({
+            'date_start': '2011-09-01',
+            'date_end': '2011-09-30',
+            'name': 'Payslip for Employee',
+        })
+        payslips = self.env['hr.payslip'].create([{
+            'name': 'Payslip of Richard %s' % i,
+            'employee_id': self.richard_emp.id,
+            'struct_id': self.developer_pay_structure.id,
+            'payslip_run_id': payslip_run.id,
+        } for i in range(2)])
+        self.assertTrue(payslip_run._compute_payslips_by_chunks(payslips))
+
+        # The attempts are counted when the chunk is claimed, before its computation
+        chunk = self.env['hr.payslip.run.chunk']._claim_chunk(max_attempts=2, auto_commit=False)
+        self.assertEqual(chunk.attempt_count, 1)
+        # Simulate a worker killed during the last attempt
+        chunk.attempt_count = 2
+
+        self.env['hr.payslip.run.chunk']._cron_compute_payslip_chunks()
+        self.assertEqual(chunk.state, 'failed')
+        self.assertFalse(chunk.slip_ids.line_ids)
+        self.assertTrue((payslips - chunk.slip_ids).line_ids)
+        self.assertEqual(payslip_run.computation_state, 'failed')
@@ -177,8 +177,13 @@ class HrPayslipEmployees(models.TransientModel):
             payslips_vals.append(values)
         payslips = Payslip.with_context(tracking_disable=True).create(payslips_vals)
         payslips._compute_name()
-        payslips.compute_sheet()
-        payslip_run.slip_ids.write({'state': 'verify'})
+        computed_payslips = payslip_run.slip_ids
+        if payslip_run._compute_payslips_by_chunks(payslips):
+            # The payslips computed in the background stay in draft until their chunk is computed.
+            computed_payslips -= payslips
+        else:
+            payslips.compute_sheet()
+        computed_payslips.write({'state': 'verify'})
         payslip_run.state = 'verify'
 
         return success_result
@@ -17,7 +17,7 @@ from odoo.exceptions import AccessError, ValidationError, UserError
 from odoo.osv import expression
 from odoo.tools import get_lang, is_html_empty, OrderedSet
 from odoo.tools.translate import html_translate
-from odoo.tools.sql import create_index, make_index_name, SQL
+from odoo.tools.sql import column_exists, create_index, drop_index, make_index_name, SQL
 
 ARTICLE_PERMISSION_LEVEL = {'none': 0, 'read': 1, 'write': 2}
 
@@ -255,19 +255,43 @@ class Article(models.Model):
                     WITH knowledge_dictionary;
             """)
 
-            # 4. Add an index to speed up the @@ match operation:
-            #
-            # When searching in a large collection of articles, the search can
-            # quickly become slow as the database has to parse the body of all
-            # articles. To speed up the search, we will use an index to quickly
-            # find potential candidates matching with the given search terms.
-
-            create_index(
-                self.env.cr,
-                make_index_name(self._table, 'body'),
-                self._table,
-                ["to_tsvector('knowledge_config', body)"],
-                method='GIN')
+        # 4. Store the text search vector of the articles:
+        #
+        # Parsing the body of all the matching articles at search time is too
+        # slow on large collections. The title (weight A) and the body (weight
+        # D) of each article are thus parsed once, when they are written, into
+        # a `search_vector` column maintained by a trigger. The HTML tags of the
+        # body are dropped by the parser of `knowledge_config`. The column is
+        # indexed to quickly find the candidates matching the search terms.
+
+        is_new_column = not column_exists(self.env.cr, self._table, 'search_vector')
+        self.env.cr.execute("""
+            ALTER TABLE knowledge_article ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+            CREATE OR REPLACE FUNCTION knowledge_article_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('knowledge_config', COALESCE(NEW.name, '')), 'A') ||
+                    setweight(to_tsvector('knowledge_config', COALESCE(NEW.body, '')), 'D');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS knowledge_article_search_vector_trigger ON knowledge_article;
+            CREATE TRIGGER knowledge_article_search_vector_trigger
+                BEFORE INSERT OR UPDATE OF name, body ON knowledge_article
+                FOR EACH ROW EXECUTE FUNCTION knowledge_article_search_vector_update();
+        """)
+        if is_new_column:
+            # Fire the trigger to fill the column of the existing articles.
+            self.env.cr.execute("UPDATE knowledge_article SET name = name")
+        create_index(
+            self.env.cr,
+            make_index_name(self._table, 'search_vector'),
+            self._table,
+            ['search_vector'],
+            method='GIN')
+        drop_index(self.env.cr, make_index_name(self._table, 'body'), self._table)
 
     # ------------------------------------------------------------
     # CONSTRAINTS
@@ -472,17 +496,14 @@ class Article(models.Model):
         if not toupdate:
             return
 
-        articles_permissions = {}
-        if not self.env.user.share:
-            articles_permissions = self._get_internal_permission()
-        member_permissions = self._get_partner_member_permissions(self.env.user.partner_id)
-        for article in self:
+        member_permissions = toupdate._get_partner_member_permissions(self.env.user.partner_id)
+        for article, article_sudo in zip(toupdate, toupdate.sudo()):
             article_id = article.ids[0]
             if self.env.user.share:
                 article.user_permission = member_permissions.get(article_id, False)
             else:
                 article.user_permission = member_permissions.get(article_id, False) \
-                                          or articles_permissions[article_id]
+                                          or article_sudo.inherited_permission
 
     @api.depends_context('uid')
     @api.depends('user_permission')
@@ -521,11 +542,12 @@ class Article(models.Model):
         if self.env.user.share:
             return [('id', op, list(articles_with_member_access))]
 
-        # sudo reason: we're already computing ir.rules, avoid re-applying it.
-        articles_with_access = Article.with_context(active_test=False).sudo().search([('inherited_permission', 'in', ('read', 'write'))])
-        articles_with_no_member_access = member_permissions.keys() - articles_with_member_access
-        article_ids = list((set(articles_with_access.ids) - articles_with_no_member_access) | articles_with_member_access)
-        return [('id', op, article_ids)]
+        articles_with_no_member_access = list(member_permissions.keys() - articles_with_member_access)
+        domain = expression.OR([
+            [('id', 'in', list(articles_with_member_access))],
+            [('inherited_permission', 'in', ('read', 'write')), ('id', 'not in', articles_with_no_member_access)],
+        ])
+        return domain if is_positive_search else ['!', *expression.normalize_domain(domain)]
 
     @api.depends_context('uid')
     @api.depends('user_has_access', 'parent_id.user_has_access_parent_path')
@@ -560,7 +582,6 @@ class Article(models.Model):
                 return expression.FALSE_DOMAIN
             return expression.TRUE_DOMAIN
 
-        articles_with_access = KnowledgeArticle._get_internal_permission(filter_domain=[('internal_permission', '=', 'write')])
         member_permissions = KnowledgeArticle._get_partner_member_permissions(self.env.user.partner_id)
         articles_with_member_access = [article_id for article_id, perm in member_permissions.items() if perm == 'write']
         articles_with_no_member_access = list(set(member_permissions.keys() - set(articles_with_member_access)))
@@ -568,12 +589,12 @@ class Article(models.Model):
         # If searching articles for which user has write access.
         if (value and operator == '=') or (not value and operator == '!='):
             return ['|',
-                        '&', ('id', 'in', list(articles_with_access.keys())), ('id', 'not in', articles_with_no_member_access),
+                        '&', ('inherited_permission', '=', 'write'), ('id', 'not in', articles_with_no_member_access),
                         ('id', 'in', articles_with_member_access)
             ]
         # If searching articles for which user has NO write access.
         return ['|',
-                    '&', ('id', 'not in', list(articles_with_access.keys())), ('id', 'not in', articles_with_member_access),
+                    '&', ('inherited_permission', '!=', 'write'), ('id', 'not in', articles_with_member_access),
                     ('id', 'in', articles_with_no_member_access)
         ]
 
@@ -959,6 +980,15 @@ class Article(models.Model):
         if any(articles.mapped('is_template')) and not self.env.user.has_group('base.group_system'):
             raise ValidationError(_('You are not allowed to create a new template.'))
 
+        # inherit the members of the parents, the articles created with members
+        # are already refreshed by the member model, with their parents
+        self.env['knowledge.article.member.permission']._refresh(self.browse([
+            article.id for article, vals in zip(articles, vals_list)
+            if article.parent_id and not any(
+                command[0] == Command.CREATE for command in vals.get('article_member_ids') or []
+            )
+        ]))
+
         return articles
 
     def write(self, vals):
@@ -1005,8 +1035,17 @@ class Article(models.Model):
             else:
                 _resequence = True
 
+        # the members inherited by the articles and their descendants may change
+        to_refresh = self.env['knowledge.article']
+        if 'parent_id' in vals:
+            to_refresh |= self.filtered(lambda article: article.parent_id.id != (vals['parent_id'] or False))
+        if 'is_desynchronized' in vals:
+            to_refresh |= self.filtered(lambda article: article.is_desynchronized != bool(vals['is_desynchronized']))
+
         result = super(Article, self).write(vals)
 
+        self.env['knowledge.article.member.permission']._refresh(to_refresh)
+
         # resequence only if a sequence was not already computed based on current
         # parent maximum to avoid unnecessary recomputation of sequences
         if _resequence:
@@ -1565,27 +1604,17 @@ class Article(models.Model):
             otherwise, it returns all the hidden articles the user has access to,
             not exceeding the limit.
 
-            To reduce the query runtime, the search method limits the number of
-            candidates to consider using the `knowledge.fts_search_cut_off`
-            configuration and pre-selects relevant candidates incrementally
-            using CTE queries.
+            The search method ranks first the articles matching with the title
+            and the body, then the articles matching with the title only and,
+            finally, the articles matching with the body only. Within each group,
+            the articles are ranked using the frequency and the co-occurrence of
+            the search terms (see `ts_rank_cd`).
 
-            The search method pre-selects first articles matching with the title
-            and the body, then articles matching with the title only and, finally,
-            articles matching with the body only. The search method stops adding
-            new candidates when the maximum number of candidates is reached.
-
-            After that, the search method ranks the selected articles using a
-            scoring function and return the most relevant ones. With that approach,
-            the query should return relevant results in reasonable time.
-
-            - If the number of overall matches is lower than the configured cut
-              off, the query returns the top-k matches of the database.
-            - If the number of overall matches is greater than the configured cut
-              off, we consider that the search terms are too broad and we don't
-              consider all potential candidates to reduce the query runtime. As
-              we pre-select relevant matches first, the query should return
-              relevant results but not necessarily the most relevant ones.
+            The candidates are found and ranked with the stored `search_vector`
+            of the articles (see `init`), without parsing their body. All the
+            matching articles are thus ranked, and the query returns the top-k
+            matches of the database even for broad search terms. Only the body
+            of the returned articles is parsed, to build their headline.
 
         :param str search_query: Search terms of the user
         :param int limit: Maximal number of records to return
@@ -1609,90 +1638,71 @@ class Article(models.Model):
             ])
 
         query = self._search(domain)
+        # The search vector is updated by the database when the title and the body are written.
+        self.flush_model(['name', 'body'])
 
         # Escape special characters recognized by the 'ILIKE' keyword
         search_pattern = '%' + re.sub(r'(%|_|\\)', r'\\\1', search_query) + '%'
         ts_query = SQL("plainto_tsquery('knowledge_config', %(search_query)s)", search_query=search_query)
-        cut_off = max(self.env['ir.config_parameter'].sudo().get_param('knowledge.fts_search_cut_off', 100), limit)
 
         self.env.cr.execute(SQL('''
             WITH
-            articles_matching_with_title_and_body AS (
+            matching_articles AS (
                 SELECT knowledge_article.id AS id,
-                       1 AS order,
-                       ts_rank_cd(to_tsvector('knowledge_config', knowledge_article.name), %(ts_query)s) AS score
+                       knowledge_article.search_vector AS search_vector,
+                       knowledge_article.name ILIKE %(search_pattern)s AS title_match,
+                       ts_filter(knowledge_article.search_vector, '{d}') @@ %(ts_query)s AS body_match
                   FROM knowledge_article
-                 WHERE knowledge_article.name ILIKE %(search_pattern)s
-                   AND to_tsvector('knowledge_config', knowledge_article.body) @@ %(ts_query)s
+                 WHERE (knowledge_article.name ILIKE %(search_pattern)s
+                        OR knowledge_article.search_vector @@ %(ts_query)s)
                    AND %(sql_where_clause)s
-                 LIMIT %(cut_off)s
             ),
-            articles_matching_with_title AS (
-                SELECT knowledge_article.id AS id,
-                       2 AS order,
-                       1 AS score
-                  FROM knowledge_article
-                 WHERE knowledge_article.name ILIKE %(search_pattern)s
-                   AND knowledge_article.id NOT IN (
-                       SELECT id FROM articles_matching_with_title_and_body)
-                   AND %(sql_where_clause)s
-                 LIMIT %(cut_off)s
-                    - (SELECT COUNT(*) FROM articles_matching_with_title_and_body)
-            ),
-            articles_matching_with_body AS (
-                SELECT knowledge_article.id AS id,
-                       3 AS order,
-                       ts_rank_cd(to_tsvector('knowledge_config', knowledge_article.body), %(ts_query)s) AS score
-                  FROM knowledge_article
-                 WHERE to_tsvector('knowledge_config', knowledge_article.body) @@ %(ts_query)s
-                   AND knowledge_article.id NOT IN (
-                        SELECT id FROM articles_matching_with_title_and_body
-                        UNION ALL
-                        SELECT id FROM articles_matching_with_title)
-                   AND %(sql_where_clause)s
-                 LIMIT %(cut_off)s
-                    - (SELECT COUNT(*) FROM articles_matching_with_title_and_body)
-                    - (SELECT COUNT(*) FROM articles_matching_with_title)
-            ),
-            all_matching_articles AS (
-                SELECT * FROM articles_matching_with_title_and_body
-                UNION ALL
-                SELECT * FROM articles_matching_with_title
-                UNION ALL
-                SELECT * FROM articles_matching_with_body
+            ranked_articles AS (
+                SELECT matching_articles.id AS id,
+                       matching_articles.body_match AS body_match,
+                       CASE WHEN title_match AND body_match THEN 1
+                            WHEN title_match THEN 2
+                            ELSE 3 END AS match_order,
+                       CASE WHEN title_match AND body_match
+                                THEN ts_rank_cd(ts_filter(search_vector, '{a}'), %(ts_query)s)
+                            WHEN title_match THEN 1
+                            ELSE ts_rank_cd(ts_filter(search_vector, '{d}'), %(ts_query)s) END AS score,
+                       COALESCE(CAST(article_favorite.id AS BOOLEAN), FALSE) AS is_user_favorite
+                  FROM matching_articles
+             LEFT JOIN knowledge_article_favorite article_favorite
+                    ON matching_articles.id = article_favorite.article_id
+                   AND article_favorite.user_id = %(user_id)s
+                 WHERE title_match OR body_match
+              ORDER BY match_order ASC, score DESC, is_user_favorite DESC, id DESC
+                 LIMIT %(limit)s
             )
             SELECT
                 knowledge_article.id,
                 knowledge_article.icon,
                 knowledge_article.name,
-                CASE WHEN to_tsvector('knowledge_config', knowledge_article.body) @@ %(ts_query)s
+                CASE WHEN ranked_articles.body_match
                      THEN ts_headline('knowledge_config', knowledge_article.body, %(ts_query)s,
                             'StartSel=<strong>, StopSel=</strong>, MaxWords=20, MinWords=10, MaxFragments=3')
                      ELSE NULL END AS "headline",
-                COALESCE(CAST(article_favorite.id AS BOOLEAN), FALSE) AS is_user_favorite,
+                ranked_articles.is_user_favorite,
                 knowledge_article.root_article_id,
                 root_article.id AS root_article_id,
                 root_article.icon AS root_article_icon,
                 root_article.name AS root_article_name
-              FROM all_matching_articles
-         LEFT JOIN knowledge_article
-                ON knowledge_article.id = all_matching_articles.id
+              FROM ranked_articles
+              JOIN knowledge_article
+                ON knowledge_article.id = ranked_articles.id
          LEFT JOIN knowledge_article AS root_article
                 ON knowledge_article.root_article_id = root_article.id
-         LEFT JOIN knowledge_article_favorite article_favorite
-                ON knowledge_article.id = article_favorite.article_id
-               AND article_favorite.user_id = %(user_id)s
-          ORDER BY all_matching_articles.order ASC,
-                   all_matching_articles.score DESC,
-                   is_user_favorite DESC,
+          ORDER BY ranked_articles.match_order ASC,
+                   ranked_articles.score DESC,
+                   ranked_articles.is_user_favorite DESC,
                    knowledge_article.id DESC
-             LIMIT %(limit)s
             ''',
             sql_where_clause=query.where_clause,
             search_pattern=search_pattern,
             ts_query=ts_query,
             user_id=self.env.user.id,
-            cut_off=cut_off,
             limit=limit
         ))
 
@@ -2337,43 +2347,19 @@ class Article(models.Model):
         """ Retrieve the permission for the given partner for all articles.
         The articles can be filtered using the article_ids param.
 
-        The member model is fully flushed before running the request. """
-        self.env['knowledge.article'].flush_model()
-        self.env['knowledge.article.member'].flush_model()
-
+        The permissions are read from the effective member permissions, kept
+        up to date when the members or the hierarchy of the articles change
+        (see ``knowledge.article.member.permission``). """
         if self.ids:
-            where_domain = SQL("WHERE id in %s", tuple(self.ids))
+            where_domain = SQL("AND article_id IN %s", tuple(self.ids))
         else:
             where_domain = SQL()
 
         return dict(self.env.execute_query(SQL('''
-            WITH RECURSIVE membered_articles AS (
-                -- base case: all articles the partner is member of
-                SELECT a.id,
-                       a.parent_id,
-                       a.is_desynchronized,
-                       m.permission
-                FROM knowledge_article AS a
-                     JOIN knowledge_article_member AS m ON a.id = m.article_id
-                WHERE m.partner_id = %(partner_id)s
-
-                UNION ALL
-                -- recurse into each child, that is not desync, and the partner is not a member of,
-                -- to propagate the member permission
-                SELECT a.id,
-                       a.parent_id,
-                       a.is_desynchronized,
-                       m.permission
-                FROM membered_articles AS m
-                     JOIN knowledge_article AS a ON m.id = a.parent_id
-                WHERE a.is_desynchronized IS NOT TRUE
-                  AND NOT EXISTS (SELECT 1
-                                  FROM knowledge_article_member AS mm
-                                  WHERE mm.article_id = a.id
-                                    AND mm.partner_id = %(partner_id)s))
-            SELECT id AS article_id, permission
-            FROM membered_articles
-            %(where_domain)s
+            SELECT article_id, permission
+              FROM knowledge_article_member_permission
+             WHERE partner_id = %(partner_id)s
+                   %(where_domain)s
             ''',
             partner_id=partner.id,
             where_domain=where_domain,
@@ -2413,7 +2399,7 @@ class Article(models.Model):
 
         article_ids_clause = SQL()
         if self.ids:
-            article_ids_clause = SQL('WHERE id IN %s', tuple(self.ids))
+            article_ids_clause = SQL('WHERE p.article_id IN %s', tuple(self.ids))
 
         alias = 'ef'
         select_fields_clause = SQL()
@@ -2459,52 +2445,16 @@ class Article(models.Model):
                 join_clauses = SQL('\n').join(joins.values())
 
         query = SQL("""
-            WITH RECURSIVE
-                article_hierarchy     AS (
-                    SELECT id,
-                           id AS ancestor_id,
-                           parent_id,
-                           is_desynchronized,
-                           0  AS inheritance_level
-                      FROM knowledge_article
-                      %(article_ids_clause)s
-
-                     UNION ALL
-
-                    SELECT child.id,
-                           parent.id AS ancestor_id,
-                           parent.parent_id,
-                           parent.is_desynchronized,
-                           child.inheritance_level + 1
-                      FROM article_hierarchy AS child
-                      JOIN knowledge_article AS parent ON parent.id = child.parent_id
-                     WHERE child.is_desynchronized IS NOT TRUE
-                ),
-                article_memberships   AS (
-                    SELECT h.id          AS target_article_id,
-                           h.ancestor_id AS source_article_id,
-                           m.id          AS member_id,
-                           m.permission,
-                           m.partner_id,
-                           h.inheritance_level
-                      FROM article_hierarchy h
-                      JOIN knowledge_article_member m ON m.article_id = h.ancestor_id
-                ),
+            WITH
                 effective_memberships AS (
-                    SELECT target_article_id,
-                           source_article_id,
-                           member_id,
-                           permission,
-                           partner_id
-                      FROM (
-                          SELECT *,
-                                 RANK() OVER (
-                                     PARTITION BY target_article_id, partner_id
-                                     ORDER BY inheritance_level ASC
-                                     ) AS priority_rank
-                            FROM article_memberships
-                      ) ranked_memberships
-                     WHERE priority_rank = 1
+                    SELECT p.article_id AS target_article_id,
+                           m.article_id AS source_article_id,
+                           p.member_id,
+                           p.permission,
+                           p.partner_id
+                      FROM knowledge_article_member_permission p
+                      JOIN knowledge_article_member m ON m.id = p.member_id
+                      %(article_ids_clause)s
                 )
             SELECT %(alias)s.*
                    %(select_fields_clause)s
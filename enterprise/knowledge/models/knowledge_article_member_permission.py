@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+
+class ArticleMemberPermission(models.Model):
+    """ Effective permission of the members of the articles.
+
+    The members of an article also apply to its descendants, down to the first
+    desynchronized article, unless a descendant has its own membership for the
+    same partner. Resolving that inheritance requires walking up the tree for
+    every article, which is too slow to do on every access check. The effective
+    membership of each partner on each article is thus stored in this table,
+    with the membership it comes from.
+
+    The table is only written in SQL by ``_refresh``, called when the members,
+    the parent or the synchronization of articles change, on the updated
+    articles and their descendants. """
+    _name = 'knowledge.article.member.permission'
+    _description = 'Article Effective Member Permission'
+    _log_access = False
+
+    article_id = fields.Many2one(
+        'knowledge.article', 'Article',
+        index=True, ondelete='cascade', readonly=True, required=True)
+    partner_id = fields.Many2one(
+        'res.partner', 'Partner',
+        ondelete='cascade', readonly=True, required=True)
+    member_id = fields.Many2one(
+        'knowledge.article.member', 'Membership',
+        index=True, ondelete='cascade', readonly=True, required=True)
+    permission = fields.Selection(
+        [('write', 'Can edit'),
+         ('read', 'Can read'),
+         ('none', 'No access')],
+        readonly=True, required=True)
+
+    _sql_constraints = [
+        ('unique_partner_article',
+         'unique(partner_id, article_id)',
+         'A partner can only have one effective permission per article.')
+    ]
+
+    def init(self):
+        super().init()
+        self.env.cr.execute(SQL("SELECT 1 FROM %s LIMIT 1", SQL.identifier(self._table)))
+        if not self.env.cr.rowcount:
+            self._refresh_from_query(SQL("SELECT id FROM knowledge_article"))
+
+    @api.model
+    def _refresh(self, articles):
+        """ Recompute the effective member permissions of the given articles
+        and of all their descendants. """
+        if not articles:
+            return
+        self.env['knowledge.article'].flush_model(['parent_id', 'parent_path', 'is_desynchronized'])
+        self.env['knowledge.article.member'].flush_model(['article_id', 'partner_id', 'permission'])
+        # descendants are read from the parent path in the same query, rather
+        # than with a 'child_of' search reading the paths of the articles first
+        self._refresh_from_query(SQL("""
+            SELECT descendant.id
+              FROM knowledge_article AS descendant
+             WHERE descendant.parent_path LIKE ANY(
+                       SELECT article.parent_path || '%%'
+                         FROM knowledge_article AS article
+                        WHERE article.id IN %s)
+            """,
+            tuple(articles.ids),
+        ))
+
+    @api.model
+    def _refresh_from_query(self, article_ids_query):
+        self.env.cr.execute(SQL("""
+            DELETE FROM knowledge_article_member_permission
+                  WHERE article_id IN (%(article_ids_query)s);
+
+            WITH RECURSIVE
+                article_hierarchy     AS (
+                    SELECT id,
+                           id AS ancestor_id,
+                           parent_id,
+                           is_desynchronized,
+                           0  AS inheritance_level
+                      FROM knowledge_article
+                     WHERE id IN (%(article_ids_query)s)
+
+                     UNION ALL
+
+                    SELECT child.id,
+                           parent.id AS ancestor_id,
+                           parent.parent_id,
+                           parent.is_desynchronized,
+                           child.inheritance_level + 1
+                      FROM article_hierarchy AS child
+                      JOIN knowledge_article AS parent ON parent.id = child.parent_id
+                     WHERE child.is_desynchronized IS NOT TRUE
+                ),
+                article_memberships   AS (
+                    SELECT h.id          AS article_id,
+                           m.id          AS member_id,
+                           m.permission,
+                           m.partner_id,
+                           RANK() OVER (
+                               PARTITION BY h.id, m.partner_id
+                               ORDER BY h.inheritance_level ASC
+                           ) AS priority_rank
+                      FROM article_hierarchy h
+                      JOIN knowledge_article_member m ON m.article_id = h.ancestor_id
+                )
+            INSERT INTO knowledge_article_member_permission (article_id, partner_id, member_id, permission)
+                 SELECT article_id, partner_id, member_id, permission
+                   FROM article_memberships
+                  WHERE priority_rank = 1
+            """,
+            article_ids_query=article_ids_query,
+        ))
+        self.invalidate_model()
@@ -387,3 +387,47 @@ class TestKnowledgeArticleFullTextSearch(KnowledgeCommon):
             'is_user_favorite': False,
             'root_article_id': (self.workspace_article_hidden.id, '📄 HR')
         }])
+
+    @users('admin')
+    def test_get_user_sorted_articles_search_vector(self):
+        """ Check that the search vector of the articles is updated when their
+            title or their body are written. """
+        Article = self.env['knowledge.article']
+        article = self.private_article_admin.with_env(self.env)
+        self.assertFalse(Article.get_user_sorted_articles('Lemon'))
+
+        article.body = Markup('<p>Orange, <em>Lemon</em>, etc.</p>')
+        results = Article.get_user_sorted_articles('Lemon')
+        self.assertEqual([result['id'] for result in results], [article.id])
+        self.assertIn('<strong>Lemon</strong>', results[0]['headline'])
+
+        article.name = 'Citrus flavors'
+        self.assertEqual(
+            [(result['id'], result.get('headline')) for result in Article.get_user_sorted_articles('citrus')],
+            [(article.id, None)])
+        self.assertEqual(
+            [result['id'] for result in Article.get_user_sorted_articles('Lemon citrus')], [],
+            msg='The search terms should all match the title or all match the body')
+
+    @users('admin')
+    def test_get_user_sorted_articles_broad_search(self):
+        """ Check that the most relevant articles are returned for broad search
+            terms matching more articles than the limit. """
+        Article = self.env['knowledge.article']
+        articles = Article.create([{
+            'name': f'Meeting notes {index}',
+            'internal_permission': 'write',
+            'body': Markup('<p>The roadmap was discussed.</p>'),
+        } for index in range(150)])
+        # Created last, so that it is not among the first matching rows
+        relevant_article = Article.create({
+            'name': 'Roadmap',
+            'internal_permission': 'write',
+            'body': Markup('<p>Roadmap: the roadmap of the roadmap.</p>'),
+        })
+        self.env['ir.config_parameter'].sudo().set_param('knowledge.fts_search_cut_off', 10)
+
+        results = Article.get_user_sorted_articles('roadmap', limit=5)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0]['id'], relevant_article.id)
+        self.assertTrue(all(result['id'] in articles.ids for result in results[1:]))
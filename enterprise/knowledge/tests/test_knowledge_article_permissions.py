@@ -4,7 +4,7 @@
 from odoo import exceptions
 from odoo.addons.knowledge.tests.common import KnowledgeArticlePermissionsCase
 from odoo.tests.common import tagged, users
-from odoo.tools import mute_logger
+from odoo.tools import mute_logger, SQL
 
 
 @tagged('knowledge_acl')
@@ -768,3 +768,53 @@ class TestKnowledgeArticleSearch(KnowledgeArticlePermissionsCase):
                          'Search on user_has_write_access: aka write access (additional: %s, missing: %s)' %
                          ((articles - expected).mapped('name'), (expected - articles).mapped('name'))
                         )
+
+    def _assert_member_permissions_up_to_date(self, msg):
+        """ Check that the effective member permissions, maintained incrementally,
+        match the ones computed from scratch. """
+        self.env.flush_all()
+        query = SQL("SELECT article_id, partner_id, member_id, permission FROM knowledge_article_member_permission")
+        member_permissions = set(self.env.execute_query(query))
+        self.env.cr.execute("DELETE FROM knowledge_article_member_permission")
+        self.env['knowledge.article.member.permission']._refresh_from_query(SQL("SELECT id FROM knowledge_article"))
+        self.assertEqual(member_permissions, set(self.env.execute_query(query)), msg)
+
+    @mute_logger('odoo.addons.base.models.ir_rule')
+    def test_article_member_permissions_maintenance(self):
+        """ Test the effective member permissions are kept up to date when the
+        hierarchy, the synchronization or the members of the articles change. """
+        self._assert_member_permissions_up_to_date('Initial data')
+
+        shared_root = self.article_roots[2]
+        child = self.env['knowledge.article'].create({'name': 'Shared Child', 'parent_id': shared_root.id})
+        self.assertEqual(
+            child._get_partner_member_permissions(self.partner_employee), {child.id: 'read'},
+            'Members of the parent should apply to a new child')
+        self._assert_member_permissions_up_to_date('Child creation')
+
+        shared_root._add_members(self.partner_employee, 'write')
+        self.assertEqual(child._get_partner_member_permissions(self.partner_employee), {child.id: 'write'})
+        self._assert_member_permissions_up_to_date('Member update')
+
+        shared_root._add_members(self.partner_portal, 'read')
+        self._assert_member_permissions_up_to_date('Member addition')
+
+        portal_member_id = child._get_article_member_permissions()[child.id][self.partner_portal.id]['member_id']
+        child._remove_member(self.env['knowledge.article.member'].browse(portal_member_id))
+        self.assertTrue(child.is_desynchronized)
+        self.assertFalse(child._get_partner_member_permissions(self.partner_portal))
+        self._assert_member_permissions_up_to_date('Member removal from a child')
+
+        child.restore_article_access()
+        self.assertEqual(child._get_partner_member_permissions(self.partner_portal), {child.id: 'read'})
+        self._assert_member_permissions_up_to_date('Access restoration')
+
+        self.article_write_contents_children[0].move_to(parent_id=child.id)
+        self._assert_member_permissions_up_to_date('Move under a shared article')
+
+        self.article_write_contents_children[0].move_to(parent_id=self.article_roots[0].id)
+        self._assert_member_permissions_up_to_date('Move back to the workspace')
+
+        shared_root.article_member_ids.filtered(lambda member: member.partner_id == self.partner_portal).unlink()
+        self.assertFalse(child._get_partner_member_permissions(self.partner_portal))
+        self._assert_member_permissions_up_to_date('Member deletion')
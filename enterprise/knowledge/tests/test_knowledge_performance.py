@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import hashlib
+import logging
+import time
+
 from odoo.addons.knowledge.tests.common import KnowledgeCommonWData, KnowledgeArticlePermissionsCase
 from odoo.tests.common import tagged, users, warmup
-from odoo.tools import mute_logger
+from odoo.tools import mute_logger, SQL
+
+_logger = logging.getLogger(__name__)
 
 
 @tagged('knowledge_performance', 'post_install', '-at_install')
@@ -187,3 +193,53 @@ class KnowledgePerformanceSidebarCase(KnowledgeCommonWData):
 
         with self.assertQueryCount(employee=20):
             self.wkspace_grand_children[0].with_user(self.env.user.id).get_sidebar_articles([self.article_shared.id])
+
+
+@tagged('post_install', '-at_install', '-standard', 'knowledge_benchmark')
+class KnowledgeSearchBenchmark(KnowledgeCommonWData):
+    ARTICLES_COUNT = 500000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        article = cls.env['knowledge.article'].create({
+            'name': 'Benchmark',
+            'internal_permission': 'write',
+            'body': '<p>Benchmark</p>',
+        })
+        Article = cls.env['knowledge.article']
+        columns = [
+            field.name for field in Article._fields.values()
+            if field.store and field.column_type and field.name not in ('id', 'name', 'body')
+        ]
+        # The articles are inserted in SQL, to create them in a reasonable time.
+        # Each article mentions a common word, an uncommon word and a rare word.
+        cls.env.cr.execute(SQL(
+            """
+            INSERT INTO knowledge_article (name, body, %(columns)s)
+                 SELECT 'Article ' || serie.index,
+                        '<p>Weekly report ' || serie.index || ' about project '
+                        || (serie.index %% 1000) || ' and topic ' || md5((serie.index %% 100000)::text) || '</p>',
+                        %(values)s
+                   FROM knowledge_article, generate_series(1, %(count)s) AS serie(index)
+                  WHERE knowledge_article.id = %(article_id)s
+            """,
+            columns=SQL(', ').join(SQL.identifier(column) for column in columns),
+            values=SQL(', ').join(SQL.identifier('knowledge_article', column) for column in columns),
+            count=cls.ARTICLES_COUNT,
+            article_id=article.id,
+        ))
+        cls.env.cr.execute('ANALYZE knowledge_article')
+        cls.rare_word = hashlib.md5(b'42').hexdigest()
+
+    @users('admin')
+    def test_get_user_sorted_articles_benchmark(self):
+        Article = self.env['knowledge.article']
+        for search_query in ('report', 'project 42', self.rare_word, 'Article 4242'):
+            start_time = time.time()
+            results = Article.get_user_sorted_articles(search_query)
+            _logger.info(
+                "Knowledge search of %r in %s articles: %s results in %.3f seconds",
+                search_query, self.ARTICLES_COUNT, len(results), time.time() - start_time,
+            )
+            self.assertTrue(results)
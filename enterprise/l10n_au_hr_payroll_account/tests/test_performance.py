@@ -6,15 +6,17 @@ import time
 
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
+from unittest.mock import patch
 
 from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.hr_payroll.models import hr_salary_rule
 from odoo.tests.common import users, warmup, tagged, new_test_user
 
 _logger = logging.getLogger(__name__)
 
 
-@tagged('post_install_l10n', 'post_install', '-at_install', 'au_payroll_perf')
-class TestPerformance(AccountTestInvoicingCommon):
+class TestPerformanceCommon(AccountTestInvoicingCommon):
+    EMPLOYEES_COUNT = 100
 
     @classmethod
     @AccountTestInvoicingCommon.setup_country('au')
@@ -75,8 +77,6 @@ class TestPerformance(AccountTestInvoicingCommon):
             ]],
         }])
 
-        cls.EMPLOYEES_COUNT = 100
-
         cls.date_from = date(2023, 8, 1)
         cls.date_to = date(2023, 8, 31)
 
@@ -174,6 +174,10 @@ class TestPerformance(AccountTestInvoicingCommon):
             "fund_id": super_fund.id
         } for employee in cls.employees])
 
+
+@tagged('post_install_l10n', 'post_install', '-at_install', 'au_payroll_perf')
+class TestPerformance(TestPerformanceCommon):
+
     @users('admin')
     @warmup
     def test_performance_l10n_au_payroll_whole_flow(self):
@@ -232,3 +236,38 @@ class TestPerformance(AccountTestInvoicingCommon):
             self.assertEqual(stp.state, "sent", "The STP record should be in sent state")
             # --- 0.0 seconds ---
             _logger.info("STP Submission: --- %s seconds ---", time.time() - start_time)
+
+
+@tagged('post_install_l10n', 'post_install', '-at_install', '-standard', 'au_payroll_benchmark')
+class TestPayslipComputationBenchmark(TestPerformanceCommon):
+    EMPLOYEES_COUNT = 5000
+
+    def test_payslip_computation_benchmark(self):
+        self.company._create_ytd_values(self.employees, self.date_from)
+        self.employees.generate_work_entries(self.date_from, self.date_to)
+
+        structure = self.env.ref('l10n_au_hr_payroll.hr_payroll_structure_au_regular')
+        payslips = self.env['hr.payslip'].with_context(allowed_company_ids=self.company.ids).create([{
+            'name': "Test Payslip %i" % i,
+            'employee_id': self.employees[i].id,
+            'contract_id': self.contracts[i].id,
+            'company_id': self.company.id,
+            'struct_id': structure.id,
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+        } for i in range(self.EMPLOYEES_COUNT)])
+
+        SalaryRule = self.env.registry['hr.salary.rule']
+        self.env.registry.clear_cache()
+        with patch.object(hr_salary_rule, 'test_expr', wraps=hr_salary_rule.test_expr) as compile_mock, \
+             patch.object(SalaryRule, '_safe_eval_rule_code', autospec=True, side_effect=SalaryRule._safe_eval_rule_code) as eval_mock:
+            start_time = time.time()
+            payslips.compute_sheet()
+            duration = time.time() - start_time
+
+        _logger.info(
+            "Payslips Computation: %s payslips in %.2f seconds (%.1f payslips/s), %s rule code evaluations, %.2f%% compiled code cache hit rate",
+            len(payslips), duration, len(payslips) / duration, eval_mock.call_count,
+            100 * (1 - compile_mock.call_count / (eval_mock.call_count or 1)),
+        )
+        self.assertLessEqual(compile_mock.call_count, len(structure.rule_ids) * len(hr_salary_rule.RULE_CODE_FIELDS))
@@ -55,3 +55,16 @@ class AccountTestSAFTImport(AccountTestInvoicingCommon):
             len(self.env['account.move'].search(self.env['account.move']._check_company_domain(self.env.company)).line_ids.mapped('tax_ids')),
             1, "The tax is put on the move imported"
         )
+
+    def test_saft_import_chunks(self):
+        """ The moves are imported by chunks, and importing the file again doesn't import them twice. """
+        self.env['ir.config_parameter'].sudo().set_param('account_saft_import.chunk_size', 4)
+        self.test_saft_import()
+
+        wizard = self.env['account.saft.import.wizard'].create({
+            'attachment_id': self.saft_filedata,
+        })
+        action = wizard.action_import()
+        summary = self.env['account.import.summary'].browse(action['res_id'])
+        self.assertFalse(summary.import_summary_move_ids, "The moves already imported should be skipped")
+        self.assertEqual(len(self.env['account.move'].search(self.env['account.move']._check_company_domain(self.env.company))), 12)
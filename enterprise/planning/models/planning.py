@@ -6,7 +6,8 @@ import logging
 import pytz
 import uuid
 from math import modf
-from random import randint, shuffle
+from random import randint
+from time import monotonic
 from werkzeug.urls import url_encode
 
 from odoo import api, fields, models, _
@@ -142,6 +143,32 @@ class Planning(models.Model):
         ('check_allocated_hours_positive', 'CHECK(allocated_hours >= 0)', 'Allocated hours and allocated time percentage cannot be negative.'),
     ]
 
+    def init(self):
+        super().init()
+        # The overlapping shifts of a resource are found with a GiST index on a
+        # box per shift, spanning its period on one axis and located at its
+        # resource on the other: a multicolumn GiST index on the resource and
+        # the period would require the btree_gist extension.
+        self.env.cr.execute(SQL(
+            "CREATE INDEX IF NOT EXISTS planning_slot_resource_period_index ON planning_slot USING gist (%s)",
+            self._get_resource_period_box_sql(),
+        ))
+
+    @api.model
+    def _get_resource_period_box_sql(self, alias=None):
+        """ Return the box indexed by `planning_slot_resource_period_index` for
+        the shifts of the given alias. Two boxes overlap (&&) if the shifts are
+        of the same resource and their periods overlap or are adjacent.
+        """
+        def column(name):
+            return SQL.identifier(alias, name) if alias else SQL.identifier(name)
+        return SQL(
+            "box(point(%(resource)s, date_part('epoch', %(start)s)), point(%(resource)s, date_part('epoch', %(end)s)))",
+            resource=column('resource_id'),
+            start=column('start_datetime'),
+            end=column('end_datetime'),
+        )
+
     @api.depends('role_id.color', 'resource_id.color')
     def _compute_color(self):
         for slot in self:
@@ -306,21 +333,26 @@ class Planning(models.Model):
     @api.depends('start_datetime', 'end_datetime', 'resource_id')
     def _compute_overlap_slot_count(self):
         if all(self._ids):
-            self.flush_model(['start_datetime', 'end_datetime', 'resource_id'])
-            query = """
-                SELECT S1.id,ARRAY_AGG(DISTINCT S2.id) as conflict_ids FROM
-                    planning_slot S1, planning_slot S2
-                WHERE
-                    S1.start_datetime < S2.end_datetime
-                    AND S1.end_datetime > S2.start_datetime
-                    AND S1.id <> S2.id AND S1.resource_id = S2.resource_id
-                    AND S1.allocated_percentage + S2.allocated_percentage > 100
-                    and S1.id in %s
-                    AND (%s or S2.state = 'published')
-                GROUP BY S1.id;
-            """
-            self.env.cr.execute(query, (tuple(self.ids), self.env.user.has_group('planning.group_planning_manager')))
-            overlap_mapping = dict(self.env.cr.fetchall())
+            self.flush_model(['start_datetime', 'end_datetime', 'resource_id', 'allocated_percentage', 'state'])
+            overlap_mapping = dict(self.env.execute_query(SQL(
+                """
+                SELECT s1.id, ARRAY_AGG(DISTINCT s2.id) AS conflict_ids
+                  FROM planning_slot s1
+                  JOIN planning_slot s2
+                    ON %(s1_box)s && %(s2_box)s
+                 WHERE s1.start_datetime < s2.end_datetime
+                   AND s1.end_datetime > s2.start_datetime
+                   AND s1.id <> s2.id AND s1.resource_id = s2.resource_id
+                   AND s1.allocated_percentage + s2.allocated_percentage > 100
+                   AND s1.id IN %(ids)s
+                   AND (%(is_manager)s OR s2.state = 'published')
+              GROUP BY s1.id
+                """,
+                s1_box=self._get_resource_period_box_sql('s1'),
+                s2_box=self._get_resource_period_box_sql('s2'),
+                ids=tuple(self.ids),
+                is_manager=self.env.user.has_group('planning.group_planning_manager'),
+            )))
             for slot in self:
                 slot_result = overlap_mapping.get(slot.id, [])
                 slot.overlap_slot_count = len(slot_result)
@@ -358,19 +390,24 @@ class Planning(models.Model):
         if operator not in ['=', '>'] or not isinstance(value, int) or value != 0:
             raise NotImplementedError(_('Operation not supported, you should always compare overlap_slot_count to 0 value with = or > operator.'))
 
-        sql = SQL("""(
-            SELECT S1.id
-            FROM planning_slot S1
+        sql = SQL(
+            """(
+            SELECT s1.id
+            FROM planning_slot s1
             WHERE EXISTS (
                 SELECT 1
-                  FROM planning_slot S2
-                 WHERE S1.id <> S2.id
-                   AND S1.resource_id = S2.resource_id
-                   AND S1.start_datetime < S2.end_datetime
-                   AND S1.end_datetime > S2.start_datetime
-                   AND S1.allocated_percentage + S2.allocated_percentage > 100
+                  FROM planning_slot s2
+                 WHERE %(s1_box)s && %(s2_box)s
+                   AND s1.id <> s2.id
+                   AND s1.resource_id = s2.resource_id
+                   AND s1.start_datetime < s2.end_datetime
+                   AND s1.end_datetime > s2.start_datetime
+                   AND s1.allocated_percentage + s2.allocated_percentage > 100
             )
-        )""")
+        )""",
+            s1_box=self._get_resource_period_box_sql('s1'),
+            s2_box=self._get_resource_period_box_sql('s2'),
+        )
         operator_new = (operator == ">") and "in" or "not in"
         return [('id', operator_new, sql)]
 
@@ -1132,53 +1169,116 @@ class Planning(models.Model):
             for i in range(delta_days)
         ]
 
-        def find_resource(shift):
+        # Build the availability of the resources for each open shift once. The
+        # resources having the same schedule (same calendar and leaves) can work
+        # the same part of a shift, so it is only computed once per schedule.
+        schedule_index_per_resource_id = {}
+        schedule_indexes = {}
+        capacity_per_resource_id = {}
+        hours_per_day_per_resource_id = {}
+        for resource in resources:
+            schedule_intervals = schedule_intervals_per_resource_id[resource.id]
+            schedule_index_per_resource_id[resource.id] = schedule_indexes.setdefault(
+                tuple((start, end) for start, end, _rec in schedule_intervals), len(schedule_indexes),
+            )
+            capacity_per_resource_id[resource.id] = sum_intervals(schedule_intervals)
+            hours_per_day_per_resource_id[resource.id] = resource.calendar_id.hours_per_day \
+                if resource.calendar_id else resource.company_id.resource_calendar_id.hours_per_day
+        planned_hours_per_resource_id = defaultdict(float)
+        for record in same_days_shifts:
+            planned_hours_per_resource_id[record['resource_id']] += record['allocated_hours']
+
+        candidates_per_shift = {}
+        for shift in open_shifts:
             shift_intervals = Intervals([(
                 shift.start_datetime.astimezone(user_tz),
                 shift.end_datetime.astimezone(user_tz),
                 PlanningShift,
             )])
-            for resources_dict in [resource_ids_per_default_role_id, resource_ids_per_role_id]:
-                resource_ids = resources_dict[shift.role_id.id]
-                shuffle(resource_ids)
-                for resource in Resource.browse(resource_ids):
-                    split_shift_intervals = shift_intervals & schedule_intervals_per_resource_id[resource.id]
+            split_shift_intervals_and_rate_per_schedule_index = {}
+            candidates = []
+            # Resources having the role as default role are prioritized.
+            for priority, resources_dict in enumerate([resource_ids_per_default_role_id, resource_ids_per_role_id]):
+                for resource_id in resources_dict[shift.role_id.id]:
+                    schedule_index = schedule_index_per_resource_id[resource_id]
+                    if schedule_index not in split_shift_intervals_and_rate_per_schedule_index:
+                        split_shift_intervals = shift_intervals & schedule_intervals_per_resource_id[resource_id]
+                        rate = shift.allocated_hours * 3600 / sum(
+                            round((end - start).total_seconds())
+                            for start, end, rec in split_shift_intervals
+                        ) if split_shift_intervals else 0
+                        split_shift_intervals_and_rate_per_schedule_index[schedule_index] = (split_shift_intervals, rate)
+                    split_shift_intervals, rate = split_shift_intervals_and_rate_per_schedule_index[schedule_index]
                     # If the shift is out of resource's schedule, skip it.
-                    if not split_shift_intervals:
-                        continue
-                    rate = shift.allocated_hours * 3600 / sum(
-                        round((end - start).total_seconds())
-                        for start, end, rec in split_shift_intervals
-                    )
-                    # Try to add the shift to the timeline.
-                    timeline = self._get_new_timeline_if_fits_in(
-                        split_shift_intervals,
-                        rate,
-                        resource.calendar_id.hours_per_day if resource.calendar_id else resource.company_id.resource_calendar_id.hours_per_day,
-                        timeline_and_worked_hours_per_resource_id[resource.id].copy(),
-                        empty_timeline,
-                    )
-                    # If we got a new timeline (not False), it means the shift fits for the resource
-                    # (no overload, no "occupation rate" > 100%).
-                    # If it fits, assign the shift to the resource and update the timeline.
-                    # If a timeline is found, the resource can work the allocated_hours set on the shift.
-                    # so the allocated_percentage is recomputed based on the working calendar of the
-                    # resource and the allocated_hours set on the shift.
-                    if timeline:
-                        original_allocated_hours = shift.allocated_hours
-                        shift.resource_id = resource
-                        timeline_and_worked_hours_per_resource_id[resource.id] = timeline
-                        start_utc = pytz.utc.localize(shift.start_datetime)
-                        end_utc = pytz.utc.localize(shift.end_datetime)
-                        resource_work_intervals, calendar_work_intervals = shift.resource_id \
-                            .filtered('calendar_id') \
-                            ._get_valid_work_intervals(start_utc, end_utc, calendars=shift.company_id.resource_calendar_id)
-                        work_hours = shift._get_working_hours_over_period(start_utc, end_utc, resource_work_intervals, calendar_work_intervals)
-                        shift.allocated_percentage = 100 * original_allocated_hours / work_hours if work_hours else 100
-                        return True
-            return False
+                    if split_shift_intervals:
+                        candidates.append((priority, resource_id, split_shift_intervals, rate))
+            candidates_per_shift[shift] = candidates
+
+        # Assign the shifts having the fewest available resources first, each one
+        # to the least loaded available resource (planned hours over the hours of
+        # its schedule in the period), so that the shifts are evenly spread. The
+        # ties are broken on the ids, so that the assignment is deterministic.
+        time_limit = float(self.env['ir.config_parameter'].sudo().get_param('planning.auto_plan_time_limit', 60))
+        deadline = monotonic() + time_limit
+        resource_id_per_shift = {}
+        for shift in sorted(open_shifts, key=lambda shift: (len(candidates_per_shift[shift]), shift.start_datetime, shift.id)):
+            if monotonic() > deadline:
+                _logger.info(
+                    "Auto plan stopped after %s seconds, %s open shifts were left unassigned",
+                    time_limit, len(open_shifts) - len(resource_id_per_shift),
+                )
+                break
+            candidates = sorted(candidates_per_shift[shift], key=lambda candidate: (
+                candidate[0],
+                planned_hours_per_resource_id[candidate[1]] / (capacity_per_resource_id[candidate[1]] or 1),
+                candidate[1],
+            ))
+            for dummy, resource_id, split_shift_intervals, rate in candidates:
+                # Try to add the shift to the timeline.
+                timeline = self._get_new_timeline_if_fits_in(
+                    split_shift_intervals,
+                    rate,
+                    hours_per_day_per_resource_id[resource_id],
+                    timeline_and_worked_hours_per_resource_id[resource_id].copy(),
+                    empty_timeline,
+                )
+                # If we got a new timeline (not False), it means the shift fits for the resource
+                # (no overload, no "occupation rate" > 100%).
+                # If it fits, assign the shift to the resource and update the timeline.
+                if timeline:
+                    resource_id_per_shift[shift] = resource_id
+                    timeline_and_worked_hours_per_resource_id[resource_id] = timeline
+                    planned_hours_per_resource_id[resource_id] += shift.allocated_hours
+                    break
+        if not resource_id_per_shift:
+            return {"open_shift_assigned": []}
 
-        return {"open_shift_assigned": open_shifts.filtered(find_resource).ids}
+        # Assign the shifts in batch. If a timeline is found, the resource can work the allocated_hours
+        # set on the shift, so the allocated_percentage is recomputed based on the working calendar of
+        # the resource and the allocated_hours set on the shift.
+        assigned_shifts = open_shifts.filtered(lambda shift: shift in resource_id_per_shift)
+        original_allocated_hours_per_shift = {shift: shift.allocated_hours for shift in assigned_shifts}
+        shift_ids_per_resource_id = defaultdict(list)
+        for shift, resource_id in resource_id_per_shift.items():
+            shift_ids_per_resource_id[resource_id].append(shift.id)
+        for resource_id, shift_ids in shift_ids_per_resource_id.items():
+            PlanningShift.browse(shift_ids).resource_id = resource_id
+        start_utc = pytz.utc.localize(min(assigned_shifts.mapped('start_datetime')))
+        end_utc = pytz.utc.localize(max(assigned_shifts.mapped('end_datetime')))
+        resource_work_intervals, calendar_work_intervals = assigned_shifts.resource_id \
+            .filtered('calendar_id') \
+            ._get_valid_work_intervals(start_utc, end_utc, calendars=assigned_shifts.company_id.resource_calendar_id)
+        shift_ids_per_allocated_percentage = defaultdict(list)
+        for shift in assigned_shifts:
+            work_hours = shift._get_working_hours_over_period(
+                pytz.utc.localize(shift.start_datetime), pytz.utc.localize(shift.end_datetime),
+                resource_work_intervals, calendar_work_intervals,
+            )
+            allocated_percentage = 100 * original_allocated_hours_per_shift[shift] / work_hours if work_hours else 100
+            shift_ids_per_allocated_percentage[allocated_percentage].append(shift.id)
+        for allocated_percentage, shift_ids in shift_ids_per_allocated_percentage.items():
+            PlanningShift.browse(shift_ids).allocated_percentage = allocated_percentage
+        return {"open_shift_assigned": assigned_shifts.ids}
 
 # A. Represent the resoures shifts and the open shift on a timeline
 #   Legend
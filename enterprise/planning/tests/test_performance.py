@@ -0,0 +1,140 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details
+import logging
+import statistics
+import time
+from collections import Counter
+from datetime import datetime
+
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install', '-standard', 'planning_benchmark')
+class TestPlanningOverlapBenchmark(TransactionCase):
+    RESOURCES_COUNT = 2000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.resources = cls.env['resource.resource'].create([{
+            'name': f'Resource {index}',
+            'resource_type': 'material',
+            'calendar_id': False,
+        } for index in range(cls.RESOURCES_COUNT)])
+        cls.template_slot = cls.env['planning.slot'].create({
+            'start_datetime': datetime(2018, 1, 1, 8, 0),
+            'end_datetime': datetime(2018, 1, 1, 17, 0),
+        })
+
+    def _insert_slots(self, date_from, date_to):
+        """ Insert one shift per resource and per day between both dates, and
+        a conflicting shift on the 15th of each month, in SQL to create them in
+        a reasonable time. Return the number of slots in conflict.
+        """
+        PlanningSlot = self.env['planning.slot']
+        columns = [
+            field.name for field in PlanningSlot._fields.values()
+            if field.store and field.column_type
+            and field.name not in ('id', 'resource_id', 'start_datetime', 'end_datetime')
+        ]
+        for start_hour, end_hour, days_filter in ((8, 17, SQL("TRUE")), (12, 14, SQL("date_part('day', day) = 15"))):
+            self.env.cr.execute(SQL(
+                """
+                INSERT INTO planning_slot (resource_id, start_datetime, end_datetime, %(columns)s)
+                     SELECT resource.id,
+                            day + make_interval(hours => %(start_hour)s),
+                            day + make_interval(hours => %(end_hour)s),
+                            %(values)s
+                       FROM planning_slot,
+                            unnest(%(resource_ids)s) AS resource(id),
+                            generate_series(%(date_from)s::timestamp, %(date_to)s::timestamp, interval '1 day') AS day
+                      WHERE planning_slot.id = %(template_id)s
+                        AND %(days_filter)s
+                """,
+                columns=SQL(', ').join(SQL.identifier(column) for column in columns),
+                values=SQL(', ').join(SQL.identifier('planning_slot', column) for column in columns),
+                start_hour=start_hour,
+                end_hour=end_hour,
+                resource_ids=self.resources.ids,
+                date_from=date_from,
+                date_to=date_to,
+                template_id=self.template_slot.id,
+                days_filter=days_filter,
+            ))
+        # each conflicting shift conflicts with the shift of its day
+        return 2 * self.env.cr.rowcount
+
+    def test_search_overlap_slot_count_benchmark(self):
+        PlanningSlot = self.env['planning.slot']
+        conflicts_count = 0
+        durations = []
+        for date_from, date_to in ((datetime(2019, 1, 1), datetime(2019, 6, 30)), (datetime(2019, 7, 1), datetime(2019, 12, 31))):
+            conflicts_count += self._insert_slots(date_from, date_to)
+            self.env.cr.execute('ANALYZE planning_slot')
+            slots_count = PlanningSlot.search_count([])
+            start_time = time.time()
+            conflicting_slots_count = PlanningSlot.search_count([('overlap_slot_count', '>', 0)])
+            durations.append(time.time() - start_time)
+            _logger.info(
+                "Planning conflicts in %s slots: %s conflicting slots found in %.3f seconds",
+                slots_count, conflicting_slots_count, durations[-1],
+            )
+            self.assertEqual(conflicting_slots_count, conflicts_count)
+        _logger.info("Planning conflicts detection time ratio for twice the slots: %.2f", durations[1] / durations[0])
+
+
+@tagged('post_install', '-at_install', '-standard', 'planning_benchmark')
+class TestPlanningAutoPlanBenchmark(TransactionCase):
+    RESOURCES_COUNT = 500
+    OPEN_SHIFTS_PER_DAY = 600
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        calendar = cls.env['resource.calendar'].create({
+            'name': 'Benchmark Calendar',
+            'tz': 'UTC',
+            'hours_per_day': 9.0,
+            'attendance_ids': [
+                (0, 0, {'name': 'Day ' + str(day), 'dayofweek': str(day), 'hour_from': 8, 'hour_to': 17, 'day_period': 'morning'})
+                for day in range(5)
+            ],
+        })
+        cls.role = cls.env['planning.role'].create({'name': 'Benchmark Role'})
+        cls.resources = cls.env['resource.resource'].create([{
+            'name': f'Resource {index}',
+            'resource_type': 'material',
+            'calendar_id': calendar.id,
+            'default_role_id': cls.role.id,
+        } for index in range(cls.RESOURCES_COUNT)])
+        # A week of morning and afternoon open shifts, which can all be assigned.
+        cls.open_shifts = cls.env['planning.slot'].create([{
+            'start_datetime': datetime(2024, 1, day, 8 if index % 2 else 13, 0),
+            'end_datetime': datetime(2024, 1, day, 12 if index % 2 else 17, 0),
+            'role_id': cls.role.id,
+        } for day in range(8, 13) for index in range(cls.OPEN_SHIFTS_PER_DAY)])
+
+    def test_auto_plan_ids_benchmark(self):
+        PlanningSlot = self.env['planning.slot'].with_context(
+            default_start_datetime='2024-01-08 00:00:00',
+            default_end_datetime='2024-01-14 23:59:59',
+        )
+        start_time = time.time()
+        shifts_data = PlanningSlot.auto_plan_ids([('id', 'in', self.open_shifts.ids)])
+        self.env.flush_all()
+        duration = time.time() - start_time
+        self.assertEqual(len(shifts_data['open_shift_assigned']), len(self.open_shifts))
+
+        shifts_count_per_resource = Counter(shift.resource_id.id for shift in self.open_shifts)
+        shifts_counts = [shifts_count_per_resource[resource.id] for resource in self.resources]
+        _logger.info(
+            "Auto plan of %s open shifts on %s resources: %.3f seconds (%.1f shifts per second)",
+            len(self.open_shifts), len(self.resources), duration, len(self.open_shifts) / duration,
+        )
+        _logger.info(
+            "Auto plan fairness: between %s and %s shifts per resource (mean %.2f, standard deviation %.2f)",
+            min(shifts_counts), max(shifts_counts), statistics.mean(shifts_counts), statistics.pstdev(shifts_counts),
+        )
+        self.assertLessEqual(max(shifts_counts) - min(shifts_counts), 1)
@@ -240,6 +240,44 @@ class TestPlanning(TestCommonPlanning, MockEmail):
         self.assertEqual(2, self.slot_6_2.overlap_slot_count, '2 slots overlap')
         self.assertEqual(0, self.slot_6_3.overlap_slot_count, 'no slot overlap')
 
+    def test_search_overlap_slot_count(self):
+        slot_1, slot_2, slot_3, slot_4, slot_5 = self.env['planning.slot'].create([{
+            'resource_id': self.resource_bert.id,
+            'start_datetime': datetime(2019, 6, 2, 8, 0),
+            'end_datetime': datetime(2019, 6, 2, 12, 0),
+        }, {
+            'resource_id': self.resource_bert.id,
+            'start_datetime': datetime(2019, 6, 2, 11, 0),
+            'end_datetime': datetime(2019, 6, 2, 13, 0),
+        }, {
+            # adjacent to slot_2
+            'resource_id': self.resource_bert.id,
+            'start_datetime': datetime(2019, 6, 2, 13, 0),
+            'end_datetime': datetime(2019, 6, 2, 17, 0),
+        }, {
+            # same period as slot_1, for another resource
+            'resource_id': self.resource_joseph.id,
+            'start_datetime': datetime(2019, 6, 2, 8, 0),
+            'end_datetime': datetime(2019, 6, 2, 12, 0),
+        }, {
+            # does not exceed the allocation of slot_4
+            'resource_id': self.resource_joseph.id,
+            'allocated_percentage': 0,
+            'start_datetime': datetime(2019, 6, 2, 9, 0),
+            'end_datetime': datetime(2019, 6, 2, 10, 0),
+        }])
+        slots = slot_1 + slot_2 + slot_3 + slot_4 + slot_5
+        self.env.flush_all()
+        self.assertEqual(slots.filtered_domain([('overlap_slot_count', '>', 0)]), slot_1 + slot_2)
+        self.assertEqual(
+            self.env['planning.slot'].search([('id', 'in', slots.ids), ('overlap_slot_count', '>', 0)]),
+            slot_1 + slot_2,
+        )
+        self.assertEqual(
+            self.env['planning.slot'].search([('id', 'in', slots.ids), ('overlap_slot_count', '=', 0)]),
+            slot_3 + slot_4 + slot_5,
+        )
+
     def test_compute_datetime_with_template_slot(self):
         """ Test if the start and end datetimes of a planning.slot are correctly computed with the template slot
 
@@ -587,6 +625,53 @@ class TestPlanning(TestCommonPlanning, MockEmail):
         self.assertEqual(night_shift.allocated_hours, 8, 'The allocated hours should remain the same')
         self.assertEqual(night_shift.allocated_percentage, 100, 'The allocated percentage should be 100% as the resource will work the allocated hours')
 
+    def test_auto_plan_spreads_shifts_evenly(self):
+        """ Test that auto-planning several open shifts spreads them evenly and deterministically
+            between the resources having the role.
+        """
+        calendar = self.env['resource.calendar'].create({
+            'name': 'Day Calendar',
+            'tz': 'UTC',
+            'hours_per_day': 9.0,
+            'attendance_ids': [
+                (0, 0, {'name': 'Day ' + str(day), 'dayofweek': str(day), 'hour_from': 8, 'hour_to': 17, 'day_period': 'morning'})
+                for day in range(5)
+            ],
+        })
+        role = self.env['planning.role'].create({'name': 'test role'})
+        employee_1, employee_2 = self.env['hr.employee'].create([{
+            'name': name,
+            'tz': 'UTC',
+            'resource_calendar_id': calendar.id,
+            'default_planning_role_id': role.id,
+        } for name in ('Employee 1', 'Employee 2')])
+        open_shifts = self.env['planning.slot'].create([{
+            'start_datetime': datetime(2024, 1, day, 8, 0),
+            'end_datetime': datetime(2024, 1, day, 12, 0),
+            'role_id': role.id,
+        } for day in range(8, 12)])
+        PlanningSlot = self.env['planning.slot'].with_context(
+            default_start_datetime='2024-01-08 00:00:00',
+            default_end_datetime='2024-01-14 23:59:59',
+        )
+
+        shifts_data = PlanningSlot.auto_plan_ids([('id', 'in', open_shifts.ids)])
+        self.assertEqual(sorted(shifts_data['open_shift_assigned']), open_shifts.ids)
+        self.assertEqual(
+            [shift.resource_id for shift in open_shifts],
+            [employee_1.resource_id, employee_2.resource_id] * 2,
+            'The shifts should be assigned alternately to the least loaded employee',
+        )
+
+        PlanningSlot.action_rollback_auto_plan_ids(shifts_data)
+        self.assertFalse(open_shifts.resource_id)
+        PlanningSlot.auto_plan_ids([('id', 'in', open_shifts.ids)])
+        self.assertEqual(
+            [shift.resource_id for shift in open_shifts],
+            [employee_1.resource_id, employee_2.resource_id] * 2,
+            'The assignment should be deterministic',
+        )
+
     def test_write_multiple_slots(self):
         """ Test that we can write a resource_id on multiple slots at once. """
         slots = self.env['planning.slot'].create([
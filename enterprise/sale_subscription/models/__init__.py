@@ -15,5 +15,6 @@ from . import sale_order_log
 from . import sale_order
 from . import sale_order_template
 from . import sale_order_option
+from . import sale_subscription_invoice_run
 from . import sale_subscription_plan
 from . import sale_subscription_pricing
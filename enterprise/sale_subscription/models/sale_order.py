@@ -12,7 +12,7 @@ from odoo import fields, models, _, api, Command, SUPERUSER_ID, modules
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools.float_utils import float_is_zero
 from odoo.osv import expression
-from odoo.tools import config, format_amount, format_list, plaintext2html, split_every, str2bool
+from odoo.tools import SQL, config, format_amount, format_list, plaintext2html, split_every, str2bool
 from odoo.tools.misc import format_date
 
 _logger = logging.getLogger(__name__)
@@ -1110,9 +1110,46 @@ class SaleOrder(models.Model):
         self.browse(to_open_ids).update({'state': 'sale', 'subscription_state': '3_progress', 'close_reason_id': False, 'locked': False})
 
     @api.model
-    def _cron_update_kpi(self):
-        subscriptions = self.search([('subscription_state', '=', '3_progress'), ('is_subscription', '=', True)])
-        subscriptions._compute_kpi()
+    def _cron_update_kpi(self, incremental=False):
+        """ Update the MRR KPIs of the subscriptions in progress.
+
+        :param incremental: only update the subscriptions whose KPIs may have changed since the last update, i.e. having a
+            log created since then or whose event date went past one of the KPI periods since then. All the subscriptions are
+            updated if the KPIs were never updated before.
+        """
+        domain = [('subscription_state', '=', '3_progress'), ('is_subscription', '=', True)]
+        ICP = self.env['ir.config_parameter'].sudo()
+        now = fields.Datetime.now()
+        last_update = incremental and ICP.get_param('sale_subscription.kpi_last_update')
+        if last_update:
+            domain.append(('id', 'in', self._get_kpi_outdated_subscription_ids(fields.Datetime.to_datetime(last_update))))
+        self.search(domain)._compute_kpi()
+        ICP.set_param('sale_subscription.kpi_last_update', fields.Datetime.to_string(now))
+
+    @api.model
+    def _get_kpi_outdated_subscription_ids(self, last_update):
+        today = fields.Date.today()
+        last_update_date = last_update.date()
+        # The logs created by the transactions still running during the last update have a create_date before it.
+        self.env['sale.order.log'].flush_model(['order_id', 'event_type', 'event_date', 'create_date'])
+        return [row[0] for row in self.env.execute_query(SQL(
+            """
+                SELECT DISTINCT order_id
+                  FROM sale_order_log
+                 WHERE event_type IN %(event_types)s
+                   AND (
+                        create_date >= %(create_date_from)s
+                        OR event_date > %(last_date_1month)s AND event_date <= %(date_1month)s
+                        OR event_date > %(last_date_3months)s AND event_date <= %(date_3months)s
+                   )
+            """,
+            event_types=('0_creation', '1_expansion', '15_contraction', '2_transfer'),
+            create_date_from=last_update - relativedelta(days=1),
+            last_date_1month=last_update_date - relativedelta(months=1),
+            date_1month=today - relativedelta(months=1),
+            last_date_3months=last_update_date - relativedelta(months=3),
+            date_3months=today - relativedelta(months=3),
+        ))]
 
     def _prepare_upsell_renew_order_values(self, subscription_state):
         """
@@ -1162,15 +1199,59 @@ class SaleOrder(models.Model):
         }
 
     def _compute_kpi(self):
-        for subscription in self:
-            delta_1month = subscription._get_subscription_delta(fields.Date.today() - relativedelta(months=1))
-            delta_3months = subscription._get_subscription_delta(fields.Date.today() - relativedelta(months=3))
-            subscription.write({
-                'kpi_1month_mrr_delta': delta_1month['delta'],
-                'kpi_1month_mrr_percentage': delta_1month['percentage'],
-                'kpi_3months_mrr_delta': delta_3months['delta'],
-                'kpi_3months_mrr_percentage': delta_3months['percentage'],
-            })
+        """ Compute the MRR deltas of the subscriptions over the last month and the last 3 months, like
+        _get_subscription_delta does for a single subscription, with one query for all of them. Only the subscriptions whose
+        KPIs changed are written, grouped by identical values.
+        """
+        today = fields.Date.today()
+        kpi_fields = ['kpi_1month_mrr_delta', 'kpi_1month_mrr_percentage', 'kpi_3months_mrr_delta', 'kpi_3months_mrr_percentage']
+        self.flush_model(['recurring_monthly', *kpi_fields])
+        self.env['sale.order.log'].flush_model(['order_id', 'event_type', 'event_date', 'recurring_monthly'])
+
+        def get_delta(recurring_monthly, log_recurring_monthly):
+            if log_recurring_monthly is None:
+                return 0.0, 0.0
+            delta = recurring_monthly - log_recurring_monthly
+            return delta, delta / log_recurring_monthly if log_recurring_monthly != 0 else 100
+
+        subscription_ids_by_kpis = defaultdict(list)
+        for subscription_ids in split_every(10000, self.ids):
+            rows = self.env.execute_query(SQL(
+                """
+                    WITH log_mrr AS (
+                        SELECT order_id,
+                               (ARRAY_AGG(recurring_monthly::float ORDER BY event_date DESC, id DESC))[1] AS mrr_1month,
+                               (ARRAY_AGG(recurring_monthly::float ORDER BY event_date DESC, id DESC) FILTER (WHERE event_date <= %(date_3months)s))[1] AS mrr_3months
+                          FROM sale_order_log
+                         WHERE order_id IN %(subscription_ids)s
+                           AND event_type IN %(event_types)s
+                           AND event_date <= %(date_1month)s
+                      GROUP BY order_id
+                    )
+                    SELECT sale_order.id,
+                           COALESCE(sale_order.recurring_monthly, 0)::float,
+                           log_mrr.mrr_1month,
+                           log_mrr.mrr_3months,
+                           COALESCE(sale_order.kpi_1month_mrr_delta, 0),
+                           COALESCE(sale_order.kpi_1month_mrr_percentage, 0),
+                           COALESCE(sale_order.kpi_3months_mrr_delta, 0),
+                           COALESCE(sale_order.kpi_3months_mrr_percentage, 0)
+                      FROM sale_order
+                 LEFT JOIN log_mrr ON log_mrr.order_id = sale_order.id
+                     WHERE sale_order.id IN %(subscription_ids)s
+                """,
+                subscription_ids=tuple(subscription_ids),
+                event_types=('0_creation', '1_expansion', '15_contraction', '2_transfer'),
+                date_1month=today - relativedelta(months=1),
+                date_3months=today - relativedelta(months=3),
+            ))
+            for subscription_id, recurring_monthly, mrr_1month, mrr_3months, *current_kpis in rows:
+                kpis = (*get_delta(recurring_monthly, mrr_1month), *get_delta(recurring_monthly, mrr_3months))
+                if kpis != tuple(current_kpis):
+                    subscription_ids_by_kpis[kpis].append(subscription_id)
+
+        for kpis, subscription_ids in subscription_ids_by_kpis.items():
+            self.browse(subscription_ids).write(dict(zip(kpi_fields, kpis)))
 
     def _get_portal_return_action(self):
         """ Return the action used to display orders when returning from customer portal. """
@@ -1189,6 +1270,10 @@ class SaleOrder(models.Model):
         deferred_journal = self.env.company.deferred_revenue_journal_id
         if not deferred_account or not deferred_journal:
             raise ValidationError(_("The deferred settings are not properly set. Please complete them to generate subscription deferred revenues"))
+        worker_count = int(self.env['ir.config_parameter'].sudo().get_param('sale_subscription.invoice_cron_worker_count', 1))
+        if worker_count > 1:
+            self.env['sale.subscription.invoice.run']._launch_invoice_run(worker_count)
+            return self.env['account.move']
         return self._create_recurring_invoice()
 
     def _get_invoiceable_lines(self, final=False):
@@ -1450,6 +1535,68 @@ class SaleOrder(models.Model):
 
         return all_subscriptions, need_cron_trigger
 
+    @api.model
+    def _recurring_invoice_claim_subscriptions(self, shard_count, shard_index, batch_size=30):
+        """ Claim the next batch of subscriptions to invoice of a shard of an invoicing run, for one of its workers
+        (see sale.subscription.invoice.run).
+
+        The subscriptions are partitioned between the shards by invoice address, so that the subscriptions that may be
+        consolidated into a single invoice are always processed by the same worker. The claimed subscriptions are flagged
+        with is_invoice_cron, which excludes them from the subscriptions to invoice until the end of the run. The rows
+        locked by another transaction (e.g. a manual invoicing of the same subscription) are skipped instead of waited for.
+
+        :param shard_count: number of shards of the run.
+        :param shard_index: index of the shard to claim subscriptions from, between 0 and shard_count - 1.
+        :param batch_size: maximum number of subscriptions to claim or, when consolidating the invoices, of invoice addresses
+            whose subscriptions are claimed.
+        :return: the claimed subscriptions.
+        """
+        grouped_invoice = self.env['ir.config_parameter'].get_param('sale_subscription.invoice_consolidation', False)
+        self.flush_model()
+        query = self._where_calc(self._recurring_invoice_domain())
+        shard_condition = SQL("MOD(sale_order.partner_invoice_id, %s) = %s", shard_count, shard_index)
+        if grouped_invoice:
+            claim_condition = SQL(
+                """sale_order.partner_invoice_id IN (
+                    SELECT sale_order.partner_invoice_id
+                      FROM %(from_clause)s
+                     WHERE %(where_clause)s AND %(shard_condition)s
+                  GROUP BY sale_order.partner_invoice_id
+                  ORDER BY sale_order.partner_invoice_id
+                     LIMIT %(batch_size)s
+                )""",
+                from_clause=query.from_clause,
+                where_clause=query.where_clause,
+                shard_condition=shard_condition,
+                batch_size=batch_size,
+            )
+            limit = SQL()
+        else:
+            claim_condition = SQL("TRUE")
+            limit = SQL("ORDER BY sale_order.id LIMIT %s", batch_size)
+
+        claimed_ids = [row[0] for row in self.env.execute_query(SQL(
+            """
+                UPDATE sale_order
+                   SET is_invoice_cron = TRUE
+                 WHERE id IN (
+                    SELECT sale_order.id
+                      FROM %(from_clause)s
+                     WHERE %(where_clause)s AND %(shard_condition)s AND %(claim_condition)s
+                           %(limit)s
+                       FOR UPDATE OF sale_order SKIP LOCKED
+                 )
+             RETURNING id
+            """,
+            from_clause=query.from_clause,
+            where_clause=query.where_clause,
+            shard_condition=shard_condition,
+            claim_condition=claim_condition,
+            limit=limit,
+        ))]
+        self.invalidate_model(['is_invoice_cron'])
+        return self.browse(sorted(claimed_ids))
+
     def _subscription_commit_cursor(self, auto_commit):
         if auto_commit:
             self.env.cr.commit()
@@ -1585,24 +1732,30 @@ class SaleOrder(models.Model):
         # There is still some subscriptions to process. Then, make sure the CRON will be triggered again asap.
         if need_cron_trigger:
             self._subscription_launch_cron_parallel(batch_size)
-        else:
+        elif not self.env.context.get('subscription_invoice_run_worker'):
+            # The subscriptions claimed by the workers of an invoicing run are only released once all of them are done.
             if self:
                 invoice_sub = self.filtered('is_subscription')
             else:
                 invoice_sub = self.search([('is_invoice_cron', '=', True)])
+            invoice_sub._recurring_invoice_release_subscriptions(auto_commit)
+        return account_moves
 
-            try:
-                invoice_sub._post_invoice_hook()
-                self._subscription_commit_cursor(auto_commit)
-            except Exception as e:
-                self._subscription_rollback_cursor(auto_commit)
-                _logger.exception("Error during post invoice action: %s", e)
-                invoice_sub._handle_post_invoice_hook_exception()
-
-            failing_subscriptions = self.search([('is_batch', '=', True)])
-            (failing_subscriptions | invoice_sub).write({'is_batch': False, 'is_invoice_cron': False})
+    def _recurring_invoice_release_subscriptions(self, auto_commit):
+        """ Run the post invoice hook of the subscriptions invoiced by the cron and release them, as well as the ones
+        whose payment failed, for the next invoicing.
+        """
+        try:
+            self._post_invoice_hook()
             self._subscription_commit_cursor(auto_commit)
-        return account_moves
+        except Exception as e:
+            self._subscription_rollback_cursor(auto_commit)
+            _logger.exception("Error during post invoice action: %s", e)
+            self._handle_post_invoice_hook_exception()
+
+        failing_subscriptions = self.search([('is_batch', '=', True)])
+        (failing_subscriptions | self).write({'is_batch': False, 'is_invoice_cron': False})
+        self._subscription_commit_cursor(auto_commit)
 
     def _create_invoices(self, grouped=False, final=False, date=None):
         """ Override to increment periods when needed """
@@ -0,0 +1,190 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+
+from odoo import api, fields, models, Command
+from odoo.tools import SQL, config
+
+_logger = logging.getLogger(__name__)
+
+
+class SaleSubscriptionInvoiceRun(models.Model):
+    """ Run of the recurring invoicing cron sharded between several workers.
+
+    When more than one worker is configured (see the sale_subscription.invoice_cron_worker_count parameter), the recurring
+    invoicing cron doesn't invoice the subscriptions itself anymore: it starts a run and triggers one cron per worker. Each
+    worker invoices the subscriptions of its own shard, claiming them batch by batch
+    (see sale.order._recurring_invoice_claim_subscriptions), so that the workers never wait for each other. The last worker
+    to be done releases the subscriptions invoiced during the run, like the cron does at the end of its last batch.
+    """
+    _name = 'sale.subscription.invoice.run'
+    _description = "Subscription Invoicing Run"
+    _order = 'id desc'
+    _rec_name = 'date_start'
+
+    date_start = fields.Datetime(string="Started On", required=True, readonly=True, default=fields.Datetime.now)
+    date_end = fields.Datetime(string="Ended On", readonly=True)
+    state = fields.Selection(
+        selection=[
+            ('running', "Running"),
+            ('done', "Done"),
+        ],
+        required=True,
+        readonly=True,
+        default='running',
+    )
+    worker_count = fields.Integer(string="Workers", required=True, readonly=True)
+    worker_ids = fields.One2many(comodel_name='sale.subscription.invoice.run.worker', inverse_name='run_id', readonly=True)
+    subscription_count = fields.Integer(
+        string="Subscriptions to Invoice",
+        readonly=True,
+        help="Number of subscriptions due for invoicing when the run started.",
+    )
+    processed_count = fields.Integer(string="Processed Subscriptions", compute='_compute_progress')
+    invoice_count = fields.Integer(string="Invoices", compute='_compute_progress')
+    progress = fields.Float(compute='_compute_progress')
+    throughput = fields.Float(string="Subscriptions / Minute", compute='_compute_progress', digits=(16, 1))
+
+    @api.depends('worker_ids.processed_count', 'worker_ids.invoice_count', 'subscription_count', 'date_start', 'date_end')
+    def _compute_progress(self):
+        now = fields.Datetime.now()
+        for run in self:
+            run.processed_count = sum(run.worker_ids.mapped('processed_count'))
+            run.invoice_count = sum(run.worker_ids.mapped('invoice_count'))
+            if run.state == 'done':
+                run.progress = 100
+            elif run.subscription_count:
+                run.progress = min(100 * run.processed_count / run.subscription_count, 100)
+            else:
+                run.progress = 0
+            elapsed_minutes = ((run.date_end or now) - run.date_start).total_seconds() / 60
+            run.throughput = run.processed_count / elapsed_minutes if elapsed_minutes else 0
+
+    @api.model
+    def _launch_invoice_run(self, worker_count):
+        """ Start a new invoicing run split between worker_count workers, or resume the current one, by triggering the cron
+        of each of its workers that isn't done yet.
+        """
+        run = self.search([('state', '=', 'running')], limit=1)
+        if not run:
+            SaleOrder = self.env['sale.order']
+            subscription_count = SaleOrder.search_count(SaleOrder._recurring_invoice_domain())
+            if not subscription_count:
+                return run
+            run = self.create({
+                'worker_count': worker_count,
+                'subscription_count': subscription_count,
+                'worker_ids': [Command.create({'worker_index': index}) for index in range(worker_count)],
+            })
+        run.worker_ids.filtered(lambda worker: worker.state == 'running')._trigger_cron()
+        return run
+
+    @api.model
+    def _cron_process_invoice_run_worker(self, worker_index, batch_count=10):
+        """ Invoice up to batch_count batches of subscriptions of the shard of a worker of the current run.
+
+        :param worker_index: index of the worker whose shard must be processed.
+        :param batch_count: maximum number of batches to invoice in this cron call; the cron of the worker is retriggered
+            if some subscriptions may be left, to stay within the time limit of the cron.
+        """
+        worker = self.env['sale.subscription.invoice.run.worker'].search([
+            ('run_id.state', '=', 'running'),
+            ('worker_index', '=', worker_index),
+            ('state', '=', 'running'),
+        ], limit=1)
+        if worker:
+            worker._process_batches(batch_count)
+
+    def _release_if_done(self, auto_commit):
+        """ Close the run once all its workers are done and release the subscriptions invoiced during the run. """
+        self.ensure_one()
+        # Workers finishing at the same time may both get here: only the one locking the run releases the subscriptions.
+        self.env.cr.execute(SQL(
+            """
+                SELECT run.id
+                  FROM sale_subscription_invoice_run run
+                 WHERE run.id = %s
+                   AND run.state = 'running'
+                   AND NOT EXISTS (
+                        SELECT 1
+                          FROM sale_subscription_invoice_run_worker worker
+                         WHERE worker.run_id = run.id
+                           AND worker.state = 'running'
+                   )
+                   FOR UPDATE SKIP LOCKED
+            """,
+            self.id,
+        ))
+        if not self.env.cr.rowcount:
+            return
+        self.write({'state': 'done', 'date_end': fields.Datetime.now()})
+        SaleOrder = self.env['sale.order']
+        SaleOrder._subscription_commit_cursor(auto_commit)
+        SaleOrder.search([('is_invoice_cron', '=', True)])._recurring_invoice_release_subscriptions(auto_commit)
+        _logger.info(
+            "Subscription invoicing run %s done: %s subscriptions processed and %s invoices created by %s workers (%.1f subscriptions/minute).",
+            self.id, self.processed_count, self.invoice_count, self.worker_count, self.throughput,
+        )
+
+
+class SaleSubscriptionInvoiceRunWorker(models.Model):
+    _name = 'sale.subscription.invoice.run.worker'
+    _description = "Subscription Invoicing Run Worker"
+    _order = 'run_id desc, worker_index'
+
+    run_id = fields.Many2one(comodel_name='sale.subscription.invoice.run', required=True, readonly=True, index=True, ondelete='cascade')
+    worker_index = fields.Integer(string="Worker", required=True, readonly=True)
+    state = fields.Selection(
+        selection=[
+            ('running', "Running"),
+            ('done', "Done"),
+        ],
+        required=True,
+        readonly=True,
+        default='running',
+    )
+    processed_count = fields.Integer(string="Processed Subscriptions", readonly=True)
+    invoice_count = fields.Integer(string="Invoices", readonly=True)
+    date_end = fields.Datetime(string="Ended On", readonly=True)
+
+    def _get_cron(self):
+        """ Return the cron of the worker, creating it from the recurring invoicing cron the first time a run uses that
+        many workers.
+        """
+        self.ensure_one()
+        code = f"model._cron_process_invoice_run_worker({self.worker_index})"
+        Cron = self.env['ir.cron'].sudo().with_context(active_test=False)
+        cron = Cron.search([('model_id.model', '=', 'sale.subscription.invoice.run'), ('code', '=', code)], limit=1)
+        if not cron:
+            cron = self.env.ref('sale_subscription.account_analytic_cron_for_invoice').sudo().copy({
+                'name': f"Sale Subscription: generate recurring invoices and payments (worker {self.worker_index + 1})",
+                'model_id': self.env['ir.model']._get_id('sale.subscription.invoice.run'),
+                'code': code,
+                'active': True,
+            })
+        return cron
+
+    def _trigger_cron(self):
+        for worker in self:
+            worker._get_cron()._trigger()
+
+    def _process_batches(self, batch_count):
+        self.ensure_one()
+        auto_commit = not bool(config['test_enable'] or config['test_file'])
+        SaleOrder = self.env['sale.order'].with_context(subscription_invoice_run_worker=True)
+        for _dummy in range(batch_count):
+            subscriptions = SaleOrder._recurring_invoice_claim_subscriptions(self.run_id.worker_count, self.worker_index)
+            if not subscriptions:
+                self.write({'state': 'done', 'date_end': fields.Datetime.now()})
+                SaleOrder._subscription_commit_cursor(auto_commit)
+                self.run_id._release_if_done(auto_commit)
+                return
+            # Commit the claim so that the subscriptions aren't claimed again if their invoicing gets rolled back.
+            SaleOrder._subscription_commit_cursor(auto_commit)
+            invoices = subscriptions._create_recurring_invoice()
+            self.write({
+                'processed_count': self.processed_count + len(subscriptions),
+                'invoice_count': self.invoice_count + len(invoices),
+            })
+            SaleOrder._subscription_commit_cursor(auto_commit)
+        self._trigger_cron()
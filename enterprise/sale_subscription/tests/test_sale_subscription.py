@@ -909,6 +909,66 @@ class TestSubscription(TestSubscriptionCommon, MockEmail):
         self.assertEqual(self.subscription.kpi_3months_mrr_percentage, 0.5)
         self.assertEqual(self.subscription.health, 'done')
 
+    def test_compute_kpi_incremental(self):
+        self.subscription.action_confirm()
+        other_subscription = self.subscription.copy()
+        other_subscription.action_confirm()
+        subscriptions = self.subscription | other_subscription
+        last_update = fields.Datetime.now() - relativedelta(days=10)
+        self.env['ir.config_parameter'].sudo().set_param('sale_subscription.kpi_last_update', fields.Datetime.to_string(last_update))
+
+        date_log = datetime.date.today() - relativedelta(months=2)
+        self.env['sale.order.log'].sudo().create([{
+            'event_type': '1_expansion',
+            'event_date': date_log,
+            'order_id': subscription.id,
+            'recurring_monthly': subscription.recurring_monthly / 2,
+            'amount_signed': subscription.recurring_monthly / 2,
+            'currency_id': subscription.currency_id.id,
+            'subscription_state': subscription.subscription_state,
+            'user_id': subscription.user_id.id,
+            'team_id': subscription.team_id.id,
+        } for subscription in subscriptions])
+        # The logs of the other subscription were already there at the last update.
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE sale_order_log SET create_date = %s WHERE order_id = %s",
+            [last_update - relativedelta(days=10), other_subscription.id],
+        )
+
+        self.env['sale.order']._cron_update_kpi(incremental=True)
+        self.assertEqual(self.subscription.kpi_1month_mrr_delta, self.subscription.recurring_monthly / 2)
+        self.assertEqual(self.subscription.kpi_1month_mrr_percentage, 1.0)
+        self.assertEqual(other_subscription.kpi_1month_mrr_delta, 0, "The KPIs of the other subscription are not outdated")
+        self.assertGreater(
+            fields.Datetime.to_datetime(self.env['ir.config_parameter'].sudo().get_param('sale_subscription.kpi_last_update')),
+            last_update,
+        )
+
+        self.env['sale.order']._cron_update_kpi()
+        self.assertEqual(other_subscription.kpi_1month_mrr_delta, other_subscription.recurring_monthly / 2)
+
+    def test_compute_kpi_transfer(self):
+        self.subscription.action_confirm()
+        last_update = fields.Datetime.now() - relativedelta(days=10)
+        self.env['ir.config_parameter'].sudo().set_param('sale_subscription.kpi_last_update', fields.Datetime.to_string(last_update))
+        self.env['sale.order.log'].sudo().create({
+            'event_type': '2_transfer',
+            'event_date': datetime.date.today() - relativedelta(months=2),
+            'order_id': self.subscription.id,
+            'recurring_monthly': self.subscription.recurring_monthly / 2,
+            'amount_signed': self.subscription.recurring_monthly / 2,
+            'currency_id': self.subscription.currency_id.id,
+            'subscription_state': self.subscription.subscription_state,
+            'user_id': self.subscription.user_id.id,
+            'team_id': self.subscription.team_id.id,
+        })
+
+        # The transfer logs are taken into account, like in _get_subscription_delta
+        self.env['sale.order']._cron_update_kpi(incremental=True)
+        self.assertEqual(self.subscription.kpi_1month_mrr_delta, self.subscription.recurring_monthly / 2)
+        self.assertEqual(self.subscription.kpi_1month_mrr_percentage, 1.0)
+
     def test_onchange_date_start(self):
         recurring_bound_tmpl = self.env['sale.order.template'].create({
             'name': 'Recurring Bound Template',
@@ -4035,6 +4095,42 @@ class TestSubscription(TestSubscriptionCommon, MockEmail):
             self.assertFalse(need_cron_trigger)
             self.assertFalse(all_subscriptions)
 
+    def test_recurring_invoice_sharded_run(self):
+        """ Test that the subscriptions are invoiced by the workers of an invoicing run when several of them are set, each
+        worker invoicing the subscriptions of its own invoice addresses.
+        """
+        SaleOrder = self.env['sale.order']
+        self.env['ir.config_parameter'].sudo().set_param('sale_subscription.invoice_cron_worker_count', 2)
+        partners = self.env['res.partner'].create([{'name': f"Partner {i}"} for i in range(4)])
+        with freeze_time("2024-05-01"):
+            subscriptions = SaleOrder.create([{
+                'is_subscription': True,
+                'partner_id': partner.id,
+                'plan_id': self.plan_month.id,
+                'order_line': [Command.create({'product_id': self.product.id, 'product_uom_qty': 1})],
+            } for partner in partners])
+            subscriptions.action_confirm()
+
+            self.assertFalse(SaleOrder._cron_recurring_create_invoice())
+            run = self.env['sale.subscription.invoice.run'].search([('state', '=', 'running')])
+            self.assertRecordValues(run, [{'worker_count': 2, 'subscription_count': 4}])
+            self.assertEqual(run.worker_ids.mapped('worker_index'), [0, 1])
+
+            claimed = SaleOrder._recurring_invoice_claim_subscriptions(2, 0)
+            self.assertEqual(claimed, subscriptions.filtered(lambda sub: sub.partner_invoice_id.id % 2 == 0))
+            self.assertTrue(all(claimed.mapped('is_invoice_cron')))
+            self.assertFalse(SaleOrder._recurring_invoice_claim_subscriptions(2, 0), "Claimed subscriptions can't be claimed again")
+            claimed.is_invoice_cron = False
+
+            self.env['sale.subscription.invoice.run']._cron_process_invoice_run_worker(0)
+            self.assertEqual(run.state, 'running')
+            self.env['sale.subscription.invoice.run']._cron_process_invoice_run_worker(1)
+            self.assertRecordValues(run, [{'state': 'done', 'processed_count': 4, 'invoice_count': 4}])
+            self.assertEqual(run.worker_ids.mapped('state'), ['done', 'done'])
+            self.assertEqual(len(subscriptions.invoice_ids), 4)
+            self.assertFalse(any(subscriptions.mapped('is_invoice_cron')), "The subscriptions are released at the end of the run")
+            self.assertEqual(subscriptions.mapped('next_invoice_date'), [datetime.date(2024, 6, 1)] * 4)
+
     def test_amount_to_invoice_with_subscription(self):
         one_shot_product_tmpl = self.env['product.template'].create({
             'name': 'One shot product',
@@ -11,3 +11,10 @@ class ResConfigSettings(models.TransientModel):
         help="Consolidate all of a customer's subscriptions that are due to be billed on the same day onto a single invoice.",
         config_parameter='sale_subscription.invoice_consolidation',
     )
+    invoice_cron_worker_count = fields.Integer(
+        string="Invoicing Workers",
+        help="Number of workers invoicing the subscriptions in parallel. With more than one worker, each of them invoices its "
+             "own share of the subscriptions, in a separate scheduled action.",
+        config_parameter='sale_subscription.invoice_cron_worker_count',
+        default=1,
+    )